@@ -24,9 +24,11 @@
 ##############################################################################
 from django.urls import path
 
+from osis_common.api.views.message_bus_metrics import MessageBusMetricsView
 from osis_common.api.views.status_check import StatusCheckView
 
 app_name = "osis_common_api_v1"
 urlpatterns = [
     path('status_check/', StatusCheckView.as_view(), name=StatusCheckView.name),
+    path('message_bus_metrics/', MessageBusMetricsView.as_view(), name=MessageBusMetricsView.name),
 ]
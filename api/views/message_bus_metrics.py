@@ -0,0 +1,49 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.contrib.auth.decorators import login_not_required
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from osis_common.api.views.status_check import StatusCheckView
+from osis_common.utils.inbox_outbox import collect_backlog_metrics
+from osis_common.utils.metrics import get_metrics_backend, PROMETHEUS_CONTENT_TYPE
+
+
+@method_decorator(login_not_required, name="dispatch")
+class MessageBusMetricsView(View):
+    """Text exposition (Prometheus) of the message bus metrics: backlog gauges + metrics of the web process"""
+    name = "message_bus_metrics"
+
+    def get(self, request, *args, **kwargs):
+        try:
+            StatusCheckView.authenticate(request)
+        except PermissionDenied:
+            return HttpResponse("Unauthorized", status=401)
+        metrics_backend = get_metrics_backend()
+        collect_backlog_metrics(metrics_backend)
+        return HttpResponse(metrics_backend.render(), content_type=PROMETHEUS_CONTENT_TYPE)
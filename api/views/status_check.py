@@ -51,11 +51,14 @@ class StatusCheckView(View):
         ]
         data = []
         for status in list_status:
-            data.append({
+            service_data = {
                 'service': status.service,
                 'error': status.is_in_error(),
                 'message': str(status)
-            })
+            }
+            if status.details:
+                service_data['details'] = status.details
+            data.append(service_data)
         has_error = any(service_status.is_in_error() for service_status in list_status)
         return JsonResponse(data, status=self.get_status_code(has_error), safe=False)
 
@@ -0,0 +1,82 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.core.management import BaseCommand
+
+from osis_common.utils.inbox_outbox import InboxOutboxArchiver
+
+INBOX = 'inbox'
+OUTBOX = 'outbox'
+
+
+class Command(BaseCommand):
+    help = """
+    Command to move processed inbox events and sent outbox events older than the retention window
+    to the archive tables (InboxArchived / OutboxArchived)
+
+    Usage example:
+    python manage.py archive_inbox_outbox
+    python manage.py archive_inbox_outbox -t inbox --retention_days 60 --batch_size 10000
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-t",
+            "--table",
+            dest="tables",
+            choices=[INBOX, OUTBOX],
+            action="append",
+            help="Table to archive (default: both)"
+        )
+        parser.add_argument(
+            "--retention_days",
+            dest="retention_days",
+            type=int,
+            default=None,
+            help="Number of days rows are kept in the live tables "
+                 "(default: MESSAGE_BUS['ARCHIVE_RETENTION_DAYS'] or 30)"
+        )
+        parser.add_argument(
+            "--batch_size",
+            dest="batch_size",
+            type=int,
+            default=None,
+            help="Number of rows moved by transaction (default: MESSAGE_BUS['ARCHIVE_BATCH_SIZE'] or 5000)"
+        )
+        parser.add_argument(
+            "--max_batches",
+            dest="max_batches",
+            type=int,
+            default=None,
+            help="Stop after this number of batches by table (default: until nothing is left to archive)"
+        )
+
+    def handle(self, *args, **options):
+        archiver = InboxOutboxArchiver(retention_days=options['retention_days'], batch_size=options['batch_size'])
+        tables = options['tables'] or [INBOX, OUTBOX]
+        if INBOX in tables:
+            self.stdout.write(str(archiver.archive_inbox(max_batches=options['max_batches'])))
+        if OUTBOX in tables:
+            self.stdout.write(str(archiver.archive_outbox(max_batches=options['max_batches'])))
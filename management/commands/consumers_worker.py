@@ -24,11 +24,13 @@
 #
 ##############################################################################
 import logging
+import signal
 
 from django.conf import settings
 from django.core.management import BaseCommand
 
 from osis_common.utils.inbox_outbox import EventQueueConsumer
+from osis_common.utils.metrics import start_metrics_http_server
 
 logger = logging.getLogger(settings.ASYNC_WORKERS_LOGGER)
 
@@ -38,6 +40,10 @@ class Command(BaseCommand):
     Command to start 1 thread/bounded context in order to read events from the queue and store it to the inbox table
     for further processing (via inbox_worker)
     Script must be run in the root of the project
+
+    Usage example:
+    python manage.py consumers_worker -c deliberation
+    python manage.py consumers_worker -c deliberation --stream --prefetch_count 500 --micro_batch_size 100
     """
 
     def add_arguments(self, parser):
@@ -49,7 +55,55 @@ class Command(BaseCommand):
             required=True,
             help="The name of the bounded context"
         )
+        parser.add_argument(
+            "--stream",
+            dest="stream",
+            action="store_true",
+            help="Keep consuming messages pushed by the broker until SIGTERM/SIGINT (instead of one batch)"
+        )
+        parser.add_argument(
+            "--prefetch_count",
+            dest="prefetch_count",
+            type=int,
+            default=None,
+            help="[Stream mode] Max unacked messages pushed by the broker "
+                 "(default: MESSAGE_BUS['CONSUMER_PREFETCH_COUNT'] or 500)"
+        )
+        parser.add_argument(
+            "--micro_batch_size",
+            dest="micro_batch_size",
+            type=int,
+            default=None,
+            help="[Stream mode] Number of messages stored in the inbox by transaction "
+                 "(default: MESSAGE_BUS['CONSUMER_MICRO_BATCH_SIZE'] or 100)"
+        )
+        parser.add_argument(
+            "--metrics_port",
+            dest="metrics_port",
+            type=int,
+            default=None,
+            help="Expose the metrics of the worker on http://<metrics_host>:<metrics_port>/metrics "
+                 "(default: not exposed)"
+        )
+        parser.add_argument(
+            "--metrics_host",
+            dest="metrics_host",
+            type=str,
+            default='127.0.0.1',
+            help="Interface the metrics exporter listens on, without authentication (default: 127.0.0.1)"
+        )
 
     def handle(self, *args, **options):
+        if options['metrics_port']:
+            start_metrics_http_server(port=options['metrics_port'], host=options['metrics_host'])
         context_name = options['context_name']
-        EventQueueConsumer(context_name=context_name).read_queue()
+        event_queue_consumer = EventQueueConsumer(context_name=context_name)
+        if options['stream']:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: event_queue_consumer.stop())
+            event_queue_consumer.consume_queue(
+                prefetch_count=options['prefetch_count'],
+                micro_batch_size=options['micro_batch_size'],
+            )
+        else:
+            event_queue_consumer.read_queue()
@@ -0,0 +1,74 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import signal
+
+from django.core.management import BaseCommand
+
+from osis_common.models.message_queue_cache import MessageQueueCacheDrainer
+
+
+class Command(BaseCommand):
+    help = """
+    Command to send the messages kept in MessageQueueCache (when the broker was unavailable) to their queue
+    Script must be run in the root of the project
+
+    Usage example:
+    python manage.py drain_message_queue_cache
+    python manage.py drain_message_queue_cache --daemon --poll_interval 30 --batch_size 1000
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--daemon",
+            dest="daemon",
+            action="store_true",
+            help="Keep draining the cache continuously until SIGTERM/SIGINT"
+        )
+        parser.add_argument(
+            "--poll_interval",
+            dest="poll_interval",
+            type=float,
+            default=None,
+            help="[Daemon mode] Seconds to wait between two drains "
+                 "(default: QUEUES['MESSAGE_QUEUE_CACHE_DRAIN_INTERVAL'] or 10)"
+        )
+        parser.add_argument(
+            "--batch_size",
+            dest="batch_size",
+            type=int,
+            default=None,
+            help="Number of cached messages locked, sent and deleted in one database transaction "
+                 "(default: QUEUES['MESSAGE_QUEUE_CACHE_DRAIN_BATCH_SIZE'] or 500)"
+        )
+
+    def handle(self, *args, **options):
+        drainer = MessageQueueCacheDrainer(batch_size=options['batch_size'])
+        if options['daemon']:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: drainer.stop())
+            drainer.run_forever(poll_interval=options['poll_interval'])
+        else:
+            self.stdout.write(f"{drainer.drain()} cached message(s) sent")
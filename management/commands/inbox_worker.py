@@ -62,6 +62,32 @@ class Command(BaseCommand):
             default=0,
             help="The ID of the consumer (default: 0)"
         )
+        parser.add_argument(
+            "-t",
+            "--transaction_mode",
+            dest="transaction_mode",
+            type=str,
+            choices=InboxConsumer.TRANSACTION_MODES,
+            default=None,
+            help="'batch': one transaction for the whole batch / 'savepoint': one savepoint by event / "
+                 "'event': one transaction by event (default: MESSAGE_BUS['INBOX_TRANSACTION_MODE'] or 'batch')"
+        )
+        parser.add_argument(
+            "--max_batch_duration",
+            dest="max_batch_duration",
+            type=float,
+            default=None,
+            help="Max seconds spent in a batch, remaining events are left for the next run "
+                 "(default: MESSAGE_BUS['INBOX_MAX_BATCH_DURATION'] or no limit)"
+        )
+        parser.add_argument(
+            "--max_workers",
+            dest="max_workers",
+            type=int,
+            default=None,
+            help="Number of threads processing events concurrently, events sharing a routing key are always "
+                 "processed in order (default: MESSAGE_BUS['INBOX_MAX_WORKERS_BY_CONSUMER'] or 1)"
+        )
 
     def handle(self, *args, **options):
         from infrastructure.messages_bus import message_bus_instance
@@ -75,5 +101,11 @@ class Command(BaseCommand):
             context_name=context_name,
             strategy_name=strategy_name,
             consumer_id=consumer_id,
+            transaction_mode=options["transaction_mode"],
+            max_batch_duration=options["max_batch_duration"],
+            max_workers=options["max_workers"],
         )
-        inbox_consumer.consume_all_unprocessed_events()
+        try:
+            inbox_consumer.consume_all_unprocessed_events()
+        finally:
+            inbox_consumer.close()
@@ -0,0 +1,89 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import signal
+
+from django.core.management import BaseCommand
+
+from osis_common.utils.inbox_outbox import InboxWorkersSupervisor
+from osis_common.utils.metrics import start_metrics_http_server
+
+
+class Command(BaseCommand):
+    help = """
+    Command to start 1 long-lived thread for each (bounded context, routing strategy, consumer ID) slot
+    in order to process the inbox of all contexts in a single process, until SIGTERM/SIGINT
+    Script must be run in the root of the project
+
+    Usage example:
+    python manage.py inbox_workers_supervisor
+    python manage.py inbox_workers_supervisor -c deliberation -c admission
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-c",
+            "--context_name",
+            dest="context_names",
+            type=str,
+            action="append",
+            help="The name of a bounded context to supervise (default: all registered contexts)"
+        )
+        parser.add_argument(
+            "--batch_size",
+            dest="batch_size",
+            type=int,
+            default=None,
+            help="Number of events processed by batch (default: MESSAGE_BUS['INBOX_BATCH_EVENTS'])"
+        )
+        parser.add_argument(
+            "--metrics_port",
+            dest="metrics_port",
+            type=int,
+            default=None,
+            help="Expose the metrics of the worker on http://<metrics_host>:<metrics_port>/metrics "
+                 "(default: not exposed)"
+        )
+        parser.add_argument(
+            "--metrics_host",
+            dest="metrics_host",
+            type=str,
+            default='127.0.0.1',
+            help="Interface the metrics exporter listens on, without authentication (default: 127.0.0.1)"
+        )
+
+    def handle(self, *args, **options):
+        from infrastructure.messages_bus import message_bus_instance
+
+        if options['metrics_port']:
+            start_metrics_http_server(port=options['metrics_port'], host=options['metrics_host'])
+        supervisor = InboxWorkersSupervisor(
+            message_bus_instance=message_bus_instance,
+            context_names=options['context_names'],
+            batch_size=options['batch_size'],
+        )
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: supervisor.stop())
+        supervisor.run()
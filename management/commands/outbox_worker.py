@@ -24,11 +24,13 @@
 #
 ##############################################################################
 import logging
+import signal
 
 from django.conf import settings
 from django.core.management import BaseCommand
 
 from osis_common.utils.inbox_outbox import EventQueueProducer
+from osis_common.utils.metrics import start_metrics_http_server
 
 logger = logging.getLogger(settings.ASYNC_WORKERS_LOGGER)
 
@@ -37,9 +39,61 @@ class Command(BaseCommand):
     help = """
     Command to send events produce by the application to the message broker
     Script must be run in the root of the project
+
+    Usage example:
+    python manage.py outbox_worker
+    python manage.py outbox_worker --daemon --poll_interval 0.5 --window_size 200
     """
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--daemon",
+            dest="daemon",
+            action="store_true",
+            help="Keep the connection open and send new events continuously until SIGTERM/SIGINT"
+        )
+        parser.add_argument(
+            "--poll_interval",
+            dest="poll_interval",
+            type=float,
+            default=None,
+            help="[Daemon mode] Seconds to wait when no pending event is found "
+                 "(default: MESSAGE_BUS['OUTBOX_POLL_INTERVAL'] or 1)"
+        )
+        parser.add_argument(
+            "--window_size",
+            dest="window_size",
+            type=int,
+            default=None,
+            help="Number of events locked, published and marked as sent in one database transaction, "
+                 "with one broker confirmation (default: MESSAGE_BUS['OUTBOX_PUBLISH_WINDOW_SIZE'] or 100)"
+        )
+        parser.add_argument(
+            "--metrics_port",
+            dest="metrics_port",
+            type=int,
+            default=None,
+            help="Expose the metrics of the worker on http://<metrics_host>:<metrics_port>/metrics "
+                 "(default: not exposed)"
+        )
+        parser.add_argument(
+            "--metrics_host",
+            dest="metrics_host",
+            type=str,
+            default='127.0.0.1',
+            help="Interface the metrics exporter listens on, without authentication (default: 127.0.0.1)"
+        )
+
     def handle(self, *args, **options):
-        event_queue_producer = EventQueueProducer()
-        event_queue_producer.send_pending_events_to_queue()
-        event_queue_producer.close_connection()
+        if options['metrics_port']:
+            start_metrics_http_server(port=options['metrics_port'], host=options['metrics_host'])
+        event_queue_producer = EventQueueProducer(publish_window_size=options['window_size'])
+        try:
+            if options['daemon']:
+                for signum in (signal.SIGTERM, signal.SIGINT):
+                    signal.signal(signum, lambda *_: event_queue_producer.stop())
+                event_queue_producer.run_forever(poll_interval=options['poll_interval'])
+            else:
+                event_queue_producer.send_pending_events_to_queue()
+        finally:
+            event_queue_producer.close_connection()
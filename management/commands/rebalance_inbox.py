@@ -0,0 +1,71 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.core.management import BaseCommand
+
+from osis_common.utils.inbox_outbox import InboxRebalancer
+
+
+class Command(BaseCommand):
+    help = """
+    Command to reassign the pending inbox events of a bounded context to the current routing topology
+    (e.g. after a change of total_consumers in a routing strategy).
+    Consumers receiving events must be started once the rebalancing is done in order to keep the order by routing key.
+    This is not enforced (neither by this command nor by inbox_workers_supervisor): stop the supervisor of the context,
+    deploy the new topology, run this command, then start the supervisor again.
+
+    Usage example:
+    python manage.py rebalance_inbox -c deliberation
+    python manage.py rebalance_inbox -c deliberation --batch_size 5000 --dry_run
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-c",
+            "--context_name",
+            dest='context_name',
+            type=str,
+            required=True,
+            help="The name of the bounded context"
+        )
+        parser.add_argument(
+            "--batch_size",
+            dest="batch_size",
+            type=int,
+            default=None,
+            help="Number of rows reassigned by transaction (default: MESSAGE_BUS['INBOX_REBALANCE_BATCH_SIZE'] or 1000)"
+        )
+        parser.add_argument(
+            "--dry_run",
+            dest="dry_run",
+            action="store_true",
+            help="Only report the number of rows which would be reassigned"
+        )
+
+    def handle(self, *args, **options):
+        rebalancer = InboxRebalancer(context_name=options['context_name'], batch_size=options['batch_size'])
+        self.stdout.write(str(rebalancer.rebalance(dry_run=options['dry_run'])))
+        if not options['dry_run']:
+            self.stdout.write("Inbox workers of the context can now be (re)started")
@@ -0,0 +1,133 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import datetime
+
+from django.core.management import BaseCommand, CommandError
+
+from osis_common.utils.inbox_outbox import InboxReplayer
+
+
+class Command(BaseCommand):
+    help = """
+    Command to put dead-lettered inbox events back to PENDING (attempts cleared), e.g. after a handler fix
+
+    Usage example:
+    python manage.py replay_inbox -c deliberation -e DummyEvent --dry_run
+    python manage.py replay_inbox -c deliberation --from 2026-01-01 --to 2026-01-02 --traceback "KeyError: 'noma'"
+    python manage.py replay_inbox -c deliberation --include_errors -s noma -i 1
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-c",
+            "--context_name",
+            dest='context_name',
+            type=str,
+            default=None,
+            help="The name of the bounded context (default: all)"
+        )
+        parser.add_argument(
+            "-e",
+            "--event_name",
+            dest="event_names",
+            type=str,
+            action="append",
+            help="Name of an event to replay (default: all)"
+        )
+        parser.add_argument(
+            "--from",
+            dest="created_from",
+            type=datetime.datetime.fromisoformat,
+            default=None,
+            help="Only events created from this date (ISO format, included)"
+        )
+        parser.add_argument(
+            "--to",
+            dest="created_to",
+            type=datetime.datetime.fromisoformat,
+            default=None,
+            help="Only events created before this date (ISO format, excluded)"
+        )
+        parser.add_argument(
+            "--traceback",
+            dest="traceback_pattern",
+            type=str,
+            default=None,
+            help="Only events whose traceback matches this regular expression"
+        )
+        parser.add_argument(
+            "--include_errors",
+            dest="include_errors",
+            action="store_true",
+            help="Also replay events in error (waiting for their next attempt)"
+        )
+        parser.add_argument(
+            "-s",
+            "--strategy_name",
+            dest="strategy_name",
+            type=str,
+            default=None,
+            help="Re-route the events to this routing strategy (requires --context_name and --consumer_id)"
+        )
+        parser.add_argument(
+            "-i",
+            "--consumer_id",
+            dest="consumer_id",
+            type=int,
+            default=None,
+            help="Re-route the events to this consumer ID (requires --context_name and --strategy_name)"
+        )
+        parser.add_argument(
+            "--batch_size",
+            dest="batch_size",
+            type=int,
+            default=None,
+            help="Number of rows updated by transaction (default: MESSAGE_BUS['INBOX_REPLAY_BATCH_SIZE'] or 5000)"
+        )
+        parser.add_argument(
+            "--dry_run",
+            dest="dry_run",
+            action="store_true",
+            help="Only report the number of rows which would be replayed"
+        )
+
+    def handle(self, *args, **options):
+        replayer = InboxReplayer(batch_size=options['batch_size'])
+        try:
+            report = replayer.replay(
+                context_name=options['context_name'],
+                event_names=options['event_names'],
+                created_from=options['created_from'],
+                created_to=options['created_to'],
+                traceback_pattern=options['traceback_pattern'],
+                include_errors=options['include_errors'],
+                strategy_name=options['strategy_name'],
+                consumer_id=options['consumer_id'],
+                dry_run=options['dry_run'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(str(report))
@@ -0,0 +1,44 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.core.management import BaseCommand
+
+from osis_common.utils.inbox_outbox import sync_outbox_notify_trigger
+
+
+class Command(BaseCommand):
+    help = """
+    Command to install (MESSAGE_BUS['LISTEN_NOTIFY'] enabled) or drop (disabled) the insert trigger notifying the
+    outbox workers on the table of the configured outbox model. To run after each change of the setting.
+
+    Usage example:
+    python manage.py sync_outbox_notify_trigger
+    """
+
+    def handle(self, *args, **options):
+        if sync_outbox_notify_trigger():
+            self.stdout.write("Outbox notify trigger installed")
+        else:
+            self.stdout.write("Outbox notify trigger dropped (LISTEN_NOTIFY disabled)")
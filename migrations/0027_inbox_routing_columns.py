@@ -0,0 +1,33 @@
+# Generated by Django 5.2.13 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osis_common', '0026_alter_inboxarchived_creation_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inbox',
+            name='strategy_name',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='inbox',
+            name='consumer_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='inboxarchived',
+            name='strategy_name',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='inboxarchived',
+            name='consumer_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
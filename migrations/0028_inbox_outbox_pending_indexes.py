@@ -0,0 +1,32 @@
+# Generated by Django 5.2.13 on 2026-10-17 09:14
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently in order to not lock inbox/outbox tables during deployment
+    atomic = False
+
+    dependencies = [
+        ('osis_common', '0027_inbox_routing_columns'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='inbox',
+            index=models.Index(
+                condition=models.Q(('status__in', ['PENDING', 'ERROR'])),
+                fields=['consumer', 'strategy_name', 'consumer_id', 'creation_date'],
+                name='inbox_pending_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='outbox',
+            index=models.Index(
+                condition=models.Q(('sent', False)),
+                fields=['creation_date'],
+                name='outbox_pending_idx',
+            ),
+        ),
+    ]
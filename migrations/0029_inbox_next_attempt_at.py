@@ -0,0 +1,23 @@
+# Generated by Django 5.2.13 on 2026-10-17 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osis_common', '0028_inbox_outbox_pending_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inbox',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='inboxarchived',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.13 on 2026-10-17 14:05
+
+from django.db import migrations
+from django.db.models import IntegerField
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_routing_columns_from_meta(apps, schema_editor):
+    # Only rows still to process (or to replay, cf. InboxReplayer) are read through the routing columns: processed
+    # and archived rows keep their routing in meta. Rows are updated by primary key batches, each one committed on its
+    # own (atomic = False), in order to lock only the rows of the batch instead of the whole table.
+    inbox_model = apps.get_model('osis_common', 'Inbox')
+    rows_to_backfill = inbox_model.objects.filter(
+        status__in=['PENDING', 'ERROR', 'DEAD_LETTER'],
+        strategy_name__isnull=True,
+        meta__has_key='inbox_worker',
+    )
+    last_pk = 0
+    while True:
+        pks = list(rows_to_backfill.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[
+            :BACKFILL_BATCH_SIZE
+        ])
+        if not pks:
+            break
+        inbox_model.objects.filter(pk__in=pks).update(
+            strategy_name=KT('meta__inbox_worker__strategy_name'),
+            consumer_id=Cast(KT('meta__inbox_worker__consumer_id'), output_field=IntegerField()),
+        )
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('osis_common', '0029_inbox_next_attempt_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_routing_columns_from_meta, migrations.RunPython.noop, atomic=False),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.13 on 2026-10-17 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('osis_common', '0030_backfill_inbox_routing_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='messagequeuecache',
+            name='attempts_number',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -36,9 +36,11 @@ class InboxAdmin(osis_model_admin.OsisModelAdmin):
     date_hierarchy = 'creation_date'
     list_display = (
         'transaction_id', 'consumer', 'event_name',  'payload', 'creation_date', 'status', 'last_execution_date',
+        'strategy_name', 'consumer_id',
     )
     readonly_fields = (
         'transaction_id', 'consumer', 'event_name', 'payload', 'creation_date', 'status', 'last_execution_date',
+        'strategy_name', 'consumer_id', 'next_attempt_at',
     )
     ordering = ['-creation_date']
     search_fields = ['consumer', 'payload']
@@ -80,6 +82,11 @@ class InboxAbstractModel(models.Model):
     traceback = models.TextField(null=True, blank=True)
     attempts_number = models.IntegerField(default=0)
     meta = models.JSONField(default=dict, blank=True)
+    # Routing assignment (cf. InboxConsumerRoutingStrategy) determined at ingestion by EventQueueConsumer
+    strategy_name = models.CharField(max_length=255, null=True, blank=True)
+    consumer_id = models.IntegerField(null=True, blank=True)
+    # Events in error are not retried before this date (cf. RetryBackoffPolicy)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         abstract = True
@@ -91,22 +98,33 @@ class Inbox(InboxAbstractModel):
         unique_together = (
             'consumer', 'transaction_id',
         )
+        indexes = [
+            # Only rows still to process are indexed, so polling cost follows the backlog, not the table history
+            models.Index(
+                fields=['consumer', 'strategy_name', 'consumer_id', 'creation_date'],
+                name='inbox_pending_idx',
+                condition=models.Q(status__in=[InboxAbstractModel.PENDING, InboxAbstractModel.ERROR]),
+            ),
+        ]
 
     def mark_as_processed(self, strategy_name: str, consumer_id: int):
         self.status = self.PROCESSED
         self.last_execution_date = datetime.datetime.now()
         self.attempts_number += 1
+        self.strategy_name = strategy_name
+        self.consumer_id = consumer_id
         self.meta['inbox_worker'] = {
             'strategy_name': strategy_name,
             'consumer_id': consumer_id
         }
         self.save()
 
-    def mark_as_error(self, error_description: str = None):
+    def mark_as_error(self, error_description: str = None, retry_delay: datetime.timedelta = None):
         self.status = self.ERROR
         self.last_execution_date = datetime.datetime.now()
         self.traceback = error_description
         self.attempts_number += 1
+        self.next_attempt_at = self.last_execution_date + retry_delay if retry_delay else None
         self.save()
 
     def mark_as_dead_letter(self, error_description: str = None):
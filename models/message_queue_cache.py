@@ -23,21 +23,33 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
-from django.db import models
-from django.db.models import JSONField
+import itertools
+import logging
+import threading
+from operator import attrgetter
+from typing import List
+
+from django.conf import settings
+from django.db import models, transaction, close_old_connections
+from django.db.models import JSONField, F
+from pika.exceptions import AMQPConnectionError
 
 from osis_common.models import osis_model_admin
 from osis_common.queue import queue_sender
 
+logger = logging.getLogger(settings.QUEUE_EXCEPTION_LOGGER)
+
 
 class MessageQueueCacheAdmin(osis_model_admin.OsisModelAdmin):
-    list_display = ('queue', 'data', 'changed')
+    list_display = ('queue', 'data', 'changed', 'attempts_number')
 
 
 class MessageQueueCache(models.Model):
     queue = models.CharField(max_length=255)
     data = JSONField()
     changed = models.DateTimeField(auto_now_add=True)  # Insert date
+    # Failed sends not due to the broker availability (cf. MessageQueueCacheDrainer)
+    attempts_number = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return "{} - {}".format(self.queue, self.changed)
@@ -48,7 +60,99 @@ def get_messages_to_retry():
 
 
 def retry_all_cached_messages():
-    messages_to_retry = get_messages_to_retry()
-    for message in messages_to_retry:
-        queue_sender.send_message(message.queue, message.data)
-        message.delete()
+    return MessageQueueCacheDrainer().drain()
+
+
+class MessageQueueCacheDrainer:
+    """
+    Send the messages kept in cache during a broker outage, oldest first, outside of the user requests.
+
+    Rows are locked by batches with SKIP LOCKED, so several drainers can run at the same time. The messages of a batch
+    are sent through one pooled connection, then deleted at once. On broker error, the messages not sent stay in
+    cache for the next drain. When a queue fails for another reason, its messages are sent one by one: the failing
+    message counts an attempt and, once max_attempts is reached, is left in cache (admin) instead of blocking the
+    messages behind it.
+    """
+    def __init__(self, batch_size: int = None, max_attempts: int = None):
+        self.batch_size = batch_size or settings.QUEUES.get('MESSAGE_QUEUE_CACHE_DRAIN_BATCH_SIZE', 500)
+        self.max_attempts = max_attempts or settings.QUEUES.get('MESSAGE_QUEUE_CACHE_MAX_ATTEMPTS', 5)
+        self.max_backoff = settings.QUEUES.get('MESSAGE_QUEUE_CACHE_DRAIN_MAX_BACKOFF', 300)
+        self._stop_event = threading.Event()
+
+    def drain(self, max_batches: int = None) -> int:
+        drained_count = 0
+        batch_count = 0
+        queryset = MessageQueueCache.objects.select_for_update(skip_locked=True).filter(
+            attempts_number__lt=self.max_attempts,
+        ).order_by('changed', 'pk')
+        while max_batches is None or batch_count < max_batches:
+            with transaction.atomic():
+                cached_messages = list(queryset[:self.batch_size])
+                sent_messages = self._send_to_queues(cached_messages)
+                MessageQueueCache.objects.filter(pk__in=[message.pk for message in sent_messages]).delete()
+            drained_count += len(sent_messages)
+            batch_count += 1
+            if not cached_messages or len(sent_messages) < len(cached_messages):
+                break
+        return drained_count
+
+    def run_forever(self, poll_interval: float = None):
+        if poll_interval is None:
+            poll_interval = settings.QUEUES.get('MESSAGE_QUEUE_CACHE_DRAIN_INTERVAL', 10)
+        logger.info(f"MessageQueueCacheDrainer: Start daemon (poll_interval={poll_interval}s)...")
+        consecutive_failures = 0
+        while not self._stop_event.is_set():
+            close_old_connections()
+            try:
+                drained_count = self.drain()
+            except Exception:
+                # Ex: database unavailable. The daemon must survive it: retry later with an exponential backoff
+                consecutive_failures += 1
+                logger.exception(f"MessageQueueCacheDrainer: Drain failed ({consecutive_failures} time(s) in a row)")
+                self._stop_event.wait(min(poll_interval * 2 ** consecutive_failures, self.max_backoff))
+                continue
+            consecutive_failures = 0
+            if drained_count:
+                logger.info(f"MessageQueueCacheDrainer: {drained_count} cached message(s) sent")
+            self._stop_event.wait(poll_interval)
+        logger.info("MessageQueueCacheDrainer: Daemon stopped")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _send_to_queues(self, cached_messages: List[MessageQueueCache]) -> List[MessageQueueCache]:
+        sent_messages = []
+        # Consecutive messages of the same queue are sent together in order to keep the order of the cache
+        for queue_name, messages in itertools.groupby(cached_messages, key=attrgetter('queue')):
+            messages = list(messages)
+            try:
+                queue_sender.send_messages(queue_name, [message.data for message in messages])
+            except AMQPConnectionError:
+                logger.exception(f"MessageQueueCacheDrainer: Unable to send cached messages to {queue_name}")
+                break
+            except Exception:
+                logger.exception(f"MessageQueueCacheDrainer: Unable to send cached messages to {queue_name}")
+                sent_messages += self._send_one_by_one(queue_name, messages)
+            else:
+                sent_messages += messages
+        return sent_messages
+
+    def _send_one_by_one(self, queue_name: str, messages: List[MessageQueueCache]) -> List[MessageQueueCache]:
+        sent_messages = []
+        for message in messages:
+            try:
+                queue_sender.send_messages(queue_name, [message.data])
+            except AMQPConnectionError:
+                break
+            except Exception:
+                logger.exception(f"MessageQueueCacheDrainer: Unable to send cached message {message.pk}")
+                MessageQueueCache.objects.filter(pk=message.pk).update(attempts_number=F('attempts_number') + 1)
+                if message.attempts_number + 1 >= self.max_attempts:
+                    logger.error(
+                        f"MessageQueueCacheDrainer: Cached message {message.pk} skipped after {self.max_attempts} "
+                        f"attempts"
+                    )
+                # Following messages of the queue wait for the next drain in order to keep the order of the cache
+                break
+            sent_messages.append(message)
+        return sent_messages
@@ -63,6 +63,10 @@ class OutboxAbstractModel(models.Model):
 class Outbox(OutboxAbstractModel):
     class Meta:
         verbose_name_plural = "outbox"
+        indexes = [
+            # Partial index on the rows still to send (same rationale as inbox_pending_idx)
+            models.Index(fields=['creation_date'], name='outbox_pending_idx', condition=models.Q(sent=False)),
+        ]
 
 
 class OutboxArchived(OutboxAbstractModel):
@@ -23,11 +23,16 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import collections
 import datetime
+import functools
 import json
 import logging
 import time
 import uuid
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from django.apps import apps
 from django.conf import settings
@@ -36,12 +41,13 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.db import models, transaction
 from django.db.models import DateTimeField, DateField
 from django.utils.encoding import force_str
-from pika.exceptions import ChannelClosed, ConnectionClosed
+from pika.exceptions import AMQPConnectionError, AMQPChannelError
 
-from osis_common.models import message_queue_cache, osis_model_admin
+from osis_common.models import osis_model_admin
 from osis_common.models.exception import MigrationPersistanceError
 from osis_common.models.message_queue_cache import MessageQueueCache
 from osis_common.queue import queue_sender
+from osis_common.queue.circuit_breaker import CircuitOpenError
 
 LOGGER = logging.getLogger(settings.DEFAULT_LOGGER)
 
@@ -73,15 +79,14 @@ def serializable_model_resend_messages_to_queue(self, request, queryset):
     if hasattr(settings, 'QUEUES') and settings.QUEUES:
         counter = 0
         queue_name = settings.QUEUES.get('QUEUES_NAME').get('MIGRATIONS_TO_PRODUCE')
-        for record in queryset:
+        for ser_obj in serialize_many(queryset, False):
             try:
-                ser_obj = serialize(record, False)
                 queue_sender.send_message(queue_name,
                                           wrap_serialization(ser_obj))
                 counter += 1
-            except (ChannelClosed, ConnectionClosed):
+            except (AMQPConnectionError, AMQPChannelError):
                 self.message_user(request,
-                                  'Message %s not sent to %s.' % (record.pk, queue_name),
+                                  'Message %s not sent to %s.' % (ser_obj['fields']['uuid'], queue_name),
                                   level=messages.ERROR)
         self.message_user(request, "{} message(s) sent.".format(counter), level=messages.SUCCESS)
     else:
@@ -98,12 +103,18 @@ class SerializableModel(models.Model):
     def save(self, *args, **kwargs):
         super(SerializableModel, self).save(*args, **kwargs)
         # Send message to queue only when transaction is commited
-        transaction.on_commit(lambda: serializable_model_post_save(self))
+        if transaction.get_connection().in_atomic_block:
+            register_change_on_commit(self)
+        else:
+            transaction.on_commit(lambda: serializable_model_post_save(self))
 
     def delete(self, *args, **kwargs):
         result = super(SerializableModel, self).delete(*args, **kwargs)
         # Send message to queue only when transaction is commited
-        transaction.on_commit(lambda: serializable_model_post_delete(self, to_delete=True))
+        if transaction.get_connection().in_atomic_block:
+            register_change_on_commit(self, to_delete=True)
+        else:
+            transaction.on_commit(lambda: serializable_model_post_delete(self, to_delete=True))
         return result
 
     def natural_key(self):
@@ -123,6 +134,98 @@ class SerializableModel(models.Model):
             return None
 
 
+class _PendingChanges:
+    """
+    Changes made to serializable models in a transaction, sent to the queue at commit.
+
+    Only the last state of an object is kept, so an object saved several times in a transaction (even in nested
+    atomic blocks) produces one message. A marker is registered with transaction.on_commit() for each savepoint in
+    which changes are made: the first marker called at commit sends all the changes. Only Django references the
+    markers, so a marker released without having been called means that its savepoint was rolled back: the changes
+    made in this savepoint are ignored.
+    """
+    def __init__(self, connection):
+        self.connection = connection
+        self.states: Dict[Tuple[str, str], List[_ChangeState]] = {}
+        self.savepoints: Dict[Optional[str], _Savepoint] = {}
+        self.pending_markers_count = 0
+        self.committed = False
+
+    def add(self, instance: 'SerializableModel', to_delete: bool):
+        savepoint_id = next((sid for sid in reversed(self.connection.savepoint_ids) if sid), None)
+        savepoint = self.savepoints.get(savepoint_id)
+        if savepoint is None:
+            savepoint = self.savepoints[savepoint_id] = _Savepoint()
+            self._register_marker(savepoint)
+        # An object keeps the position of its first change: related objects are still sent before it
+        states = self.states.setdefault((instance._meta.label, str(instance.uuid)), [])
+        state = _ChangeState(savepoint=savepoint, instance=instance, to_delete=to_delete)
+        if states and states[-1].savepoint is savepoint:
+            states[-1] = state
+        else:
+            states.append(state)
+
+    def flush(self):
+        if self.committed:
+            return
+        self.committed = True
+        self._detach()
+        changes = []
+        for states in self.states.values():
+            last_state = next((state for state in reversed(states) if not state.savepoint.rolled_back), None)
+            if last_state:
+                changes.append((last_state.instance, last_state.to_delete))
+        if changes:
+            serializable_model_post_change_many(changes)
+
+    def _register_marker(self, savepoint: '_Savepoint'):
+        marker = _SavepointMarker(self)
+        savepoint.marker_ref = weakref.ref(marker, functools.partial(self._on_marker_released, savepoint))
+        self.pending_markers_count += 1
+        transaction.on_commit(marker)
+
+    def _on_marker_released(self, savepoint: '_Savepoint', _marker_ref):
+        self.pending_markers_count -= 1
+        if not self.committed:
+            # Discarded by Django without having been called: the savepoint (or the transaction) was rolled back
+            savepoint.rolled_back = True
+            if not self.pending_markers_count:
+                self._detach()
+
+    def _detach(self):
+        if getattr(self.connection, 'serializable_model_pending_changes', None) is self:
+            self.connection.serializable_model_pending_changes = None
+
+
+@dataclass
+class _Savepoint:
+    rolled_back: bool = False
+    marker_ref: Optional[weakref.ref] = None
+
+
+@dataclass(frozen=True)
+class _ChangeState:
+    savepoint: _Savepoint
+    instance: 'SerializableModel'
+    to_delete: bool
+
+
+class _SavepointMarker:
+    def __init__(self, pending_changes: _PendingChanges):
+        self.pending_changes = pending_changes
+
+    def __call__(self):
+        self.pending_changes.flush()
+
+
+def register_change_on_commit(instance, to_delete=False):
+    connection = transaction.get_connection()
+    pending_changes = getattr(connection, 'serializable_model_pending_changes', None)
+    if pending_changes is None:
+        pending_changes = connection.serializable_model_pending_changes = _PendingChanges(connection)
+    pending_changes.add(instance, to_delete)
+
+
 def serializable_model_post_save(instance):
     # This function is called in the save() method of SerializableModel and AuditableSerializableModel
     # Any change made here will be applied to all models inheriting SerializableModel or AuditableSerializableModel
@@ -147,53 +250,179 @@ def send_to_queue(instance, to_delete=False):
     serialized_instance = wrap_serialization(serialize(instance, to_delete), to_delete)
 
     try:
-        # Try to resend message present in cache
-        message_queue_cache.retry_all_cached_messages()
-        # Send current message
+        # Messages present in cache are sent by the drainer (cf. drain_message_queue_cache command)
         queue_sender.send_message(queue_name, serialized_instance)
-    except (ChannelClosed, ConnectionClosed):
+    except (AMQPConnectionError, AMQPChannelError) as e:
         # Save current message queue cache database for retry later
-        MessageQueueCache.objects.create(queue=queue_name, data=serialized_instance)
+        _keep_in_cache(queue_name, [serialized_instance], e)
+
+
+def serializable_model_post_change_many(changes: List[Tuple['SerializableModel', bool]]):
+    # Called at the commit of a transaction in which serializable models have been saved or deleted
+    if hasattr(settings, 'QUEUES') and settings.QUEUES:
+        send_many_to_queue(changes)
+
+
+def send_many_to_queue(changes: List[Tuple['SerializableModel', bool]]):
+    queue_name = settings.QUEUES.get('QUEUES_NAME').get('MIGRATIONS_TO_PRODUCE')
+    serialized_instances = []
+    for instance, to_delete in changes:
+        try:
+            serialized_instances.append(wrap_serialization(serialize(instance, to_delete), to_delete))
+        except Exception:
+            # The other changes of the transaction are still sent
+            LOGGER.exception(f"Unable to serialize {instance._meta.label} {instance.uuid}: message not sent")
+
+    try:
+        # Send all the messages of the transaction at once
+        queue_sender.send_messages(queue_name, serialized_instances)
+    except (AMQPConnectionError, AMQPChannelError) as e:
+        # Save current messages in queue cache database for retry later
+        _keep_in_cache(queue_name, serialized_instances, e)
+
+
+def _keep_in_cache(queue_name: str, serialized_instances: List[Dict], error: Exception):
+    MessageQueueCache.objects.bulk_create([
+        MessageQueueCache(queue=queue_name, data=serialized_instance)
+        for serialized_instance in serialized_instances
+    ])
+    if isinstance(error, CircuitOpenError):
+        # Broker known to be down: no connection attempted, the failure which opened the circuit is already logged
+        LOGGER.debug(str(error))
+    else:
         LOGGER.exception('QueueServer is not installed or not launched')
 
 
+# Values of these types are sent as is in the JSON message
+JSON_NATIVE_TYPES = (str, int, float, bool, type(None))
+JSON_NATIVE_FIELDS = (models.CharField, models.TextField, models.IntegerField, models.FloatField, models.BooleanField)
+STRING_CONVERTED_FIELDS = (models.UUIDField, models.DecimalField, models.TimeField, models.DurationField)
+# Limits of the foreign keys fetched with select_related() by serialize_many(): the ones beyond are fetched on access
+SELECT_RELATED_MAX_DEPTH = 3
+SELECT_RELATED_MAX_JOINS = 10
+
+
+@dataclass(frozen=True)
+class _FieldSerializer:
+    name: str
+    attname: str
+    convert: Optional[Callable[[Any], Any]] = None  # Only for the fields which are not relations
+    is_relation: bool = False
+    # Related model of the foreign keys followed by serialize() (related model having a uuid)
+    serialized_related_model: Optional[type] = None
+
+
+@dataclass(frozen=True)
+class SerializerPlan:
+    label: str
+    fields: Tuple[_FieldSerializer, ...]
+
+
+@functools.lru_cache(maxsize=None)
+def get_serializer_plan(model_class) -> SerializerPlan:
+    """Field accessors and converters of a model, computed once instead of probing each value at each serialization"""
+    return SerializerPlan(
+        label=model_class._meta.label,
+        fields=tuple(_build_field_serializer(field) for field in model_class._meta.fields),
+    )
+
+
+def _build_field_serializer(field) -> _FieldSerializer:
+    if field.is_relation:
+        return _FieldSerializer(
+            name=field.name,
+            attname=field.attname,
+            is_relation=True,
+            serialized_related_model=field.related_model if hasattr(field.related_model, 'uuid') else None,
+        )
+    if isinstance(field, (DateTimeField, DateField)):
+        convert = _convert_datetime_to_long
+    elif isinstance(field, STRING_CONVERTED_FIELDS):
+        convert = _convert_to_str
+    elif isinstance(field, JSON_NATIVE_FIELDS):
+        convert = _convert_native_value
+    else:
+        convert = _convert_any_value
+    return _FieldSerializer(name=field.name, attname=field.attname, convert=convert)
+
+
+def _convert_to_str(value):
+    return None if value is None else force_str(value)
+
+
+def _convert_native_value(value):
+    return value if isinstance(value, JSON_NATIVE_TYPES) else force_str(value)
+
+
+def _convert_any_value(value):
+    # Field type unknown by the plan (ex: JSONField): the value is sent as is only if it can be dumped in JSON
+    if isinstance(value, JSON_NATIVE_TYPES):
+        return value
+    try:
+        json.dumps(value)
+        return value
+    except TypeError:
+        return force_str(value)
+
+
 # TODO :: If record is to delete, we don't need to send the entire object, only the UUID is necessary to send.
 # TODO :: This need to correct the algorithm to consume messages.
 def serialize(obj, to_delete, last_syncs=None):
     if obj:
+        plan = get_serializer_plan(obj.__class__)
         fields = {}
-        for f in obj.__class__._meta.fields:
-            if f.is_relation and to_delete:
+        for field in plan.fields:
+            if not field.is_relation:
+                fields[field.name] = field.convert(getattr(obj, field.attname))
+            elif to_delete:
                 # If record is to delete, it's not necessary to find trough fk field values
                 # (cf. todo above to clean this code)
-                attribute = None
-            else:
-                attribute = getattr(obj, f.name)
-            if f.is_relation and not to_delete:
-                try:
-                    if attribute and getattr(attribute, 'uuid'):
-                        fields[f.name] = serialize(attribute, to_delete, last_syncs=last_syncs)
-                except AttributeError:
-                    pass
-            else:
-                try:
-                    json.dumps(attribute)
-                    fields[f.name] = attribute
-                except TypeError:
-                    if isinstance(f, (DateTimeField, DateField)):
-                        dt = attribute
-                        fields[f.name] = _convert_datetime_to_long(dt)
-                    else:
-                        fields[f.name] = force_str(attribute)
-        class_label = obj.__class__._meta.label
+                fields[field.name] = None
+            elif field.serialized_related_model and getattr(obj, field.attname) is not None:
+                # The related object is fetched from the database only if it is not already cached (select_related)
+                attribute = getattr(obj, field.name)
+                if attribute.uuid:
+                    fields[field.name] = serialize(attribute, to_delete, last_syncs=last_syncs)
         last_sync = None
         if last_syncs:
-            last_sync = _convert_datetime_to_long(last_syncs.get(class_label))
-        return {"model": class_label, "fields": fields, 'last_sync': last_sync}
+            last_sync = _convert_datetime_to_long(last_syncs.get(plan.label))
+        return {"model": plan.label, "fields": fields, 'last_sync': last_sync}
     else:
         return None
 
 
+def serialize_many(queryset, to_delete, last_syncs=None) -> List[Dict]:
+    """
+    Serialize all the records of the queryset. The related objects serialized with them are fetched in the same query
+    (along the foreign keys tree), instead of one query by record and by foreign key.
+    """
+    if not to_delete:
+        queryset = queryset.select_related(*get_related_paths_to_serialize(queryset.model))
+    return [serialize(record, to_delete, last_syncs=last_syncs) for record in queryset]
+
+
+@functools.lru_cache(maxsize=None)
+def get_related_paths_to_serialize(model_class) -> Tuple[str, ...]:
+    """
+    Paths of the foreign keys followed by serialize(), taken from the serializer plans: the foreign keys to models
+    without uuid are never joined. The nearest ones are taken first (breadth first) within the depth and joins limits.
+    """
+    paths = []
+    models_to_visit = collections.deque([('', model_class, 1)])
+    while models_to_visit:
+        path_prefix, current_model, depth = models_to_visit.popleft()
+        for field in get_serializer_plan(current_model).fields:
+            if not field.serialized_related_model:
+                continue
+            if len(paths) >= SELECT_RELATED_MAX_JOINS:
+                return tuple(paths)
+            path = f"{path_prefix}{field.name}"
+            paths.append(path)
+            if depth < SELECT_RELATED_MAX_DEPTH:
+                models_to_visit.append((f"{path}__", field.serialized_related_model, depth + 1))
+    return tuple(paths)
+
+
 def wrap_serialization(body, to_delete=False):
     wrapped_body = {"body": body}
 
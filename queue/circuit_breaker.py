@@ -0,0 +1,125 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import contextlib
+import threading
+import time
+from typing import Dict, Optional
+
+from pika.exceptions import AMQPConnectionError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(AMQPConnectionError):
+    """Raised without any network attempt while the broker is considered unavailable."""
+
+    def __str__(self):
+        return f"Circuit breaker is open: connection to the broker not attempted ({self.args[0]})"
+
+
+class CircuitBreaker:
+    """
+    Stop trying to connect to the broker after failure_threshold consecutive connection failures.
+
+    closed: connections are attempted, failures are counted.
+    open: connections fail immediately with CircuitOpenError during cool_down seconds.
+    half-open: after the cool down, one connection is attempted (the other callers still fail immediately).
+               Its success closes the circuit, its failure opens it again for cool_down seconds.
+    """
+    def __init__(self, failure_threshold: int = 3, cool_down: float = 30):
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failure_count = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._get_remaining_cool_down() <= 0:
+                return HALF_OPEN
+            return self._state
+
+    @contextlib.contextmanager
+    def guard(self):
+        self._before_call()
+        try:
+            yield
+        except AMQPConnectionError:
+            self._record_failure()
+            raise
+        except BaseException:
+            self._release_trial()
+            raise
+        self._record_success()
+
+    def get_status(self) -> Dict:
+        state = self.state
+        with self._lock:
+            return {
+                'state': state,
+                'failure_count': self._failure_count,
+                'remaining_cool_down': max(self._get_remaining_cool_down(), 0) if self._state == OPEN else 0,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._state, self._failure_count, self._opened_at = CLOSED, 0, None
+
+    def _before_call(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                raise CircuitOpenError("trial connection in progress")
+            if self._state == OPEN:
+                remaining_cool_down = self._get_remaining_cool_down()
+                if remaining_cool_down > 0:
+                    raise CircuitOpenError(f"next attempt in {remaining_cool_down:.0f}s")
+                self._state = HALF_OPEN  # This caller makes the trial connection
+
+    def _record_success(self):
+        with self._lock:
+            self._state, self._failure_count, self._opened_at = CLOSED, 0, None
+
+    def _record_failure(self):
+        with self._lock:
+            self._failure_count += 1
+            if self._state == HALF_OPEN or self._failure_count >= self.failure_threshold:
+                self._state, self._opened_at = OPEN, time.monotonic()
+
+    def _release_trial(self):
+        # Unexpected error during the trial connection: let the next caller try again
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = OPEN
+
+    def _get_remaining_cool_down(self) -> float:
+        return self._opened_at + self.cool_down - time.monotonic()
+
+    def _reset_after_fork(self):
+        self._lock = threading.Lock()  # May have been held by another thread of the parent during the fork
@@ -23,20 +23,27 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import atexit
+import contextlib
 import json
 import logging
+import os
+import threading
 from typing import Optional, Dict, Callable, List
 
 import pika
 from django.conf import settings
-from pika.exceptions import ChannelClosed
+from pika.exceptions import ChannelClosed, AMQPConnectionError, AMQPChannelError
 
+from osis_common.queue.circuit_breaker import CircuitBreaker
 from osis_common.queue.queue_utils import get_pika_connexion_parameters
 
 logger = logging.getLogger(settings.QUEUE_EXCEPTION_LOGGER)
 
 def get_connection(client_properties: Optional[Dict] = None):
-    return pika.BlockingConnection(parameters=get_pika_connexion_parameters(client_properties=client_properties))
+    # Fail fast (CircuitOpenError) instead of waiting for the connection timeout when the broker is known to be down
+    with get_circuit_breaker().guard():
+        return pika.BlockingConnection(parameters=get_pika_connexion_parameters(client_properties=client_properties))
 
 
 def get_channel(connection, queue_name):
@@ -51,12 +58,12 @@ def get_channel(connection, queue_name):
 def send_message(queue_name, message, connection=None, channel=None):
     """
     Send the message in the queue passed in parameter.
-    If the connection doesn't exist, the function will create it, send the message, then close the connection.
-    That's the same for the channel ; if any channel is given, the function will create it, send the message,
-    then close the channel.
+    If no connection is given, the message is sent through a long-lived connection of the process
+    (cf. QueuePublisherPool) which is kept open for the next messages.
+    If a connection is given (with or without a channel), the message is sent through it (a channel is created if
+    none is given) and the channel and the connection are closed after the message is sent.
 
-    WARNING : If a connection or a channel is given, the function doesn't close it. Do not forget to close
-              the channel and the connection after you sent all your messages in the queue.
+    WARNING : A given connection or channel can not be reused for the next messages: it is closed by the function.
 
     :param queue_name: the name of the queue in which we have to send the JSON message.
     :param message: JSON data sent into the queue.
@@ -66,6 +73,11 @@ def send_message(queue_name, message, connection=None, channel=None):
     if channel and not connection:
         raise Exception('Please give the connection from which you opened the channel given by parameter')
 
+    if not connection and not channel:
+        # Reuse a long-lived connection of the process instead of opening a new one for each message
+        _send_message_with_publisher_pool(queue_name, message)
+        return
+
     #Get connection [Raise exception if no connection]
     if not connection or connection.is_closed:
         connection = get_connection()
@@ -93,25 +105,55 @@ def send_message(queue_name, message, connection=None, channel=None):
             connection.close()
 
 
+def _send_message_with_publisher_pool(queue_name: str, message):
+    try:
+        with get_publisher_pool().acquire(queue_name) as publisher:
+            publisher.publish(message)
+    except (AMQPConnectionError, AMQPChannelError):
+        raise  # Broker unavailable: let the caller keep the message (cf. MessageQueueCache)
+    except Exception:
+        logger.exception("Exception in queue")
+
+
+def send_messages(queue_name: str, messages: List[Dict]):
+    """
+    Send all the messages in the queue through a long-lived connection of the process (cf. QueuePublisherPool),
+    in one AMQP transaction: only one round trip to the broker instead of one delivery confirmation by message.
+    Raise AMQPConnectionError / AMQPChannelError if the broker is unavailable: none of the messages is sent.
+    """
+    if not messages:
+        return
+    with get_publisher_pool().acquire(queue_name) as publisher:
+        publisher.publish_many(messages)
+
+
 class QueuePublisher:
     def __init__(
         self,
         queue_name: str,
         connexion_params: pika.ConnectionParameters = None,
+        declare_queue: bool = False,
     ):
         self.queue_name = queue_name
         self.connexion_params = connexion_params or get_pika_connexion_parameters()
+        self.declare_queue = declare_queue
         self._connection: Optional[pika.BlockingConnection] = None
         self._channel: Optional[pika.adapters.blocking_connection.BlockingChannel] = None
+        self._tx_channel: Optional[pika.adapters.blocking_connection.BlockingChannel] = None
 
     def connect(self):
         if not self._connection or self._connection.is_closed:
-            self._connection = pika.BlockingConnection(self.connexion_params)
+            with get_circuit_breaker().guard():
+                self._connection = pika.BlockingConnection(self.connexion_params)
+            self._channel, self._tx_channel = None, None
+        if not self._channel or self._channel.is_closed:
             self._channel = self._connection.channel()
+            if self.declare_queue:
+                self._channel.queue_declare(queue=self.queue_name, durable=True)
 
             self._channel.confirm_delivery()
 
-    def publish(self, message: Dict) -> None:
+    def publish(self, message: Dict, retry_on_connection_lost: bool = True) -> None:
         self.connect()
 
         properties = pika.BasicProperties(content_type="application/json", delivery_mode=2)
@@ -125,16 +167,147 @@ class QueuePublisher:
         except json.JSONDecodeError as e:
             logger.exception(f"Unable to serialize data which will be sent to the queue: {self.queue_name}")
             raise e
-        except ChannelClosed:
+        except (ChannelClosed, AMQPConnectionError):
+            # Also raised when a long-lived connection was dropped by the broker while idle (ex: missed heartbeats)
+            if not retry_on_connection_lost:
+                raise
             logger.warning(f"Reconnect auto to queue {self.queue_name}")
-            self.connect()
-            self.publish(message)
+            self._discard_connection()
+            self.publish(message, retry_on_connection_lost=False)
         except Exception as e:
             logger.error(f"Publish failed to queue {self.queue_name}: {str(e)}")
             raise
 
+    def publish_many(self, messages: List[Dict], retry_on_connection_lost: bool = True) -> None:
+        # A BlockingChannel waits for the confirmation of each message: use a transaction to confirm them all at once
+        bodies = [json.dumps(message) for message in messages]
+        self.connect()
+        if not self._tx_channel or self._tx_channel.is_closed:
+            self._tx_channel = self._connection.channel()
+            self._tx_channel.tx_select()
+
+        properties = pika.BasicProperties(content_type="application/json", delivery_mode=2)
+        try:
+            for body in bodies:
+                self._tx_channel.basic_publish(
+                    exchange="",
+                    routing_key=self.queue_name,
+                    body=body,
+                    properties=properties
+                )
+            self._tx_channel.tx_commit()
+        except (ChannelClosed, AMQPConnectionError):
+            # Nothing was committed: the whole batch can be sent again
+            if not retry_on_connection_lost:
+                raise
+            logger.warning(f"Reconnect auto to queue {self.queue_name}")
+            self._discard_connection()
+            self.publish_many(messages, retry_on_connection_lost=False)
+
     def close(self):
+        if self._tx_channel and self._tx_channel.is_open:
+            self._tx_channel.close()
         if self._channel and self._channel.is_open:
             self._channel.close()
         if self._connection and not self._connection.is_closed:
             self._connection.close()
+
+    def _discard_connection(self):
+        try:
+            self.close()
+        except Exception:
+            pass  # Connection already broken
+        self._connection, self._channel, self._tx_channel = None, None, None
+
+
+class QueuePublisherPool:
+    """
+    Process-wide pool of long-lived QueuePublisher, by queue name.
+
+    A publisher (= one connection) is used by one thread at a time: acquire() takes an idle publisher or creates a new
+    one (connected lazily on first publish) and gives it back afterwards. At most QUEUES['PUBLISHER_POOL_MAX_IDLE']
+    idle publishers are kept by queue, the others are closed. Connections inherited from a parent process (fork of
+    gunicorn workers) are never reused, and idle connections are closed at exit.
+    """
+    def __init__(self, max_idle_by_queue: int = None):
+        self.max_idle_by_queue = max_idle_by_queue or settings.QUEUES.get('PUBLISHER_POOL_MAX_IDLE', 4)
+        self._lock = threading.Lock()
+        self._idle_publishers: Dict[str, List[QueuePublisher]] = {}
+        self._pid = os.getpid()
+
+    @contextlib.contextmanager
+    def acquire(self, queue_name: str):
+        publisher = self._take_idle_publisher(queue_name) or QueuePublisher(queue_name=queue_name, declare_queue=True)
+        try:
+            yield publisher
+        except Exception:
+            publisher._discard_connection()
+            raise
+        self._give_back(publisher)
+
+    def close(self):
+        with self._lock:
+            publishers = [publisher for idle in self._idle_publishers.values() for publisher in idle]
+            self._idle_publishers = {}
+        for publisher in publishers:
+            publisher._discard_connection()
+
+    def _take_idle_publisher(self, queue_name: str) -> Optional[QueuePublisher]:
+        with self._lock:
+            self._forget_inherited_publishers()
+            idle_publishers = self._idle_publishers.get(queue_name)
+            return idle_publishers.pop() if idle_publishers else None
+
+    def _give_back(self, publisher: QueuePublisher):
+        with self._lock:
+            self._forget_inherited_publishers()
+            idle_publishers = self._idle_publishers.setdefault(publisher.queue_name, [])
+            if len(idle_publishers) < self.max_idle_by_queue:
+                idle_publishers.append(publisher)
+                return
+        publisher._discard_connection()
+
+    def _forget_inherited_publishers(self):
+        # Sockets are shared with the parent process after a fork: drop them without closing them
+        if self._pid != os.getpid():
+            self._idle_publishers = {}
+            self._pid = os.getpid()
+
+    def _reset_after_fork(self):
+        self._lock = threading.Lock()  # May have been held by another thread of the parent during the fork
+        self._idle_publishers = {}
+        self._pid = os.getpid()
+
+
+_publisher_pool: Optional[QueuePublisherPool] = None
+_publisher_pool_lock = threading.Lock()
+
+
+def get_publisher_pool() -> QueuePublisherPool:
+    global _publisher_pool
+    if _publisher_pool is None:
+        with _publisher_pool_lock:
+            if _publisher_pool is None:
+                publisher_pool = QueuePublisherPool()
+                atexit.register(publisher_pool.close)
+                os.register_at_fork(after_in_child=publisher_pool._reset_after_fork)
+                _publisher_pool = publisher_pool
+    return _publisher_pool
+
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+_circuit_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        with _circuit_breaker_lock:
+            if _circuit_breaker is None:
+                circuit_breaker = CircuitBreaker(
+                    failure_threshold=settings.QUEUES.get('CIRCUIT_BREAKER_FAILURE_THRESHOLD', 3),
+                    cool_down=settings.QUEUES.get('CIRCUIT_BREAKER_COOL_DOWN', 30),
+                )
+                os.register_at_fork(after_in_child=circuit_breaker._reset_after_fork)
+                _circuit_breaker = circuit_breaker
+    return _circuit_breaker
@@ -25,8 +25,9 @@
 import pika
 from django.conf import settings
 
-from osis_common.status.service_status import ServiceStatus, ServiceStatusError, ServiceStatusSuccess
+from osis_common.queue.queue_sender import get_circuit_breaker
 from osis_common.queue.queue_utils import get_pika_connexion_parameters
+from osis_common.status.service_status import ServiceStatus, ServiceStatusError, ServiceStatusSuccess
 
 SERVICE_NAME = "queue"
 
@@ -34,12 +35,18 @@ SERVICE_NAME = "queue"
 def check_queue() -> 'ServiceStatus':
     """
     Check that the queues works.
+    The broker is probed with its own connection, not through the circuit breaker of the queue sender: the probe
+    neither consumes its half-open trial nor changes its state, which is reported in the details.
     :return ServiceStatus
     """
+    if not (hasattr(settings, 'QUEUES') and settings.QUEUES):
+        return ServiceStatusSuccess(service=SERVICE_NAME)
+    details = {'circuit_breaker': get_circuit_breaker().get_status()}
     try:
-        if hasattr(settings, 'QUEUES') and settings.QUEUES:
-            connection = pika.BlockingConnection(
-                parameters=get_pika_connexion_parameters())
+        connection = pika.BlockingConnection(
+            parameters=get_pika_connexion_parameters(client_properties={'connection_name': 'status_check'})
+        )
+        connection.close()
     except Exception as e:
-        return ServiceStatusError(service=SERVICE_NAME, original_error=e)
-    return ServiceStatusSuccess(service=SERVICE_NAME)
+        return ServiceStatusError(service=SERVICE_NAME, original_error=e, details=details)
+    return ServiceStatusSuccess(service=SERVICE_NAME, details=details)
@@ -23,10 +23,13 @@
 #
 ##############################################################################
 
+from typing import Optional, Dict
+
 
 class ServiceStatus:
-    def __init__(self, service: str):
+    def __init__(self, service: str, details: Optional[Dict] = None):
         self.service = service
+        self.details = details
 
     def is_in_error(self) -> bool:
         return False
@@ -38,9 +41,9 @@ class ServiceStatusSuccess(ServiceStatus):
 
 
 class ServiceStatusError(ServiceStatus):
-    def __init__(self, service: str, original_error: 'Exception'):
+    def __init__(self, service: str, original_error: 'Exception', details: Optional[Dict] = None):
         self.error = original_error
-        super().__init__(service)
+        super().__init__(service, details=details)
 
     def is_in_error(self) -> bool:
         return True
@@ -0,0 +1,88 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest.mock import patch
+
+from django.test import TestCase
+from pika.exceptions import AMQPConnectionError
+
+from osis_common.models.message_queue_cache import MessageQueueCache, MessageQueueCacheDrainer
+
+
+@patch("osis_common.models.message_queue_cache.queue_sender.send_messages")
+class MessageQueueCacheDrainerTestCase(TestCase):
+    def setUp(self):
+        self.first_message = MessageQueueCache.objects.create(queue='queue_a', data={'message': 1})
+        self.second_message = MessageQueueCache.objects.create(queue='queue_a', data={'message': 2})
+        self.third_message = MessageQueueCache.objects.create(queue='queue_b', data={'message': 3})
+
+    def test_should_send_messages_by_queue_in_cache_order_and_delete_them(self, mock_send_messages):
+        drained_count = MessageQueueCacheDrainer(batch_size=10).drain()
+
+        self.assertEqual(drained_count, 3)
+        self.assertEqual(
+            [call.args for call in mock_send_messages.call_args_list],
+            [('queue_a', [{'message': 1}, {'message': 2}]), ('queue_b', [{'message': 3}])],
+        )
+        self.assertFalse(MessageQueueCache.objects.exists())
+
+    def test_should_drain_by_batches(self, mock_send_messages):
+        drained_count = MessageQueueCacheDrainer(batch_size=2).drain(max_batches=1)
+
+        self.assertEqual(drained_count, 2)
+        self.assertQuerySetEqual(MessageQueueCache.objects.all(), [self.third_message])
+
+    def test_should_keep_messages_not_sent_when_broker_is_unavailable(self, mock_send_messages):
+        mock_send_messages.side_effect = [None, AMQPConnectionError()]
+
+        drained_count = MessageQueueCacheDrainer(batch_size=10).drain()
+
+        self.assertEqual(drained_count, 2)
+        self.assertQuerySetEqual(MessageQueueCache.objects.all(), [self.third_message])
+
+    def test_should_skip_message_failing_until_max_attempts(self, mock_send_messages):
+        def send_messages(queue_name, messages):
+            if {'message': 1} in messages:
+                raise TypeError("Object of type set is not JSON serializable")
+        mock_send_messages.side_effect = send_messages
+        drainer = MessageQueueCacheDrainer(batch_size=10, max_attempts=2)
+
+        self.assertEqual(drainer.drain(), 1)
+        self.first_message.refresh_from_db()
+        self.assertEqual(self.first_message.attempts_number, 1)
+
+        self.assertEqual(drainer.drain(), 0)
+        self.assertEqual(drainer.drain(), 1)
+        self.assertQuerySetEqual(MessageQueueCache.objects.all(), [self.first_message])
+
+    def test_should_keep_running_when_drain_fails(self, mock_send_messages):
+        drainer = MessageQueueCacheDrainer(batch_size=10)
+        with patch.object(drainer, 'drain', side_effect=[Exception("Database unavailable"), 3]) as mock_drain, \
+                patch.object(drainer._stop_event, 'wait') as mock_wait:
+            mock_wait.side_effect = lambda timeout: mock_drain.call_count == 2 and drainer.stop()
+            drainer.run_forever(poll_interval=1)
+
+        self.assertEqual(mock_drain.call_count, 2)
+        self.assertEqual([call.args for call in mock_wait.call_args_list], [(2,), (1,)])
@@ -27,11 +27,14 @@ from copy import deepcopy
 from unittest.mock import patch
 
 from django.conf import settings
+from django.db import transaction
 from django.test.testcases import TestCase, override_settings, TransactionTestCase
 
 from osis_common.models import message_queue_cache
-from osis_common.models.serializable_model import SerializableModel, serialize, persist, _make_upsert
-from osis_common.tests.models_for_tests.serializable_tests_models import ModelWithoutUser, ModelWithUser
+from osis_common.models.serializable_model import SerializableModel, serialize, persist, _make_upsert, \
+    get_serializer_plan, serialize_many, send_many_to_queue
+from osis_common.tests.models_for_tests.serializable_tests_models import ModelWithoutUser, ModelWithUser, \
+    ModelWithForeignKeys, ModelNotSerializable
 
 
 class TestSerializeObjectOnCommit(TransactionTestCase):
@@ -52,6 +55,87 @@ class TestSerializeObjectOnCommit(TransactionTestCase):
         mock_post_delete.assert_called_once_with(self.model_with_user, to_delete=True)
 
 
+class TestCoalesceChangesOnCommit(TransactionTestCase):
+    @patch("osis_common.models.serializable_model.serializable_model_post_change_many", side_effect=None)
+    def test_should_send_last_state_of_each_object_once_at_commit(self, mock_post_change_many):
+        with transaction.atomic():
+            model_with_user = ModelWithUser.objects.create(user='user1', name='With User')
+            model_without_user = ModelWithoutUser.objects.create(name='Dummy')
+            model_with_user.name = 'Renamed'
+            model_with_user.save()
+            self.assertFalse(mock_post_change_many.called)
+        mock_post_change_many.assert_called_once_with([(model_with_user, False), (model_without_user, False)])
+
+    @patch("osis_common.models.serializable_model.serializable_model_post_change_many", side_effect=None)
+    def test_should_keep_deletion_as_last_state(self, mock_post_change_many):
+        with transaction.atomic():
+            model_without_user = ModelWithoutUser.objects.create(name='Dummy')
+            model_without_user.delete()
+        mock_post_change_many.assert_called_once_with([(model_without_user, True)])
+
+    @patch("osis_common.models.serializable_model.serializable_model_post_change_many", side_effect=None)
+    def test_should_not_send_changes_of_rolled_back_savepoint(self, mock_post_change_many):
+        with transaction.atomic():
+            model_without_user = ModelWithoutUser.objects.create(name='Dummy')
+            try:
+                with transaction.atomic():
+                    ModelWithoutUser.objects.create(name='Rolled back')
+                    raise ValueError
+            except ValueError:
+                pass
+        mock_post_change_many.assert_called_once_with([(model_without_user, False)])
+
+    @patch("osis_common.models.serializable_model.serializable_model_post_change_many", side_effect=None)
+    def test_should_send_last_state_of_object_saved_in_nested_atomic_blocks(self, mock_post_change_many):
+        with transaction.atomic():
+            model_without_user = ModelWithoutUser.objects.create(name='v1')
+            with transaction.atomic():
+                other_instance = ModelWithoutUser.objects.get(pk=model_without_user.pk)
+                other_instance.name = 'v2'
+                other_instance.save()
+            model_without_user.name = 'v3'
+            model_without_user.save()
+        mock_post_change_many.assert_called_once_with([(model_without_user, False)])
+        self.assertEqual(mock_post_change_many.call_args.args[0][0][0].name, 'v3')
+
+    @patch("osis_common.models.serializable_model.serializable_model_post_change_many", side_effect=None)
+    def test_should_send_state_saved_before_rolled_back_savepoint(self, mock_post_change_many):
+        with transaction.atomic():
+            model_without_user = ModelWithoutUser.objects.create(name='v1')
+            try:
+                with transaction.atomic():
+                    other_instance = ModelWithoutUser.objects.get(pk=model_without_user.pk)
+                    other_instance.name = 'v2'
+                    other_instance.save()
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertIs(mock_post_change_many.call_args.args[0][0][0], model_without_user)
+
+    @patch("osis_common.models.serializable_model.serializable_model_post_change_many", side_effect=None)
+    def test_should_not_send_changes_of_rolled_back_transaction(self, mock_post_change_many):
+        try:
+            with transaction.atomic():
+                ModelWithoutUser.objects.create(name='Rolled back')
+                raise ValueError
+        except ValueError:
+            pass
+        with transaction.atomic():
+            model_without_user = ModelWithoutUser.objects.create(name='Dummy')
+        mock_post_change_many.assert_called_once_with([(model_without_user, False)])
+        self.assertIsNone(transaction.get_connection().serializable_model_pending_changes)
+
+    @override_settings(QUEUES={'QUEUES_NAME': {'MIGRATIONS_TO_PRODUCE': 'queue'}})
+    @patch("osis_common.models.serializable_model.queue_sender.send_messages")
+    def test_should_send_other_changes_when_one_instance_cannot_be_serialized(self, mock_send_messages):
+        with patch("osis_common.models.serializable_model.serialize", side_effect=[ValueError, {'name': 'Dummy'}]):
+            send_many_to_queue([
+                (ModelWithoutUser(name='Not serializable'), False),
+                (ModelWithoutUser(name='Dummy'), False),
+            ])
+        mock_send_messages.assert_called_once_with('queue', [{'body': {'name': 'Dummy'}}])
+
+
 if hasattr(settings, 'QUEUES') and settings.QUEUES:
     class TestMessageQueueCache(TransactionTestCase):
         def test_message_queue_cache_no_insert(self):
@@ -103,11 +187,62 @@ if hasattr(settings, 'QUEUES') and settings.QUEUES:
             message_queue_cache.MessageQueueCache.objects.create(queue=queue_name, data={'body':{'model': 'test_2', 'fields': {'test': True}}})
             message_queue_cache.MessageQueueCache.objects.create(queue=queue_name, data={'body':{'model': 'test_3', 'fields': {'test': True}}})
             self.assertEqual(3, message_queue_cache.get_messages_to_retry().count())
-            # Create Model
+            # Create Model: cached messages are not sent by the user request anymore
             ModelWithoutUser.objects.create(name='Dummy')
+            self.assertEqual(3, message_queue_cache.get_messages_to_retry().count())
+            message_queue_cache.MessageQueueCacheDrainer().drain()
             self.assertEqual(0, message_queue_cache.get_messages_to_retry().count())
 
 
+class TestSerialize(TestCase):
+    def test_should_build_serializer_plan_once_by_model(self):
+        self.assertIs(get_serializer_plan(ModelWithUser), get_serializer_plan(ModelWithUser))
+
+    @patch("osis_common.models.serializable_model.json.dumps")
+    def test_should_convert_values_without_trial_json_dumps(self, mock_json_dumps):
+        obj = ModelWithUser.objects.create(user='user1', name='With User')
+
+        structure_serialized = serialize(obj, to_delete=False)
+
+        self.assertFalse(mock_json_dumps.called)
+        self.assertEqual(structure_serialized, {
+            'model': 'osis_common.ModelWithUser',
+            'fields': {'id': obj.id, 'uuid': str(obj.uuid), 'user': 'user1', 'name': 'With User'},
+            'last_sync': None,
+        })
+
+    def test_serialize_many_should_fetch_records_in_one_query(self):
+        ModelWithoutUser.objects.create(name='Dummy 1')
+        ModelWithoutUser.objects.create(name='Dummy 2')
+
+        with self.assertNumQueries(1):
+            structures_serialized = serialize_many(ModelWithoutUser.objects.order_by('name'), to_delete=False)
+
+        self.assertEqual(
+            [structure_serialized['fields']['name'] for structure_serialized in structures_serialized],
+            ['Dummy 1', 'Dummy 2']
+        )
+
+    def test_serialize_many_should_join_only_foreign_keys_read_by_serializer(self):
+        model_with_user = ModelWithUser.objects.create(user='user1', name='With User')
+        model_not_serializable = ModelNotSerializable.objects.create()
+        for name in ['Dummy 1', 'Dummy 2']:
+            ModelWithForeignKeys.objects.create(
+                name=name, model_with_user=model_with_user, model_not_serializable=model_not_serializable,
+            )
+
+        with self.assertNumQueries(1) as captured_queries:
+            structures_serialized = serialize_many(ModelWithForeignKeys.objects.order_by('name'), to_delete=False)
+
+        self.assertNotIn(ModelNotSerializable._meta.db_table, captured_queries[0]['sql'])
+        self.assertEqual(
+            [structure_serialized['fields']['model_with_user']['fields']['uuid']
+             for structure_serialized in structures_serialized],
+            [str(model_with_user.uuid)] * 2,
+        )
+        self.assertNotIn('model_not_serializable', structures_serialized[0]['fields'])
+
+
 class TestPersist(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -75,3 +75,9 @@ class ModelWithoutUser(SerializableModel):
 
 class ModelNotSerializable(models.Model):
     pass
+
+
+class ModelWithForeignKeys(SerializableModel):
+    name = CharField(max_length=30)
+    model_with_user = models.ForeignKey(ModelWithUser, on_delete=models.CASCADE)
+    model_not_serializable = models.ForeignKey(ModelNotSerializable, null=True, on_delete=models.SET_NULL)
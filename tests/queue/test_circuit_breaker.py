@@ -0,0 +1,127 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from pika.exceptions import AMQPConnectionError
+
+from osis_common.queue.circuit_breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+from osis_common.status.queue import check_queue
+
+
+@mock.patch('osis_common.queue.circuit_breaker.time.monotonic', return_value=1000)
+class CircuitBreakerTestCase(SimpleTestCase):
+    def setUp(self):
+        self.circuit_breaker = CircuitBreaker(failure_threshold=2, cool_down=30)
+        self.connect = mock.Mock(side_effect=AMQPConnectionError)
+
+    def _call(self):
+        with self.circuit_breaker.guard():
+            self.connect()
+
+    def _fail(self, times: int):
+        for _ in range(times):
+            with self.assertRaises(AMQPConnectionError):
+                self._call()
+
+    def test_should_open_after_consecutive_failures(self, mock_monotonic):
+        self._fail(times=1)
+        self.assertEqual(self.circuit_breaker.state, CLOSED)
+
+        self._fail(times=1)
+        self.assertEqual(self.circuit_breaker.state, OPEN)
+
+    def test_should_fail_without_attempt_while_open(self, mock_monotonic):
+        self._fail(times=2)
+
+        mock_monotonic.return_value = 1029
+        with self.assertRaises(CircuitOpenError):
+            self._call()
+        self.assertEqual(self.connect.call_count, 2)
+
+    def test_should_close_when_trial_succeeds_after_cool_down(self, mock_monotonic):
+        self._fail(times=2)
+
+        mock_monotonic.return_value = 1030
+        self.assertEqual(self.circuit_breaker.state, HALF_OPEN)
+        self.connect.side_effect = None
+        self._call()
+        self.assertEqual(self.circuit_breaker.state, CLOSED)
+        self.assertEqual(self.circuit_breaker.get_status()['failure_count'], 0)
+
+    def test_should_open_again_when_trial_fails(self, mock_monotonic):
+        self._fail(times=2)
+
+        mock_monotonic.return_value = 1030
+        self._fail(times=1)
+        self.assertEqual(self.circuit_breaker.state, OPEN)
+        self.assertEqual(self.circuit_breaker.get_status()['remaining_cool_down'], 30)
+
+    def test_should_allow_only_one_trial_at_a_time(self, mock_monotonic):
+        self._fail(times=2)
+        mock_monotonic.return_value = 1030
+
+        with self.circuit_breaker.guard():
+            with self.assertRaises(CircuitOpenError):
+                self._call()
+        self.assertEqual(self.circuit_breaker.state, CLOSED)
+
+
+@override_settings(QUEUES={'QUEUE_URL': 'localhost'})
+@mock.patch('osis_common.queue.circuit_breaker.time.monotonic', return_value=1000)
+class CheckQueueTestCase(SimpleTestCase):
+    def setUp(self):
+        self.circuit_breaker = CircuitBreaker(failure_threshold=1, cool_down=30)
+        patcher = mock.patch('osis_common.status.queue.get_circuit_breaker', return_value=self.circuit_breaker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('osis_common.status.queue.get_pika_connexion_parameters')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('osis_common.status.queue.pika.BlockingConnection')
+        self.mock_connection = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_should_report_circuit_breaker_status(self, mock_monotonic):
+        status = check_queue()
+
+        self.assertFalse(status.is_in_error())
+        self.assertEqual(status.details, {'circuit_breaker': self.circuit_breaker.get_status()})
+
+    def test_should_not_consume_half_open_trial(self, mock_monotonic):
+        with self.assertRaises(AMQPConnectionError):
+            with self.circuit_breaker.guard():
+                raise AMQPConnectionError
+        mock_monotonic.return_value = 1030
+
+        status = check_queue()
+
+        self.assertFalse(status.is_in_error())
+        self.assertEqual(status.details['circuit_breaker']['state'], HALF_OPEN)
+        self.assertEqual(self.circuit_breaker.state, HALF_OPEN)
+        with self.circuit_breaker.guard():
+            pass
+        self.assertEqual(self.circuit_breaker.state, CLOSED)
@@ -0,0 +1,109 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import os
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from pika.exceptions import StreamLostError, AMQPConnectionError
+
+from osis_common.queue import queue_sender
+from osis_common.queue.circuit_breaker import CircuitBreaker, CircuitOpenError
+from osis_common.queue.queue_sender import QueuePublisherPool
+
+
+@override_settings(QUEUES={'PUBLISHER_POOL_MAX_IDLE': 1})
+class QueuePublisherPoolTestCase(SimpleTestCase):
+    def setUp(self):
+        patcher_params = mock.patch('osis_common.queue.queue_sender.get_pika_connexion_parameters')
+        patcher_params.start()
+        self.addCleanup(patcher_params.stop)
+        patcher_connection = mock.patch('osis_common.queue.queue_sender.pika.BlockingConnection')
+        self.mock_blocking_connection = patcher_connection.start()
+        self.addCleanup(patcher_connection.stop)
+        self.mock_blocking_connection.return_value.is_closed = False
+        self.mock_blocking_connection.return_value.channel.return_value.is_closed = False
+        self.circuit_breaker = CircuitBreaker(failure_threshold=1, cool_down=30)
+        patcher_circuit_breaker = mock.patch(
+            'osis_common.queue.queue_sender.get_circuit_breaker', return_value=self.circuit_breaker
+        )
+        patcher_circuit_breaker.start()
+        self.addCleanup(patcher_circuit_breaker.stop)
+
+        self.pool = QueuePublisherPool()
+
+    def _publish(self, queue_name='queue', message=None):
+        with self.pool.acquire(queue_name) as publisher:
+            publisher.publish(message or {'body': 'test'})
+
+    def test_should_reuse_connection_between_messages(self):
+        for _ in range(10):
+            self._publish()
+
+        self.mock_blocking_connection.assert_called_once()
+        channel = self.mock_blocking_connection.return_value.channel.return_value
+        channel.queue_declare.assert_called_once_with(queue='queue', durable=True)
+        self.assertEqual(channel.basic_publish.call_count, 10)
+
+    def test_should_reconnect_when_connection_was_lost(self):
+        self._publish()
+        channel = self.mock_blocking_connection.return_value.channel.return_value
+        channel.basic_publish.side_effect = [StreamLostError(), None]
+
+        self._publish()
+
+        self.assertEqual(self.mock_blocking_connection.call_count, 2)
+
+    def test_should_only_keep_max_idle_publishers(self):
+        with self.pool.acquire('queue'), self.pool.acquire('queue'):
+            pass
+
+        self.assertEqual(len(self.pool._idle_publishers['queue']), 1)
+
+    def test_should_not_reuse_connection_inherited_from_parent_process(self):
+        self._publish()
+
+        with mock.patch('osis_common.queue.queue_sender.os.getpid', return_value=os.getpid() + 1):
+            self._publish()
+
+        self.assertEqual(self.mock_blocking_connection.call_count, 2)
+
+    def test_send_message_should_raise_connection_errors_to_let_caller_cache_message(self):
+        self.mock_blocking_connection.side_effect = AMQPConnectionError()
+
+        with mock.patch.object(queue_sender, 'get_publisher_pool', return_value=self.pool):
+            with self.assertRaises(AMQPConnectionError):
+                queue_sender.send_message('queue', {'body': 'test'})
+
+    def test_should_not_attempt_connection_while_circuit_is_open(self):
+        self.mock_blocking_connection.side_effect = AMQPConnectionError()
+        with self.assertRaises(AMQPConnectionError):
+            self._publish()
+
+        with self.assertRaises(CircuitOpenError):
+            self._publish()
+        with self.assertRaises(CircuitOpenError):
+            queue_sender.get_connection()
+        self.mock_blocking_connection.assert_called_once()
@@ -23,17 +23,30 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import datetime
+import gzip
+import importlib.util
+import json
+import unittest
 import uuid
 from unittest.mock import patch
 
 import attr
 import mock
-from django.test import TestCase, override_settings
+from django.db import transaction, OperationalError
+from django.test import TestCase, override_settings, TransactionTestCase
 
-from osis_common.ddd.interface import Event
-from osis_common.models.inbox import Inbox
+from osis_common.ddd.interface import Event, EventHandler, EventConsumptionMode, EntityIdentity
+from osis_common.models.inbox import Inbox, InboxArchived
+from osis_common.models.outbox import Outbox, OutboxArchived
 from osis_common.utils.inbox_outbox import InboxConsumer, DEFAULT_ROUTING_STRATEGY_NAME, InboxConsumerRoutingStrategy, \
-    EventClassNotFound
+    EventClassNotFound, EventQueueProducer, InboxOutboxArchiver, EventQueueConsumer, DecodedDelivery, \
+    EventHandlersRegistry, HandlersPerContextFactory, InboxWorkersSupervisor, DatabaseNotificationListener, \
+    OUTBOX_NOTIFICATION_CHANNEL, get_inbox_notification_channel, RetryBackoffPolicy, ConsistentHashRing, \
+    InboxRebalancer, CONSISTENT_HASHING, collect_backlog_metrics, METRIC_EVENTS_PROCESSED, METRIC_EVENTS_ERRORED, \
+    METRIC_INBOX_BACKLOG, METRIC_OUTBOX_BACKLOG, SpanPayloadPolicy, InboxReplayer, EventMessageCodec, \
+    notify_inbox_workers_on_commit, sync_outbox_notify_trigger
+from osis_common.utils.metrics import InMemoryMetricsBackend
 
 
 @attr.dataclass(slots=True, frozen=True, kw_only=True)
@@ -48,6 +61,17 @@ class AnotherDummyEvent(Event):
     sigle_formation: str
 
 
+@attr.dataclass(slots=True, frozen=True)
+class DummyIdentity(EntityIdentity):
+    code: str
+
+
+@attr.dataclass(slots=True, frozen=True, kw_only=True)
+class DatedDummyEvent(Event):
+    entity_id: DummyIdentity
+    date_debut: datetime.date
+
+
 @override_settings(
     MESSAGE_BUS={'INBOX_MODEL': 'osis_common.models.inbox.Inbox', 'OUTBOX_MODEL': 'osis_common.models.outbox.Outbox'}
 )
@@ -69,12 +93,8 @@ class InboxConsumerTestCaseMixin(TestCase):
                 "noma": "54545454"
             },
             status=Inbox.PENDING,
-            meta={
-                'inbox_worker': {
-                    'strategy_name': DEFAULT_ROUTING_STRATEGY_NAME,
-                    'consumer_id': 0,
-                }
-            }
+            strategy_name=DEFAULT_ROUTING_STRATEGY_NAME,
+            consumer_id=0,
         )
         self.event_B = Inbox.objects.create(
             transaction_id=uuid.uuid4(),
@@ -85,12 +105,8 @@ class InboxConsumerTestCaseMixin(TestCase):
                 "noma": "15454545454"
             },
             status=Inbox.PENDING,
-            meta={
-                'inbox_worker': {
-                    'strategy_name': DEFAULT_ROUTING_STRATEGY_NAME,
-                    'consumer_id': 0,
-                }
-            }
+            strategy_name=DEFAULT_ROUTING_STRATEGY_NAME,
+            consumer_id=0,
         )
 
     def _mock_handlers_per_context(self):
@@ -148,14 +164,29 @@ class InboxConsumerDefaultStrategyTestCase(InboxConsumerTestCaseMixin):
             strategy_name=self.strategy_name,
         )
 
-        consumer.consume_all_unprocessed_events(batch_size=1)
+        found_events_count = consumer.consume_all_unprocessed_events(batch_size=1)
 
+        self.assertEqual(found_events_count, 1)
         self.event_A.refresh_from_db()
         self.assertEqual(self.event_A.status, Inbox.PROCESSED)
 
         self.event_B.refresh_from_db()
         self.assertEqual(self.event_B.status, Inbox.PENDING)
 
+    def test_should_not_process_event_reassigned_to_another_consumer_after_being_read(self):
+        consumer = InboxConsumer(
+            message_bus_instance=mock.Mock(),
+            context_name=self.context_name,
+            consumer_id=self.consumer_id,
+            strategy_name=self.strategy_name,
+        )
+        unprocessed_events_ids = consumer.get_unprocessed_events_ids(batch_size=10)
+        Inbox.objects.filter(pk=self.event_A.pk).update(consumer_id=1)
+
+        locked_events = consumer._lock_unprocessed_events(unprocessed_events_ids)
+
+        self.assertEqual(list(locked_events), [self.event_B])
+
     def test_consumer_all_unprocessed_events_raise_error_if_consumer_id_is_greater_than_0(self):
         with self.assertRaises(ValueError):
             InboxConsumer(
@@ -193,12 +224,8 @@ class InboxConsumerDefaultStrategyTestCase(InboxConsumerTestCaseMixin):
                 "noma": "15454545454"
             },
             status=Inbox.PENDING,
-            meta={
-                'inbox_worker': {
-                    'strategy_name': self.strategy_name,
-                    'consumer_id': self.consumer_id,
-                }
-            }
+            strategy_name=self.strategy_name,
+            consumer_id=self.consumer_id,
         )
 
         consumer = InboxConsumer(
@@ -246,6 +273,204 @@ class InboxConsumerDefaultStrategyTestCase(InboxConsumerTestCaseMixin):
         consumer.consume_all_unprocessed_events(batch_size=10)
         self.assertTrue(all(inbox.status == Inbox.ERROR for inbox in Inbox.objects.all()))
 
+    def test_should_collect_backlog_metrics_by_consumer_slot(self):
+        metrics_backend = InMemoryMetricsBackend()
+        Outbox.objects.create(transaction_id=uuid.uuid4(), event_name="DummyEvent", payload={})
+
+        collect_backlog_metrics(metrics_backend)
+
+        labels = {'context': self.context_name, 'strategy': DEFAULT_ROUTING_STRATEGY_NAME, 'consumer_id': 0}
+        self.assertEqual(metrics_backend.get_value(METRIC_INBOX_BACKLOG, labels), 2)
+        self.assertEqual(metrics_backend.get_value(METRIC_OUTBOX_BACKLOG), 1)
+
+
+class FailingOnNomaEventHandler(EventHandler):
+    def __init__(self, failing_noma: str):
+        super().__init__(consumption_mode=EventConsumptionMode.ASYNCHRONOUS)
+        self.failing_noma = failing_noma
+
+    def handle(self, msg_bus, event) -> None:
+        if event.noma == self.failing_noma:
+            raise Exception("Handler failure")
+
+
+@override_settings(
+    MESSAGE_BUS={
+        'INBOX_MODEL': 'osis_common.models.inbox.Inbox',
+        'OUTBOX_MODEL': 'osis_common.models.outbox.Outbox',
+        'INBOX_MAX_RETRIES': 5,
+    }
+)
+class InboxConsumerTransactionModeTestCase(InboxConsumerTestCaseMixin):
+    def setUp(self):
+        super().setUp()
+        self.mock_get_routing.return_value = InboxConsumerRoutingStrategy(context_name=self.context_name)
+        self.mock_get_handlers.return_value = {
+            self.context_name: {DummyEvent: [FailingOnNomaEventHandler(failing_noma=self.event_A.payload['noma'])]}
+        }
+
+    def _build_consumer(self, transaction_mode: str) -> InboxConsumer:
+        return InboxConsumer(
+            message_bus_instance=mock.Mock(),
+            context_name=self.context_name,
+            consumer_id=self.consumer_id,
+            strategy_name=self.strategy_name,
+            transaction_mode=transaction_mode,
+        )
+
+    def test_batch_mode_should_rollback_whole_batch_when_one_event_fails(self):
+        self._build_consumer(InboxConsumer.BATCH_TRANSACTION).consume_all_unprocessed_events(batch_size=10)
+
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.status, Inbox.ERROR)
+        self.event_B.refresh_from_db()
+        self.assertEqual(self.event_B.status, Inbox.PENDING)
+
+    def test_savepoint_mode_should_keep_successful_events_processed(self):
+        self._build_consumer(InboxConsumer.SAVEPOINT_TRANSACTION).consume_all_unprocessed_events(batch_size=10)
+
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.status, Inbox.ERROR)
+        self.assertEqual(self.event_A.attempts_number, 1)
+        self.event_B.refresh_from_db()
+        self.assertEqual(self.event_B.status, Inbox.PROCESSED)
+
+    def test_event_mode_should_keep_successful_events_processed(self):
+        self._build_consumer(InboxConsumer.EVENT_TRANSACTION).consume_all_unprocessed_events(batch_size=10)
+
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.status, Inbox.ERROR)
+        self.event_B.refresh_from_db()
+        self.assertEqual(self.event_B.status, Inbox.PROCESSED)
+
+    def test_should_stop_batch_when_max_batch_duration_is_reached(self):
+        consumer = self._build_consumer(InboxConsumer.EVENT_TRANSACTION)
+
+        with patch.object(consumer, '_is_batch_deadline_reached', side_effect=[False, True]):
+            consumer.consume_all_unprocessed_events(batch_size=10)
+
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.status, Inbox.ERROR)
+        self.event_B.refresh_from_db()
+        self.assertEqual(self.event_B.status, Inbox.PENDING)
+
+    def test_should_not_retry_event_in_error_before_its_backoff_delay(self):
+        consumer = self._build_consumer(InboxConsumer.SAVEPOINT_TRANSACTION)
+        consumer.consume_all_unprocessed_events(batch_size=10)
+
+        self.event_A.refresh_from_db()
+        self.assertGreater(self.event_A.next_attempt_at, datetime.datetime.now())
+        self.assertNotIn(self.event_A.pk, consumer.get_unprocessed_events_ids(batch_size=10))
+
+        Inbox.objects.filter(pk=self.event_A.pk).update(
+            next_attempt_at=datetime.datetime.now() - datetime.timedelta(seconds=1)
+        )
+        self.assertIn(self.event_A.pk, consumer.get_unprocessed_events_ids(batch_size=10))
+
+    def test_should_count_processed_and_errored_events_on_commit(self):
+        metrics_backend = InMemoryMetricsBackend()
+        consumer = self._build_consumer(InboxConsumer.SAVEPOINT_TRANSACTION)
+        consumer.metrics = metrics_backend
+
+        with self.captureOnCommitCallbacks(execute=True):
+            consumer.consume_all_unprocessed_events(batch_size=10)
+
+        labels = {'context': self.context_name, 'event_name': 'DummyEvent'}
+        self.assertEqual(metrics_backend.get_value(METRIC_EVENTS_PROCESSED, labels), 1)
+        self.assertEqual(metrics_backend.get_value(METRIC_EVENTS_ERRORED, labels), 1)
+
+    def test_should_raise_error_if_transaction_mode_is_unknown(self):
+        with self.assertRaises(ValueError):
+            self._build_consumer('unknown')
+
+
+@override_settings(
+    MESSAGE_BUS={
+        'INBOX_MODEL': 'osis_common.models.inbox.Inbox',
+        'OUTBOX_MODEL': 'osis_common.models.outbox.Outbox',
+        'INBOX_MAX_RETRIES': 5,
+    }
+)
+class InboxConsumerParallelTestCase(TransactionTestCase):
+    """Pool threads use their own database connections: data must be committed to be visible."""
+
+    def setUp(self):
+        self.context_name = 'deliberation'
+        routing_strategy = InboxConsumerRoutingStrategy(context_name=self.context_name)
+        routing_strategy.register_strategy(
+            strategy_name='noma',
+            events_cls=[DummyEvent],
+            routing_fn=lambda event: event.noma[:2],
+            total_consumers=1,
+        )
+        patcher_routing = patch(
+            'osis_common.utils.inbox_outbox.InboxConsumerRoutingStrategyFactory.get',
+            return_value=routing_strategy,
+        )
+        patcher_routing.start()
+        self.addCleanup(patcher_routing.stop)
+        patcher_handlers = patch(
+            'osis_common.utils.inbox_outbox.HandlersPerContextFactory.get',
+            return_value={self.context_name: {DummyEvent: [FailingOnNomaEventHandler(failing_noma='54000001')]}},
+        )
+        patcher_handlers.start()
+        self.addCleanup(patcher_handlers.stop)
+
+        self.failing_event = self._create_event(noma='54000001')
+        self.event_with_same_routing_key = self._create_event(noma='54000002')
+        self.event_with_other_routing_key = self._create_event(noma='15000001')
+
+    def _create_event(self, noma: str) -> Inbox:
+        return Inbox.objects.create(
+            transaction_id=uuid.uuid4(),
+            consumer=self.context_name,
+            event_name="DummyEvent",
+            payload={"entity_id": None, "noma": noma},
+            status=Inbox.PENDING,
+            strategy_name='noma',
+            consumer_id=0,
+        )
+
+    def test_should_not_process_events_after_a_failure_with_same_routing_key(self):
+        consumer = InboxConsumer(
+            message_bus_instance=mock.Mock(),
+            context_name=self.context_name,
+            consumer_id=0,
+            strategy_name='noma',
+            max_workers=2,
+        )
+        try:
+            consumer.consume_all_unprocessed_events(batch_size=10)
+        finally:
+            consumer.close()
+
+        self.failing_event.refresh_from_db()
+        self.assertEqual(self.failing_event.status, Inbox.ERROR)
+        self.event_with_same_routing_key.refresh_from_db()
+        self.assertEqual(self.event_with_same_routing_key.status, Inbox.PENDING)
+        self.event_with_other_routing_key.refresh_from_db()
+        self.assertEqual(self.event_with_other_routing_key.status, Inbox.PROCESSED)
+
+    def test_should_not_overtake_failed_event_waiting_for_its_retry_delay(self):
+        consumer = InboxConsumer(
+            message_bus_instance=mock.Mock(),
+            context_name=self.context_name,
+            consumer_id=0,
+            strategy_name='noma',
+            max_workers=2,
+        )
+        try:
+            consumer.consume_all_unprocessed_events(batch_size=10)
+            self.failing_event.refresh_from_db()
+            self.assertGreater(self.failing_event.next_attempt_at, datetime.datetime.now())
+
+            consumer.consume_all_unprocessed_events(batch_size=10)
+        finally:
+            consumer.close()
+
+        self.event_with_same_routing_key.refresh_from_db()
+        self.assertEqual(self.event_with_same_routing_key.status, Inbox.PENDING)
+
 
 class InboxConsumerCustomStrategyTestCase(InboxConsumerTestCaseMixin):
     def setUp(self):
@@ -262,15 +487,11 @@ class InboxConsumerCustomStrategyTestCase(InboxConsumerTestCaseMixin):
             routing_fn=lambda event: event.noma,
             total_consumers=2
         )
-        self.event_A.meta['inbox_worker'] = {
-            'strategy_name': 'noma',
-            'consumer_id': 1,
-        }
+        self.event_A.strategy_name = 'noma'
+        self.event_A.consumer_id = 1
         self.event_A.save()
-        self.event_B.meta['inbox_worker'] = {
-            'strategy_name': 'noma',
-            'consumer_id': 0,
-        }
+        self.event_B.strategy_name = 'noma'
+        self.event_B.consumer_id = 0
         self.event_B.save()
 
         self.mock_get_routing.return_value = self.custom_routing_strategy
@@ -284,12 +505,8 @@ class InboxConsumerCustomStrategyTestCase(InboxConsumerTestCaseMixin):
                 "sigle_formation": "DROI1BA"
             },
             status=Inbox.PENDING,
-            meta={
-                'inbox_worker': {
-                    'strategy_name': DEFAULT_ROUTING_STRATEGY_NAME,
-                    'consumer_id': 0,
-                }
-            }
+            strategy_name=DEFAULT_ROUTING_STRATEGY_NAME,
+            consumer_id=0,
         )
         self.event_D = Inbox.objects.create(
             transaction_id=uuid.uuid4(),
@@ -300,12 +517,8 @@ class InboxConsumerCustomStrategyTestCase(InboxConsumerTestCaseMixin):
                 "sigle_formation": "BIR1BA"
             },
             status=Inbox.PENDING,
-            meta={
-                'inbox_worker': {
-                    'strategy_name': DEFAULT_ROUTING_STRATEGY_NAME,
-                    'consumer_id': 0,
-                }
-            }
+            strategy_name=DEFAULT_ROUTING_STRATEGY_NAME,
+            consumer_id=0,
         )
 
     def test_default_strategy_must_not_consume_events_outside_his_strategy(self):
@@ -385,6 +598,18 @@ class InboxConsumerCustomStrategyTestCase(InboxConsumerTestCaseMixin):
         self.event_D.refresh_from_db()
         self.assertEqual(self.event_D.status, Inbox.PENDING, msg="Managed by default strategy - no consumption")
 
+    def test_supervisor_should_run_one_worker_by_consumer_slot(self):
+        supervisor = InboxWorkersSupervisor(message_bus_instance=mock.Mock(), context_names=[self.context_name])
+
+        self.assertCountEqual(
+            supervisor.get_slots(),
+            [
+                (self.context_name, DEFAULT_ROUTING_STRATEGY_NAME, 0),
+                (self.context_name, 'noma', 0),
+                (self.context_name, 'noma', 1),
+            ]
+        )
+
     def test_consumer_all_unprocessed_events_raise_error_if_consumer_id_is_greater_than_total_consumer(self):
         with self.assertRaises(ValueError):
             InboxConsumer(
@@ -393,3 +618,653 @@ class InboxConsumerCustomStrategyTestCase(InboxConsumerTestCaseMixin):
                 consumer_id=10,
                 strategy_name='noma',
             )
+
+
+@override_settings(
+    MESSAGE_BUS={
+        'INBOX_MODEL': 'osis_common.models.inbox.Inbox',
+        'OUTBOX_MODEL': 'osis_common.models.outbox.Outbox',
+        'ROOT_TOPIC_EXCHANGE_NAME': 'osis',
+    }
+)
+class EventQueueProducerTestCase(TestCase):
+    def setUp(self):
+        patcher_connection = patch('osis_common.utils.inbox_outbox.queue_sender.get_connection')
+        self.mock_get_connection = patcher_connection.start()
+        self.addCleanup(patcher_connection.stop)
+        self.mock_channel = self.mock_get_connection.return_value.channel.return_value
+
+        self.events = [
+            Outbox.objects.create(transaction_id=uuid.uuid4(), event_name="DummyEvent", payload={"noma": str(i)})
+            for i in range(3)
+        ]
+
+    def test_should_publish_pending_events_by_window(self):
+        producer = EventQueueProducer(publish_window_size=2)
+
+        sent_events_count = producer.send_pending_events_to_queue()
+
+        self.assertEqual(sent_events_count, 3)
+        self.assertEqual(self.mock_channel.basic_publish.call_count, 3)
+        self.assertEqual(self.mock_channel.tx_commit.call_count, 2)
+        self.assertFalse(Outbox.objects.filter(sent=False).exists())
+        self.assertFalse(Outbox.objects.filter(sent_date__isnull=True).exists())
+
+    def test_should_not_mark_window_as_sent_when_broker_commit_fails(self):
+        self.mock_channel.tx_commit.side_effect = Exception()
+        producer = EventQueueProducer(publish_window_size=2)
+
+        with self.assertRaises(Exception):
+            producer.send_pending_events_to_queue()
+
+        self.assertEqual(Outbox.objects.filter(sent=False).count(), 3)
+
+    def test_should_keep_windows_confirmed_by_broker_as_sent_when_next_window_fails(self):
+        self.mock_channel.tx_commit.side_effect = [None, Exception()]
+        producer = EventQueueProducer(publish_window_size=2)
+
+        with self.assertRaises(Exception):
+            producer.send_pending_events_to_queue()
+
+        self.assertQuerySetEqual(Outbox.objects.filter(sent=False), [self.events[2]])
+
+    def test_should_drain_pending_events_by_window_in_separate_transactions(self):
+        producer = EventQueueProducer(publish_window_size=2)
+
+        with patch('osis_common.utils.inbox_outbox.transaction.atomic', wraps=transaction.atomic) as mock_atomic:
+            sent_events_count = producer.send_pending_events_to_queue()
+
+        self.assertEqual(sent_events_count, 3)
+        self.assertEqual(mock_atomic.call_count, 2)
+        self.assertEqual(self.mock_channel.tx_commit.call_count, 2)
+        self.assertFalse(Outbox.objects.filter(sent=False).exists())
+
+    def test_should_stop_draining_between_two_windows(self):
+        producer = EventQueueProducer(publish_window_size=2)
+        self.mock_channel.tx_commit.side_effect = lambda: producer.stop()
+
+        sent_events_count = producer.send_pending_events_to_queue()
+
+        self.assertEqual(sent_events_count, 2)
+        self.assertQuerySetEqual(Outbox.objects.filter(sent=False), [self.events[2]])
+
+    def test_daemon_should_keep_running_when_database_is_unavailable(self):
+        producer = EventQueueProducer(publish_window_size=2)
+
+        with patch.object(producer, 'send_pending_events_to_queue') as mock_send, \
+                patch.object(producer, '_wait') as mock_wait:
+            mock_send.side_effect = [OperationalError("server closed the connection unexpectedly"), 0]
+            mock_wait.side_effect = lambda duration: mock_send.call_count == 2 and producer.stop()
+            producer.run_forever(poll_interval=1)
+
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual([call.args for call in mock_wait.call_args_list], [(2,), (1,)])
+
+
+@override_settings(
+    MESSAGE_BUS={'INBOX_MODEL': 'osis_common.models.inbox.Inbox', 'OUTBOX_MODEL': 'osis_common.models.outbox.Outbox'}
+)
+class InboxOutboxArchiverTestCase(TestCase):
+    def setUp(self):
+        old_date = datetime.datetime.now() - datetime.timedelta(days=40)
+        self.old_processed_inbox = Inbox.objects.create(
+            transaction_id=uuid.uuid4(), consumer='deliberation', event_name="DummyEvent", status=Inbox.PROCESSED,
+        )
+        self.old_dead_letter_inbox = Inbox.objects.create(
+            transaction_id=uuid.uuid4(), consumer='deliberation', event_name="DummyEvent", status=Inbox.DEAD_LETTER,
+        )
+        self.recent_processed_inbox = Inbox.objects.create(
+            transaction_id=uuid.uuid4(), consumer='deliberation', event_name="DummyEvent", status=Inbox.PROCESSED,
+        )
+        self.old_sent_outbox = Outbox.objects.create(transaction_id=uuid.uuid4(), event_name="DummyEvent", sent=True)
+        self.old_pending_outbox = Outbox.objects.create(transaction_id=uuid.uuid4(), event_name="DummyEvent")
+        Inbox.objects.exclude(pk=self.recent_processed_inbox.pk).update(creation_date=old_date)
+        Outbox.objects.update(creation_date=old_date)
+
+    def test_should_archive_only_old_processed_inbox_events(self):
+        report = InboxOutboxArchiver(retention_days=30, batch_size=10).archive_inbox()
+
+        self.assertEqual(report.archived_rows, 1)
+        self.assertEqual(
+            set(Inbox.objects.values_list('pk', flat=True)),
+            {self.old_dead_letter_inbox.pk, self.recent_processed_inbox.pk},
+        )
+        self.assertTrue(InboxArchived.objects.filter(transaction_id=self.old_processed_inbox.transaction_id).exists())
+
+    def test_should_archive_only_old_sent_outbox_events(self):
+        report = InboxOutboxArchiver(retention_days=30, batch_size=10).archive_outbox()
+
+        self.assertEqual(report.archived_rows, 1)
+        self.assertEqual(list(Outbox.objects.values_list('pk', flat=True)), [self.old_pending_outbox.pk])
+        self.assertTrue(OutboxArchived.objects.filter(transaction_id=self.old_sent_outbox.transaction_id).exists())
+
+    def test_should_archive_by_batch(self):
+        Inbox.objects.update(
+            status=Inbox.PROCESSED,
+            creation_date=datetime.datetime.now() - datetime.timedelta(days=40),
+        )
+
+        report = InboxOutboxArchiver(retention_days=30, batch_size=2).archive_inbox()
+
+        self.assertEqual(report.archived_rows, 3)
+        self.assertEqual(report.batches, 2)
+        self.assertFalse(Inbox.objects.exists())
+
+
+@override_settings(
+    MESSAGE_BUS={
+        'INBOX_MODEL': 'osis_common.models.inbox.Inbox',
+        'OUTBOX_MODEL': 'osis_common.models.outbox.Outbox',
+        'ROOT_TOPIC_EXCHANGE_NAME': 'osis',
+    }
+)
+class EventQueueConsumerTestCase(TestCase):
+    def setUp(self):
+        self.context_name = 'deliberation'
+        patcher_connection = patch('osis_common.utils.inbox_outbox.queue_sender.get_connection')
+        self.mock_get_connection = patcher_connection.start()
+        self.addCleanup(patcher_connection.stop)
+        self.mock_channel = self.mock_get_connection.return_value.channel.return_value
+
+        patcher_handlers = patch(
+            'osis_common.utils.inbox_outbox.HandlersPerContextFactory.get',
+            return_value={
+                self.context_name: {
+                    DummyEvent: [EventHandler(consumption_mode=EventConsumptionMode.ASYNCHRONOUS)],
+                    AnotherDummyEvent: [EventHandler(consumption_mode=EventConsumptionMode.SYNCHRONOUS)],
+                }
+            }
+        )
+        patcher_handlers.start()
+        self.addCleanup(patcher_handlers.stop)
+
+        self.routing_strategy = InboxConsumerRoutingStrategy(context_name=self.context_name)
+        patcher_routing = patch(
+            'osis_common.utils.inbox_outbox.InboxConsumerRoutingStrategyFactory.get',
+            return_value=self.routing_strategy,
+        )
+        patcher_routing.start()
+        self.addCleanup(patcher_routing.stop)
+
+    def _build_delivery(self, delivery_tag: int, event_name: str = "DummyEvent", message_id: str = None):
+        return (
+            mock.Mock(routing_key=f"osis.{event_name}", delivery_tag=delivery_tag),
+            mock.Mock(headers={}, message_id=message_id if message_id is not None else str(uuid.uuid4())),
+            b'{"entity_id": null, "noma": "54545454"}',
+        )
+
+    def test_should_store_micro_batch_in_inbox_and_ack_it_at_once(self):
+        consumer = EventQueueConsumer(context_name=self.context_name)
+        deliveries = [
+            self._build_delivery(1),
+            self._build_delivery(2, event_name="AnotherDummyEvent"),
+            self._build_delivery(3),
+        ]
+
+        consumer._process_deliveries(deliveries)
+
+        self.assertEqual(Inbox.objects.filter(consumer=self.context_name, status=Inbox.PENDING).count(), 2)
+        self.mock_channel.basic_ack.assert_called_once_with(delivery_tag=3, multiple=True)
+
+    def test_should_ignore_already_stored_messages(self):
+        consumer = EventQueueConsumer(context_name=self.context_name)
+        delivery = self._build_delivery(1)
+
+        consumer._process_deliveries([delivery])
+        consumer._process_deliveries([self._build_delivery(2, message_id=delivery[1].message_id)])
+
+        self.assertEqual(Inbox.objects.filter(consumer=self.context_name).count(), 1)
+
+    def test_should_reject_message_without_id_and_ack_others(self):
+        consumer = EventQueueConsumer(context_name=self.context_name)
+
+        consumer._process_deliveries([self._build_delivery(1), self._build_delivery(2, message_id='')])
+
+        self.mock_channel.basic_reject.assert_called_once_with(delivery_tag=2, requeue=False)
+        self.mock_channel.basic_ack.assert_called_once_with(delivery_tag=1, multiple=True)
+
+    def test_ingest_should_report_new_and_duplicated_deliveries(self):
+        consumer = EventQueueConsumer(context_name=self.context_name)
+        already_stored = DecodedDelivery(transaction_id=uuid.uuid4(), event_name="DummyEvent", payload={"noma": "1"})
+        consumer.ingest([already_stored])
+        new_delivery = DecodedDelivery(transaction_id=uuid.uuid4(), event_name="DummyEvent", payload={"noma": "2"})
+
+        result = consumer.ingest([already_stored, new_delivery, new_delivery])
+
+        self.assertEqual(result.new, [new_delivery])
+        self.assertEqual(result.duplicates, [new_delivery, already_stored])
+        self.assertEqual(Inbox.objects.filter(consumer=self.context_name).count(), 2)
+
+    def test_should_decode_compressed_messages(self):
+        consumer = EventQueueConsumer(context_name=self.context_name)
+        method, properties, _ = self._build_delivery(1)
+        properties.content_type = EventMessageCodec.JSON_CONTENT_TYPE
+        properties.content_encoding = EventMessageCodec.GZIP_ENCODING
+        body = gzip.compress(json.dumps({"entity_id": None, "noma": "54545454"}).encode())
+
+        consumer._process_deliveries([(method, properties, body)])
+
+        self.assertEqual(Inbox.objects.get(consumer=self.context_name).payload, {"entity_id": None, "noma": "54545454"})
+
+    def test_should_route_from_payload_fields_without_deserializing_event(self):
+        self.routing_strategy.register_strategy(
+            strategy_name='noma',
+            events_cls=[DummyEvent],
+            routing_fields=['noma'],
+            total_consumers=4,
+        )
+        consumer = EventQueueConsumer(context_name=self.context_name)
+
+        with patch.object(DummyEvent, 'deserialize') as mock_deserialize:
+            consumer.ingest([DecodedDelivery(uuid.uuid4(), event_name="DummyEvent", payload={"noma": "54545454"})])
+
+        mock_deserialize.assert_not_called()
+        inbox = Inbox.objects.get(consumer=self.context_name)
+        self.assertEqual(inbox.strategy_name, 'noma')
+        self.assertEqual(
+            inbox.consumer_id,
+            self.routing_strategy.strategies['noma'].get_consumer_id(DummyEvent(noma="54545454")),
+        )
+
+    def test_should_dead_letter_event_which_cannot_be_routed(self):
+        consumer = EventQueueConsumer(context_name=self.context_name)
+
+        with patch.object(consumer, '_determine_inbox_worker', side_effect=ValueError("Invalid routing field")):
+            consumer.ingest([DecodedDelivery(uuid.uuid4(), event_name="DummyEvent", payload={"noma": "54545454"})])
+
+        inbox = Inbox.objects.get(consumer=self.context_name)
+        self.assertEqual(inbox.status, Inbox.DEAD_LETTER)
+        self.assertIsNone(inbox.strategy_name)
+        self.assertIn("Invalid routing field", inbox.meta['dead_letter_reason'])
+
+
+@override_settings(MESSAGE_BUS={'ROOT_TOPIC_EXCHANGE_NAME': 'osis'})
+class EventHandlersRegistryTestCase(TestCase):
+    def setUp(self):
+        self.async_handler = EventHandler(consumption_mode=EventConsumptionMode.ASYNCHRONOUS)
+        self.registry = EventHandlersRegistry({
+            DummyEvent: [
+                self.async_handler,
+                EventHandler(consumption_mode=EventConsumptionMode.SYNCHRONOUS),
+                lambda *args, **kwargs: None,
+            ],
+            AnotherDummyEvent: [EventHandler(consumption_mode=EventConsumptionMode.SYNCHRONOUS)],
+        })
+
+    def test_should_return_event_cls_by_name(self):
+        self.assertEqual(self.registry.get_event_cls("DummyEvent"), DummyEvent)
+
+    def test_should_raise_event_class_not_found_when_event_is_unknown(self):
+        with self.assertRaises(EventClassNotFound):
+            self.registry.get_event_cls("UnexistingEvent")
+
+    def test_should_return_only_async_handlers(self):
+        self.assertEqual(self.registry.get_async_handlers("DummyEvent"), (self.async_handler,))
+        self.assertFalse(self.registry.has_async_handlers("AnotherDummyEvent"))
+        self.assertFalse(self.registry.has_async_handlers("UnexistingEvent"))
+
+    def test_should_return_interested_routing_keys(self):
+        self.assertEqual(
+            self.registry.get_interested_routing_keys(),
+            ["osis.DummyEvent", "osis.AnotherDummyEvent"],
+        )
+
+
+class HandlersPerContextFactoryTestCase(TestCase):
+    def setUp(self):
+        HandlersPerContextFactory.invalidate_cache()
+        self.addCleanup(HandlersPerContextFactory.invalidate_cache)
+
+        self.handlers = {DummyEvent: [EventHandler(consumption_mode=EventConsumptionMode.ASYNCHRONOUS)]}
+        patcher_importlib = patch('osis_common.utils.inbox_outbox.importlib')
+        self.mock_importlib = patcher_importlib.start()
+        self.addCleanup(patcher_importlib.stop)
+        self.mock_importlib.import_module.return_value = mock.Mock(EVENT_HANDLERS=self.handlers)
+
+    @override_settings(MESSAGE_BUS={'CONTEXTS': ['deliberation']})
+    def test_should_import_handlers_of_contexts_declared_in_settings_once(self):
+        self.assertEqual(HandlersPerContextFactory.get(), {'deliberation': self.handlers})
+        self.assertEqual(HandlersPerContextFactory.get(), {'deliberation': self.handlers})
+
+        self.mock_importlib.import_module.assert_called_once_with("infrastructure.deliberation.handlers")
+
+    @override_settings(MESSAGE_BUS={'CONTEXTS': ['deliberation']})
+    def test_should_reload_handlers_after_cache_invalidation(self):
+        HandlersPerContextFactory.get()
+        HandlersPerContextFactory.invalidate_cache()
+        HandlersPerContextFactory.get()
+
+        self.assertEqual(self.mock_importlib.import_module.call_count, 2)
+
+
+LISTEN_NOTIFY_MESSAGE_BUS = {'OUTBOX_MODEL': 'osis_common.models.outbox.Outbox', 'LISTEN_NOTIFY': True}
+
+
+@override_settings(MESSAGE_BUS=LISTEN_NOTIFY_MESSAGE_BUS)
+class DatabaseNotificationListenerTestCase(TransactionTestCase):
+    def setUp(self):
+        self.listener = DatabaseNotificationListener(
+            channels=[OUTBOX_NOTIFICATION_CHANNEL, get_inbox_notification_channel('deliberation')]
+        )
+        self.addCleanup(self.listener.close)
+        self.listener.wait(timeout=0)  # Start listening
+
+    def test_should_be_notified_when_events_are_inserted_in_outbox(self):
+        self.assertTrue(sync_outbox_notify_trigger())
+        self.addCleanup(self._drop_outbox_notify_trigger)
+
+        Outbox.objects.create(transaction_id=uuid.uuid4(), event_name="DummyEvent")
+
+        self.assertEqual(self.listener.wait(timeout=2), {OUTBOX_NOTIFICATION_CHANNEL})
+
+    def test_should_not_be_notified_by_outbox_inserts_when_listen_notify_disabled(self):
+        with override_settings(MESSAGE_BUS={**LISTEN_NOTIFY_MESSAGE_BUS, 'LISTEN_NOTIFY': False}):
+            self.assertFalse(sync_outbox_notify_trigger())
+
+        Outbox.objects.create(transaction_id=uuid.uuid4(), event_name="DummyEvent")
+
+        self.assertEqual(self.listener.wait(timeout=0.5), set())
+
+    def test_should_be_notified_only_for_listened_inbox_context_once_committed(self):
+        notify_inbox_workers_on_commit({'admission'})
+        self.assertEqual(self.listener.wait(timeout=0.5), set())
+
+        with transaction.atomic():
+            notify_inbox_workers_on_commit({'deliberation'})
+            self.assertEqual(self.listener.wait(timeout=0.5), set())
+        self.assertEqual(self.listener.wait(timeout=2), {get_inbox_notification_channel('deliberation')})
+
+    def test_should_not_notify_inbox_workers_when_listen_notify_disabled(self):
+        with override_settings(MESSAGE_BUS={**LISTEN_NOTIFY_MESSAGE_BUS, 'LISTEN_NOTIFY': False}):
+            notify_inbox_workers_on_commit({'deliberation'})
+
+        self.assertEqual(self.listener.wait(timeout=0.5), set())
+
+    @staticmethod
+    def _drop_outbox_notify_trigger():
+        with override_settings(MESSAGE_BUS={**LISTEN_NOTIFY_MESSAGE_BUS, 'LISTEN_NOTIFY': False}):
+            sync_outbox_notify_trigger()
+
+
+class RetryBackoffPolicyTestCase(TestCase):
+    def test_should_double_delay_at_each_attempt_until_max_delay(self):
+        policy = RetryBackoffPolicy(base_delay=10, max_delay=60, jitter=0)
+
+        self.assertEqual(policy.get_delay(attempts_number=1), datetime.timedelta(seconds=10))
+        self.assertEqual(policy.get_delay(attempts_number=2), datetime.timedelta(seconds=20))
+        self.assertEqual(policy.get_delay(attempts_number=3), datetime.timedelta(seconds=40))
+        self.assertEqual(policy.get_delay(attempts_number=4), datetime.timedelta(seconds=60))
+
+    def test_should_apply_jitter_around_delay(self):
+        policy = RetryBackoffPolicy(base_delay=100, max_delay=1000, jitter=0.1)
+
+        for _ in range(20):
+            delay = policy.get_delay(attempts_number=1)
+            self.assertGreaterEqual(delay, datetime.timedelta(seconds=90))
+            self.assertLessEqual(delay, datetime.timedelta(seconds=110))
+
+
+class InboxReplayerTestCase(InboxConsumerTestCaseMixin):
+    def setUp(self):
+        super().setUp()
+        self.mock_get_routing.return_value = InboxConsumerRoutingStrategy(context_name=self.context_name)
+        Inbox.objects.filter(pk=self.event_A.pk).update(
+            status=Inbox.DEAD_LETTER, attempts_number=5, traceback="KeyError: 'noma'",
+        )
+        Inbox.objects.filter(pk=self.event_B.pk).update(
+            status=Inbox.ERROR, attempts_number=2, traceback="ValueError",
+            next_attempt_at=datetime.datetime.now() + datetime.timedelta(hours=1),
+        )
+
+    def test_should_reset_dead_letters_to_pending(self):
+        report = InboxReplayer(batch_size=1).replay(context_name=self.context_name)
+
+        self.assertEqual(report.replayed_rows, 1)
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.status, Inbox.PENDING)
+        self.assertEqual(self.event_A.attempts_number, 0)
+        self.event_B.refresh_from_db()
+        self.assertEqual(self.event_B.status, Inbox.ERROR)
+
+    def test_should_replay_events_in_error_matching_traceback_pattern(self):
+        report = InboxReplayer().replay(include_errors=True, traceback_pattern='^ValueError')
+
+        self.assertEqual(report.replayed_rows, 1)
+        self.event_B.refresh_from_db()
+        self.assertEqual(self.event_B.status, Inbox.PENDING)
+        self.assertIsNone(self.event_B.next_attempt_at)
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.status, Inbox.DEAD_LETTER)
+
+    def test_should_only_count_rows_on_dry_run(self):
+        report = InboxReplayer().replay(include_errors=True, dry_run=True)
+
+        self.assertEqual(report.matched_rows, 2)
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.status, Inbox.DEAD_LETTER)
+
+    def test_should_update_inbox_worker_meta_when_rerouting(self):
+        Inbox.objects.filter(pk=self.event_A.pk).update(
+            strategy_name='noma', consumer_id=3,
+            meta={'OTEL': {'TRACE_ID': 1}, 'inbox_worker': {'strategy_name': 'noma', 'consumer_id': 3}},
+        )
+
+        InboxReplayer().replay(context_name=self.context_name, strategy_name=self.strategy_name, consumer_id=0)
+
+        self.event_A.refresh_from_db()
+        self.assertEqual((self.event_A.strategy_name, self.event_A.consumer_id), (self.strategy_name, 0))
+        self.assertEqual(self.event_A.meta, {
+            'OTEL': {'TRACE_ID': 1},
+            'inbox_worker': {'strategy_name': self.strategy_name, 'consumer_id': 0},
+        })
+
+    def test_should_route_replayed_row_without_routing_so_that_it_is_consumed(self):
+        Inbox.objects.filter(pk=self.event_A.pk).update(strategy_name=None, consumer_id=None, meta={'inbox_worker': {}})
+
+        report = InboxReplayer().replay(context_name=self.context_name)
+
+        self.assertEqual(report.replayed_rows, 1)
+        InboxConsumer(
+            message_bus_instance=mock.Mock(),
+            context_name=self.context_name,
+            consumer_id=self.consumer_id,
+            strategy_name=self.strategy_name,
+        ).consume_all_unprocessed_events(batch_size=10)
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.status, Inbox.PROCESSED)
+        self.assertEqual((self.event_A.strategy_name, self.event_A.consumer_id), (self.strategy_name, 0))
+
+    def test_should_leave_dead_lettered_row_which_still_cannot_be_routed(self):
+        Inbox.objects.filter(pk=self.event_A.pk).update(strategy_name=None, consumer_id=None)
+
+        with patch.object(InboxReplayer, '_compute_slot', side_effect=ValueError("Invalid routing field")):
+            report = InboxReplayer().replay(context_name=self.context_name)
+
+        self.assertEqual((report.replayed_rows, report.unroutable_rows), (0, 1))
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.status, Inbox.DEAD_LETTER)
+
+    def test_should_raise_error_when_rerouting_to_unknown_consumer(self):
+        with self.assertRaises(ValueError):
+            InboxReplayer().replay(context_name=self.context_name, strategy_name=self.strategy_name, consumer_id=3)
+
+
+class ConsistentHashRingTestCase(TestCase):
+    def test_should_only_move_keys_to_new_consumer_when_scaling_up(self):
+        ring = ConsistentHashRing(total_consumers=3)
+        scaled_ring = ConsistentHashRing(total_consumers=4)
+
+        for routing_key in (f"noma:{noma}" for noma in range(1000)):
+            consumer_id = scaled_ring.get_consumer_id(routing_key)
+            self.assertIn(consumer_id, [ring.get_consumer_id(routing_key), 3])
+
+    def test_should_spread_keys_over_all_consumers(self):
+        ring = ConsistentHashRing(total_consumers=4)
+
+        consumer_ids = {ring.get_consumer_id(f"noma:{noma}") for noma in range(1000)}
+
+        self.assertSetEqual(consumer_ids, {0, 1, 2, 3})
+
+
+class InboxRebalancerTestCase(InboxConsumerTestCaseMixin):
+    def setUp(self):
+        super().setUp()
+        self.routing_strategy = InboxConsumerRoutingStrategy(context_name=self.context_name)
+        self.routing_strategy.register_strategy(
+            strategy_name='noma',
+            events_cls=[DummyEvent],
+            routing_fn=lambda event: event.noma,
+            total_consumers=4,
+            hashing=CONSISTENT_HASHING,
+        )
+        self.mock_get_routing.return_value = self.routing_strategy
+        # Rows assigned with the previous topology
+        Inbox.objects.filter(pk__in=[self.event_A.pk, self.event_B.pk]).update(strategy_name='noma', consumer_id=7)
+
+    def test_should_reassign_pending_rows_to_current_topology(self):
+        report = InboxRebalancer(context_name=self.context_name, batch_size=1).rebalance()
+
+        self.assertEqual(report.reassigned_rows, 2)
+        self.assertEqual(report.batches, 2)
+        strategy = self.routing_strategy.strategies['noma']
+        for event in [self.event_A, self.event_B]:
+            event.refresh_from_db()
+            expected_consumer_id = strategy.get_consumer_id(DummyEvent(noma=event.payload['noma']))
+            self.assertEqual(event.consumer_id, expected_consumer_id)
+            self.assertEqual(event.meta['inbox_worker'], {'strategy_name': 'noma', 'consumer_id': expected_consumer_id})
+
+    def test_should_not_update_rows_on_dry_run(self):
+        report = InboxRebalancer(context_name=self.context_name).rebalance(dry_run=True)
+
+        self.assertEqual(report.reassigned_rows, 2)
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.consumer_id, 7)
+
+    def test_should_not_reassign_processed_rows(self):
+        Inbox.objects.filter(pk=self.event_A.pk).update(status=Inbox.PROCESSED)
+
+        InboxRebalancer(context_name=self.context_name).rebalance()
+
+        self.event_A.refresh_from_db()
+        self.assertEqual(self.event_A.consumer_id, 7)
+
+
+class InboxConsumerRoutingStrategyTestCase(TestCase):
+    def setUp(self):
+        self.routing_strategy = InboxConsumerRoutingStrategy(context_name='deliberation')
+        self.routing_strategy.register_strategy(
+            strategy_name='noma',
+            events_cls=[DummyEvent],
+            routing_fields=['noma'],
+            total_consumers=2,
+        )
+
+    def test_should_resolve_strategy_by_event_name(self):
+        self.assertEqual(self.routing_strategy.resolve_strategy_for_event_name('DummyEvent').name, 'noma')
+        self.assertEqual(
+            self.routing_strategy.resolve_strategy_for_event(AnotherDummyEvent(sigle_formation='DROI1BA')).name,
+            DEFAULT_ROUTING_STRATEGY_NAME,
+        )
+        self.assertEqual(self.routing_strategy.get_all_handled_event_names(), frozenset({'DummyEvent'}))
+
+    def test_should_compute_same_routing_key_from_payload_and_from_event_instance(self):
+        self.routing_strategy.register_strategy(
+            strategy_name='date',
+            events_cls=[DatedDummyEvent],
+            routing_fields=['entity_id', 'date_debut'],
+            total_consumers=4,
+        )
+        event = DatedDummyEvent(entity_id=DummyIdentity(code='DROI1BA'), date_debut=datetime.date(2026, 9, 14))
+        strategy = self.routing_strategy.strategies['date']
+        deserialize_event = mock.Mock()
+
+        routing_key = self.routing_strategy.get_routing_key_from_payload(
+            'DatedDummyEvent', event.serialize(), deserialize_event=deserialize_event,
+        )
+
+        deserialize_event.assert_not_called()
+        self.assertEqual(routing_key, strategy.get_routing_key(event))
+        self.assertEqual(strategy.get_consumer_id_by_routing_key(routing_key), strategy.get_consumer_id(event))
+
+    def test_should_raise_error_when_event_is_already_registered_in_another_strategy(self):
+        with self.assertRaises(ValueError):
+            self.routing_strategy.register_strategy(
+                strategy_name='other',
+                events_cls=[DummyEvent],
+                routing_fields=['noma'],
+            )
+
+
+@override_settings(MESSAGE_BUS={})
+class SpanPayloadPolicyTestCase(TestCase):
+    def setUp(self):
+        self.span = mock.Mock()
+        self.span.is_recording.return_value = True
+        self.payload = {"noma": "54545454", "sigle_formation": "DROI1BA"}
+
+    def test_should_not_serialize_payload_when_span_is_not_recording(self):
+        self.span.is_recording.return_value = False
+
+        with patch('osis_common.utils.inbox_outbox.json.dumps') as mock_dumps:
+            SpanPayloadPolicy(mode=SpanPayloadPolicy.TRUNCATE).set_payload_attributes(self.span, self.payload)
+
+        mock_dumps.assert_not_called()
+        self.span.set_attribute.assert_not_called()
+
+    def test_should_truncate_payload(self):
+        SpanPayloadPolicy(mode=SpanPayloadPolicy.TRUNCATE, max_bytes=10).set_payload_attributes(self.span, self.payload)
+
+        self.span.set_attribute.assert_any_call("event.value", '{"noma": "')
+        self.span.set_attribute.assert_any_call("event.value_truncated", True)
+
+    def test_should_only_attach_hash(self):
+        SpanPayloadPolicy(mode=SpanPayloadPolicy.HASH).set_payload_attributes(self.span, self.payload)
+
+        self.span.set_attribute.assert_called_once_with("event.value_hash", mock.ANY)
+
+    def test_should_only_attach_selected_keys(self):
+        SpanPayloadPolicy(mode=SpanPayloadPolicy.KEYS, keys=['noma']).set_payload_attributes(self.span, self.payload)
+
+        self.span.set_attribute.assert_called_once_with("event.value", '{"noma": "54545454"}')
+
+
+@override_settings(MESSAGE_BUS={})
+class EventMessageCodecTestCase(TestCase):
+    def setUp(self):
+        self.payload = {"entity_id": None, "noma": "54545454" * 100}
+
+    def test_should_keep_plain_json_by_default(self):
+        encoded_message = EventMessageCodec().encode(self.payload)
+
+        self.assertEqual(encoded_message.content_type, 'application/json')
+        self.assertEqual(encoded_message.content_encoding, 'utf-8')
+        self.assertEqual(encoded_message.body, json.dumps(self.payload).encode())
+
+    def test_should_only_compress_payloads_above_min_size(self):
+        codec = EventMessageCodec(compression=EventMessageCodec.GZIP_ENCODING, compression_min_size=100)
+
+        large_message = codec.encode(self.payload)
+        small_message = codec.encode({"noma": "1"})
+
+        self.assertEqual(large_message.content_encoding, 'gzip')
+        self.assertLess(len(large_message.body), len(json.dumps(self.payload)))
+        self.assertEqual(small_message.content_encoding, 'utf-8')
+        self.assertEqual(
+            codec.decode(large_message.body, large_message.content_type, large_message.content_encoding),
+            self.payload,
+        )
+
+    def test_should_decode_plain_json_whatever_the_configuration(self):
+        codec = EventMessageCodec(compression=EventMessageCodec.GZIP_ENCODING)
+
+        self.assertEqual(codec.decode(b'{"noma": "1"}', 'application/json', 'utf-8'), {"noma": "1"})
+        self.assertEqual(codec.decode(b'{"noma": "1"}', None, None), {"noma": "1"})
+
+    @unittest.skipUnless(importlib.util.find_spec('msgpack'), "msgpack is not installed")
+    def test_should_encode_with_msgpack(self):
+        codec = EventMessageCodec(content_type=EventMessageCodec.MSGPACK_CONTENT_TYPE)
+
+        encoded_message = codec.encode(self.payload)
+
+        self.assertEqual(encoded_message.content_type, 'application/msgpack')
+        self.assertEqual(codec.decode(encoded_message.body, encoded_message.content_type, None), self.payload)
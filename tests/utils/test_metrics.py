@@ -0,0 +1,68 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+from django.test import SimpleTestCase, override_settings
+
+from osis_common.utils.metrics import InMemoryMetricsBackend, get_metrics_backend
+
+
+class InMemoryMetricsBackendTestCase(SimpleTestCase):
+    def setUp(self):
+        self.metrics_backend = InMemoryMetricsBackend()
+
+    def test_should_render_counters_by_labels(self):
+        self.metrics_backend.increment('events_total', labels={'event_name': 'DummyEvent'})
+        self.metrics_backend.increment('events_total', labels={'event_name': 'DummyEvent'})
+        self.metrics_backend.increment('events_total', labels={'event_name': 'Other"Event'})
+
+        rendered_metrics = self.metrics_backend.render()
+
+        self.assertIn('# TYPE events_total counter', rendered_metrics)
+        self.assertIn('events_total{event_name="DummyEvent"} 2', rendered_metrics)
+        self.assertIn('events_total{event_name="Other\\"Event"} 1', rendered_metrics)
+
+    def test_should_render_cumulative_histogram_buckets(self):
+        for value in [0.5, 2, 20]:
+            self.metrics_backend.observe('duration_seconds', value, buckets=(1, 10))
+
+        rendered_metrics = self.metrics_backend.render()
+
+        self.assertIn('duration_seconds_bucket{le="1"} 1', rendered_metrics)
+        self.assertIn('duration_seconds_bucket{le="10"} 2', rendered_metrics)
+        self.assertIn('duration_seconds_bucket{le="+Inf"} 3', rendered_metrics)
+        self.assertIn('duration_seconds_sum 22.5', rendered_metrics)
+        self.assertIn('duration_seconds_count 3', rendered_metrics)
+
+    def test_should_replace_all_gauge_samples(self):
+        self.metrics_backend.set_gauges('backlog', [({'consumer_id': 0}, 10), ({'consumer_id': 1}, 5)])
+        self.metrics_backend.set_gauges('backlog', [({'consumer_id': 0}, 3)])
+
+        self.assertEqual(self.metrics_backend.get_value('backlog', {'consumer_id': 0}), 3)
+        self.assertIsNone(self.metrics_backend.get_value('backlog', {'consumer_id': 1}))
+
+    @override_settings(MESSAGE_BUS={'METRICS_BACKEND': 'osis_common.utils.metrics.InMemoryMetricsBackend'})
+    def test_should_load_backend_from_settings_once(self):
+        self.assertIsInstance(get_metrics_backend(), InMemoryMetricsBackend)
+        self.assertIs(get_metrics_backend(), get_metrics_backend())
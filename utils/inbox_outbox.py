@@ -23,35 +23,50 @@
 #    see http://www.gnu.org/licenses/.
 #
 ##############################################################################
+import bisect
 import contextlib
 import datetime
 import glob
+import gzip
 import hashlib
 import importlib
 import json
 import logging
 import os
+import random
+import select
+import threading
+import time
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from decimal import Decimal
-from importlib import util
-from typing import List, Dict, Type, Callable, Optional
+from types import MappingProxyType
+from typing import List, Dict, Type, Callable, Optional, Tuple, Set, FrozenSet, Mapping
 
 import cattr
 import pika
+import psycopg2
 import requests
 from django.conf import settings
-from django.db import transaction
-from django.db.models import Model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction, close_old_connections, connection, connections, DEFAULT_DB_ALIAS, \
+    OperationalError, InterfaceError
+from django.core.signals import setting_changed
+from django.db.models import Model, Q, Count, Min, F, Func, Value, JSONField
+from django.dispatch import receiver
 from django.utils.module_loading import import_string
 from opentelemetry import trace, propagate
 from opentelemetry.trace import SpanContext, TraceFlags, NonRecordingSpan, Span
+from pika.exceptions import AMQPError
 
 from osis_common.ddd import interface
 from osis_common.ddd.interface import EventHandler, EventConsumptionMode
 from osis_common.ddd.interface.domain_models import EventHandlers, Event
 from osis_common.models.inbox import InboxAbstractModel
 from osis_common.queue import queue_sender
+from osis_common.utils.metrics import MetricsBackend, get_metrics_backend
 
 logger = logging.getLogger(settings.ASYNC_WORKERS_LOGGER)
 tracer = trace.get_tracer(settings.OTEL_TRACER_MODULE_NAME, settings.OTEL_TRACER_LIBRARY_VERSION)
@@ -69,6 +84,28 @@ cattr.register_structure_hook(
     lambda value, klass: datetime.datetime.strptime(value, settings.EVENT_DATE_FORMAT).date()
 )
 DEFAULT_ROUTING_STRATEGY_NAME = 'default'
+MODULO_HASHING = 'modulo'
+CONSISTENT_HASHING = 'consistent'
+DEFAULT_VIRTUAL_NODES = 100
+# PostgreSQL channels notified when events are stored in the inbox/outbox (opt-in: MESSAGE_BUS['LISTEN_NOTIFY'])
+OUTBOX_NOTIFICATION_CHANNEL = 'osis_outbox'
+INBOX_NOTIFICATION_CHANNEL_PREFIX = 'osis_inbox_'
+OUTBOX_NOTIFY_FUNCTION_NAME = 'osis_common_notify_outbox_insert'
+OUTBOX_NOTIFY_TRIGGER_NAME = 'osis_common_outbox_notify_insert'
+
+METRIC_EVENTS_PUBLISHED = 'osis_message_bus_events_published_total'
+METRIC_EVENTS_INGESTED = 'osis_message_bus_events_ingested_total'
+METRIC_EVENTS_PROCESSED = 'osis_message_bus_events_processed_total'
+METRIC_EVENTS_ERRORED = 'osis_message_bus_events_errored_total'
+METRIC_EVENTS_DEAD_LETTERED = 'osis_message_bus_events_dead_lettered_total'
+METRIC_PUBLISH_CONFIRM_DURATION = 'osis_message_bus_publish_confirm_seconds'
+METRIC_HANDLER_DURATION = 'osis_message_bus_handler_duration_seconds'
+METRIC_BATCH_SIZE = 'osis_message_bus_batch_size'
+METRIC_INBOX_BACKLOG = 'osis_message_bus_inbox_backlog'
+METRIC_INBOX_OLDEST_PENDING_AGE = 'osis_message_bus_inbox_oldest_pending_age_seconds'
+METRIC_OUTBOX_BACKLOG = 'osis_message_bus_outbox_backlog'
+METRIC_OUTBOX_OLDEST_PENDING_AGE = 'osis_message_bus_outbox_oldest_pending_age_seconds'
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
 
 
 def _load_inbox_model() -> Model:
@@ -81,6 +118,81 @@ def _load_outbox_model() -> Model:
     return import_string(inbox_model_path)
 
 
+def _load_inbox_archived_model() -> Model:
+    inbox_archived_model_path = settings.MESSAGE_BUS.get(
+        'INBOX_ARCHIVED_MODEL',
+        'osis_common.models.inbox.InboxArchived',
+    )
+    return import_string(inbox_archived_model_path)
+
+
+def _load_outbox_archived_model() -> Model:
+    outbox_archived_model_path = settings.MESSAGE_BUS.get(
+        'OUTBOX_ARCHIVED_MODEL',
+        'osis_common.models.outbox.OutboxArchived',
+    )
+    return import_string(outbox_archived_model_path)
+
+
+def _is_listen_notify_enabled() -> bool:
+    return settings.MESSAGE_BUS.get('LISTEN_NOTIFY', False)
+
+
+def get_inbox_notification_channel(context_name: str) -> str:
+    return f"{INBOX_NOTIFICATION_CHANNEL_PREFIX}{context_name}"
+
+
+def notify_inbox_workers_on_commit(context_names: Set[str]):
+    """
+    Wake up the inbox workers of the contexts once the current transaction is committed. The NOTIFY is sent in its
+    own statement after the commit in order to keep the notification queue lock out of the storing transaction.
+    """
+    if not _is_listen_notify_enabled():
+        return
+    channels = sorted(get_inbox_notification_channel(context_name) for context_name in context_names)
+    if channels:
+        transaction.on_commit(lambda: _notify_channels(channels))
+
+
+def _notify_channels(channels: List[str]):
+    with connection.cursor() as cursor:
+        for channel in channels:
+            cursor.execute("SELECT pg_notify(%s, '')", [channel])
+
+
+def sync_outbox_notify_trigger(using: str = DEFAULT_DB_ALIAS) -> bool:
+    """
+    Install the insert trigger notifying OUTBOX_NOTIFICATION_CHANNEL on the table of the configured outbox model
+    when MESSAGE_BUS['LISTEN_NOTIFY'] is enabled, drop it otherwise. Returns True when the trigger is installed.
+
+    Opt-in because the NOTIFY is sent by the transaction inserting the events: PostgreSQL takes a database-wide
+    lock at its commit (serializing the commits of all the writers of the outbox) and refuses PREPARE TRANSACTION.
+    """
+    db_connection = connections[using]
+    table_name = db_connection.ops.quote_name(_load_outbox_model()._meta.db_table)
+    with transaction.atomic(using=using), db_connection.cursor() as cursor:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {OUTBOX_NOTIFY_TRIGGER_NAME} ON {table_name}")
+        if not _is_listen_notify_enabled():
+            cursor.execute(f"DROP FUNCTION IF EXISTS {OUTBOX_NOTIFY_FUNCTION_NAME}()")
+            return False
+        cursor.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {OUTBOX_NOTIFY_FUNCTION_NAME}() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('{OUTBOX_NOTIFICATION_CHANNEL}', '');
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        # FOR EACH STATEMENT: one notification by insert statement whatever the number of rows (ex: bulk_create)
+        cursor.execute(
+            f"CREATE TRIGGER {OUTBOX_NOTIFY_TRIGGER_NAME} AFTER INSERT ON {table_name} "
+            f"FOR EACH STATEMENT EXECUTE PROCEDURE {OUTBOX_NOTIFY_FUNCTION_NAME}()"
+        )
+    return True
+
+
 class EventClassNotFound(Exception):
     def __init__(self, event_name: str, **kwargs):
         self.message = f"Cannot process {event_name} events because not found in handlers definition..."
@@ -88,25 +200,93 @@ class EventClassNotFound(Exception):
 
 
 class HandlersPerContextFactory:
+    """
+    Process-wide registry of the event handlers declared by each bounded context (infrastructure/<context>/handlers.py).
+
+    Handlers modules are imported once through the normal import system (sys.modules caching applies) and the result
+    is memoized. The contexts can be listed explicitly in settings.MESSAGE_BUS['CONTEXTS'] to avoid scanning the
+    filesystem at startup.
+    """
+    _handlers_per_context: Optional[Dict[str, EventHandlers]] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> Dict[str, EventHandlers]:
+        if cls._handlers_per_context is None:
+            with cls._lock:
+                if cls._handlers_per_context is None:
+                    cls._handlers_per_context = cls._load_handlers_per_context()
+        return cls._handlers_per_context
+
+    @classmethod
+    def invalidate_cache(cls):
+        with cls._lock:
+            cls._handlers_per_context = None
+
     @staticmethod
-    def get() -> Dict[str, EventHandlers]:
-        consumers_list = {}
-        handlers_path = glob.glob("infrastructure/*/handlers.py", recursive=True)
+    def get_context_names() -> List[str]:
+        context_names = settings.MESSAGE_BUS.get('CONTEXTS')
+        if context_names is not None:
+            return list(context_names)
         # TODO repositionner sur la racine d'Osis
-        for handler_path in handlers_path:
+        return sorted(
+            os.path.dirname(handler_path).split(os.sep)[-1]
+            for handler_path in glob.glob("infrastructure/*/handlers.py")
+        )
+
+    @classmethod
+    def _load_handlers_per_context(cls) -> Dict[str, EventHandlers]:
+        consumers_list = {}
+        for context_name in cls.get_context_names():
             with contextlib.suppress(AttributeError):
-                handler_module = HandlersPerContextFactory.__import_file('handler_module', handler_path)
+                handler_module = importlib.import_module(f"infrastructure.{context_name}.handlers")
                 if handler_module.EVENT_HANDLERS:
-                    bounded_context = os.path.dirname(handler_path).split(os.sep)[-1]
-                    consumers_list[bounded_context] = handler_module.EVENT_HANDLERS
+                    consumers_list[context_name] = handler_module.EVENT_HANDLERS
         return consumers_list
 
-    @staticmethod
-    def __import_file(full_name, path):
-        spec = util.spec_from_file_location(full_name, path)
-        mod = util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
-        return mod
+
+@receiver(setting_changed)
+def _invalidate_handlers_per_context_cache(setting: str, **kwargs):
+    if setting == 'MESSAGE_BUS':
+        HandlersPerContextFactory.invalidate_cache()
+
+
+class EventHandlersRegistry:
+    """
+    Lookup tables built once from the event handlers of a bounded context (event name -> event class,
+    event name -> asynchronous handlers) in order to avoid scanning the handlers for each message.
+    """
+    def __init__(self, event_handlers: EventHandlers):
+        self.event_handlers = event_handlers
+        self._event_cls_by_name: Dict[str, Type[Event]] = {
+            event_cls.__name__: event_cls for event_cls in event_handlers
+        }
+        self._async_handlers_by_name: Dict[str, Tuple[EventHandler, ...]] = {
+            event_cls.__name__: tuple(
+                handler for handler in handlers
+                if isinstance(handler, EventHandler) and handler.consumption_mode == EventConsumptionMode.ASYNCHRONOUS
+            )
+            for event_cls, handlers in event_handlers.items()
+        }
+        self.interested_event_names: Tuple[str, ...] = tuple(self._event_cls_by_name)
+
+    def get_event_cls(self, event_name: str) -> Type[Event]:
+        try:
+            return self._event_cls_by_name[event_name]
+        except KeyError:
+            raise EventClassNotFound(event_name=event_name)
+
+    def get_async_handlers(self, event_name: str) -> Tuple[EventHandler, ...]:
+        return self._async_handlers_by_name.get(event_name, ())
+
+    def has_async_handlers(self, event_name: str) -> bool:
+        return bool(self.get_async_handlers(event_name))
+
+    def get_interested_routing_keys(self) -> List[str]:
+        return [
+            f"{settings.MESSAGE_BUS['ROOT_TOPIC_EXCHANGE_NAME']}.{event_name}"
+            for event_name in self.interested_event_names
+        ]
 
 
 class InboxConsumerRoutingStrategyFactory:
@@ -125,12 +305,185 @@ class InboxConsumerRoutingStrategyFactory:
         return routing_strategy
 
 
+class DatabaseNotificationListener:
+    """
+    Wait for PostgreSQL notifications (LISTEN/NOTIFY) on a dedicated connection kept in autocommit,
+    outside of the Django connection used to process the events.
+    """
+    def __init__(self, channels: List[str]):
+        self.channels = list(channels)
+        self._connection = None
+
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        Block until a notification is received or the timeout expires. Return the notified channels.
+        """
+        try:
+            db_connection = self._get_connection()
+            if not db_connection.notifies and select.select([db_connection], [], [], timeout) == ([], [], []):
+                return set()
+            db_connection.poll()
+            notified_channels = {notify.channel for notify in db_connection.notifies}
+            db_connection.notifies.clear()
+            return notified_channels
+        except (psycopg2.Error, OSError, ValueError):
+            logger.warning("[DatabaseNotificationListener]: Listening connection lost, fallback to polling...")
+            self.close()
+            time.sleep(timeout)
+            return set()
+
+    def close(self):
+        if self._connection is not None and not self._connection.closed:
+            self._connection.close()
+        self._connection = None
+
+    def _get_connection(self):
+        if self._connection is None or self._connection.closed:
+            db_wrapper = connections[DEFAULT_DB_ALIAS]
+            self._connection = db_wrapper.get_new_connection(db_wrapper.get_connection_params())
+            self._connection.autocommit = True
+            with self._connection.cursor() as cursor:
+                for channel in self.channels:
+                    cursor.execute(f"LISTEN {db_wrapper.ops.quote_name(channel)}")
+        return self._connection
+
+
+@dataclass
+class EncodedMessage:
+    body: bytes
+    content_type: str
+    content_encoding: Optional[str]
+    json_body: Optional[str] = None  # Kept when available to avoid serializing the payload again (ex: span)
+
+
+class EventMessageCodec:
+    """
+    Wire format of the events exchanged through the broker, signalled by the AMQP properties:
+    - content_type: 'application/json' (default) or 'application/msgpack' (MESSAGE_BUS['MESSAGE_CONTENT_TYPE'],
+      requires the msgpack package)
+    - content_encoding: 'gzip' or 'zstd' (MESSAGE_BUS['MESSAGE_COMPRESSION'], zstd requires the zstandard package)
+      applied only to bodies larger than MESSAGE_BUS['MESSAGE_COMPRESSION_MIN_SIZE'] bytes, otherwise 'utf-8' for
+      JSON (as before) and no encoding for msgpack.
+    Decoding only relies on the properties of each message: plain JSON messages are always readable.
+    Consumers must be upgraded before enabling msgpack or compression on the producer.
+    """
+    JSON_CONTENT_TYPE = 'application/json'
+    MSGPACK_CONTENT_TYPE = 'application/msgpack'
+    CONTENT_TYPES = [JSON_CONTENT_TYPE, MSGPACK_CONTENT_TYPE]
+    UTF8_ENCODING = 'utf-8'
+    GZIP_ENCODING = 'gzip'
+    ZSTD_ENCODING = 'zstd'
+    COMPRESSIONS = [None, GZIP_ENCODING, ZSTD_ENCODING]
+
+    def __init__(self, content_type: str = None, compression: str = None, compression_min_size: int = None):
+        self.content_type = content_type or settings.MESSAGE_BUS.get('MESSAGE_CONTENT_TYPE', self.JSON_CONTENT_TYPE)
+        if self.content_type not in self.CONTENT_TYPES:
+            raise ValueError(f"Content type '{self.content_type}' is not supported (choices: {self.CONTENT_TYPES}).")
+        self.compression = compression or settings.MESSAGE_BUS.get('MESSAGE_COMPRESSION')
+        if self.compression not in self.COMPRESSIONS:
+            raise ValueError(f"Compression '{self.compression}' is not supported (choices: {self.COMPRESSIONS}).")
+        if compression_min_size is None:
+            compression_min_size = settings.MESSAGE_BUS.get('MESSAGE_COMPRESSION_MIN_SIZE', 1024)
+        self.compression_min_size = compression_min_size
+        # Fail at startup rather than on the first message when an optional package is missing
+        if self.content_type == self.MSGPACK_CONTENT_TYPE:
+            _import_optional_module('msgpack')
+        if self.compression == self.ZSTD_ENCODING:
+            _import_optional_module('zstandard')
+
+    def encode(self, payload: Dict) -> 'EncodedMessage':
+        if self.content_type == self.MSGPACK_CONTENT_TYPE:
+            json_body = None
+            body = _import_optional_module('msgpack').packb(payload, use_bin_type=True)
+            content_encoding = None
+        else:
+            json_body = json.dumps(payload)
+            body = json_body.encode()
+            content_encoding = self.UTF8_ENCODING
+        if self.compression and len(body) >= self.compression_min_size:
+            body = self._compress(body)
+            content_encoding = self.compression
+        return EncodedMessage(
+            body=body, content_type=self.content_type, content_encoding=content_encoding, json_body=json_body,
+        )
+
+    def decode(self, body: bytes, content_type: Optional[str], content_encoding: Optional[str]) -> Dict:
+        if content_encoding == self.GZIP_ENCODING:
+            body = gzip.decompress(body)
+        elif content_encoding == self.ZSTD_ENCODING:
+            body = _import_optional_module('zstandard').ZstdDecompressor().decompress(body)
+        if content_type == self.MSGPACK_CONTENT_TYPE:
+            return _import_optional_module('msgpack').unpackb(body, raw=False)
+        return json.loads(body)
+
+    def _compress(self, body: bytes) -> bytes:
+        if self.compression == self.ZSTD_ENCODING:
+            return _import_optional_module('zstandard').ZstdCompressor().compress(body)
+        return gzip.compress(body)
+
+
+def _import_optional_module(module_name: str):
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            f"The '{module_name}' package is required by the message bus configuration (MESSAGE_BUS)"
+        ) from e
+
+
+class SpanPayloadPolicy:
+    """
+    How an event payload is attached to the OTEL spans (MESSAGE_BUS['SPAN_PAYLOAD_POLICY']):
+    - 'off': not attached
+    - 'truncate': JSON attached up to MESSAGE_BUS['SPAN_PAYLOAD_MAX_BYTES'] bytes (default: 1024)
+    - 'hash': only a digest of the JSON is attached (correlation without shipping the data)
+    - 'keys': only the payload keys listed in MESSAGE_BUS['SPAN_PAYLOAD_KEYS'] are attached
+    Nothing is serialized when the span is not recording (= not sampled).
+    """
+    OFF = 'off'
+    TRUNCATE = 'truncate'
+    HASH = 'hash'
+    KEYS = 'keys'
+    MODES = [OFF, TRUNCATE, HASH, KEYS]
+
+    def __init__(self, mode: str = None, max_bytes: int = None, keys: List[str] = None):
+        self.mode = mode or settings.MESSAGE_BUS.get('SPAN_PAYLOAD_POLICY', self.TRUNCATE)
+        if self.mode not in self.MODES:
+            raise ValueError(f"Span payload policy '{self.mode}' is not supported (choices: {self.MODES}).")
+        self.max_bytes = max_bytes or settings.MESSAGE_BUS.get('SPAN_PAYLOAD_MAX_BYTES', 1024)
+        self.keys = keys if keys is not None else settings.MESSAGE_BUS.get('SPAN_PAYLOAD_KEYS', [])
+
+    def set_payload_attributes(self, span: 'Span', payload: Dict, serialized_payload: str = None):
+        """serialized_payload: JSON of the payload when it is already available (avoid a second serialization)"""
+        if self.mode == self.OFF or not span.is_recording():
+            return
+        if self.mode == self.KEYS:
+            span.set_attribute("event.value", json.dumps({key: payload[key] for key in self.keys if key in payload}))
+            return
+        encoded_payload = (serialized_payload or json.dumps(payload)).encode()
+        if self.mode == self.HASH:
+            span.set_attribute("event.value_hash", hashlib.blake2b(encoded_payload, digest_size=16).hexdigest())
+        else:
+            span.set_attribute("event.value", encoded_payload[:self.max_bytes].decode(errors='ignore'))
+            if len(encoded_payload) > self.max_bytes:
+                span.set_attribute("event.value_truncated", True)
+                span.set_attribute("event.value_size", len(encoded_payload))
+
+
 class EventQueueProducer:
     """
     Class which is in charge to read on outbox model and send it to the rabbitMQ queue
     """
-    def __init__(self):
+    def __init__(self, publish_window_size: int = None):
         self.outbox_model = _load_outbox_model()
+        self.publish_window_size = publish_window_size or settings.MESSAGE_BUS.get('OUTBOX_PUBLISH_WINDOW_SIZE', 100)
+        self._stop_event = threading.Event()
+        self.metrics = get_metrics_backend()
+        self.span_payload_policy = SpanPayloadPolicy()
+        self.message_codec = EventMessageCodec()
+        self.notification_listener = None
+        if _is_listen_notify_enabled():
+            self.notification_listener = DatabaseNotificationListener(channels=[OUTBOX_NOTIFICATION_CHANNEL])
         self.establish_connection()
 
     def establish_connection(self):
@@ -143,28 +496,122 @@ class EventQueueProducer:
             durable=True,
             auto_delete=False
         )
-        channel.confirm_delivery()
+        # A blocking channel in confirm mode waits for the broker ack after each publish.
+        # Transactional mode allows to publish a whole window and wait only once (on tx_commit).
+        channel.tx_select()
         self.channel = channel
 
-    def send_pending_events_to_queue(self):
-        with transaction.atomic():
-            unprocessed_events = self.outbox_model.objects.select_for_update().filter(
-                sent=False
-            ).order_by('creation_date')
-            if unprocessed_events:
-                logger.info(
-                    f"{self.get_logger_prefix_message()}: Sending {len(unprocessed_events)} unprocessed events..."
+    def send_pending_events_to_queue(self) -> int:
+        """
+        Drain the outbox by publish windows. Each window is locked (SKIP LOCKED), published and marked as sent in its
+        own short transaction, committed right after the broker commit of the window: several outbox workers can run
+        in parallel without blocking each other and a failure never re-sends the windows already confirmed by the
+        broker. The drain stops between two windows when stop() is called.
+        """
+        sent_events_count = 0
+        while not self._stop_event.is_set():
+            with transaction.atomic():
+                unprocessed_events_window = list(
+                    self.outbox_model.objects.select_for_update(
+                        skip_locked=True  # Prevent blocking between outbox workers
+                    ).filter(
+                        sent=False
+                    ).order_by('creation_date')[:self.publish_window_size]
+                )
+                if unprocessed_events_window:
+                    self._publish_window(unprocessed_events_window)
+            sent_events_count += len(unprocessed_events_window)
+            if len(unprocessed_events_window) < self.publish_window_size:
+                break
+        if sent_events_count:
+            logger.info(f"{self.get_logger_prefix_message()}: {sent_events_count} unprocessed events sent")
+        return sent_events_count
+
+    def run_forever(self, poll_interval: float = None):
+        """
+        Keep the connection open and send pending events as soon as they are found in the outbox.
+        The loop ends when stop() is called (ex: on SIGTERM).
+        """
+        if poll_interval is None:
+            poll_interval = settings.MESSAGE_BUS.get('OUTBOX_POLL_INTERVAL', 1)
+        max_backoff = settings.MESSAGE_BUS.get('OUTBOX_DATABASE_MAX_BACKOFF', 60)
+
+        logger.info(f"{self.get_logger_prefix_message()}: Start daemon (poll_interval={poll_interval}s)...")
+        database_failures = 0
+        while not self._stop_event.is_set():
+            close_old_connections()
+            try:
+                sent_events_count = self.send_pending_events_to_queue()
+            except AMQPError:
+                logger.exception(f"{self.get_logger_prefix_message()}: Connection to broker lost, reconnecting...")
+                self._reconnect()
+                sent_events_count = 0
+            except (OperationalError, InterfaceError):
+                # Ex: database restarted or failed over. The daemon must survive it: retry with an exponential backoff
+                database_failures += 1
+                logger.exception(
+                    f"{self.get_logger_prefix_message()}: Database unavailable ({database_failures} time(s) in a row)"
                 )
+                close_old_connections()
+                self._wait(min(poll_interval * 2 ** database_failures, max_backoff))
+                continue
+            database_failures = 0
+            if not sent_events_count:
+                self._wait(poll_interval)
+        logger.info(f"{self.get_logger_prefix_message()}: Daemon stopped")
 
-            for unprocessed_event in unprocessed_events:
-                with self._start_as_current_span_from_unprocessed_event(unprocessed_event) as span:
-                    span.set_attribute("event.class", unprocessed_event.event_name)
-                    span.set_attribute("event.value", json.dumps(unprocessed_event.payload))
-                    self._process_unprocessed_event(unprocessed_event)
+    def stop(self):
+        self._stop_event.set()
 
     def close_connection(self):
-        if self.connection:
+        if self.connection and self.connection.is_open:
             self.connection.close()
+        if self.notification_listener:
+            self.notification_listener.close()
+
+    def _reconnect(self):
+        with contextlib.suppress(AMQPError):
+            self.close_connection()
+        self._wait(settings.MESSAGE_BUS.get('OUTBOX_RECONNECT_DELAY', 5), process_broker_events=False)
+        if not self._stop_event.is_set():
+            with contextlib.suppress(AMQPError):
+                self.establish_connection()
+
+    def _wait(self, duration: float, process_broker_events: bool = True):
+        # Sleep by small slices in order to keep heartbeats alive and to react quickly on stop()
+        deadline = time.monotonic() + duration
+        while not self._stop_event.is_set() and time.monotonic() < deadline:
+            remaining = min(1.0, deadline - time.monotonic())
+            if process_broker_events and self.notification_listener:
+                if self.notification_listener.wait(remaining):
+                    return
+                if self.connection.is_open:
+                    self.connection.process_data_events(time_limit=0)
+            elif process_broker_events and self.connection.is_open:
+                self.connection.sleep(remaining)
+            else:
+                self._stop_event.wait(remaining)
+
+    def _publish_window(self, unprocessed_events_window: List['Outbox']):
+        self.metrics.observe(
+            METRIC_BATCH_SIZE, len(unprocessed_events_window), {'stage': 'outbox_publish_window'}, BATCH_SIZE_BUCKETS
+        )
+        for unprocessed_event in unprocessed_events_window:
+            with self._start_as_current_span_from_unprocessed_event(unprocessed_event) as span:
+                encoded_message = self.message_codec.encode(unprocessed_event.payload)
+                span.set_attribute("event.class", unprocessed_event.event_name)
+                self.span_payload_policy.set_payload_attributes(
+                    span, unprocessed_event.payload, encoded_message.json_body,
+                )
+                self._process_unprocessed_event(unprocessed_event, encoded_message)
+        # Only one round trip to the broker for the whole window
+        with self.metrics.timer(METRIC_PUBLISH_CONFIRM_DURATION):
+            self.channel.tx_commit()
+        for unprocessed_event in unprocessed_events_window:
+            self.metrics.increment(METRIC_EVENTS_PUBLISHED, labels={'event_name': unprocessed_event.event_name})
+        self.outbox_model.objects.filter(
+            pk__in=[unprocessed_event.pk for unprocessed_event in unprocessed_events_window]
+        ).update(sent=True, sent_date=datetime.datetime.now())
 
     def _start_as_current_span_from_unprocessed_event(self, unprocess_event_rowdb):
         otel_data = unprocess_event_rowdb.meta.get('OTEL')
@@ -182,32 +629,45 @@ class EventQueueProducer:
             context=otel_context
         )
 
-    def _process_unprocessed_event(self, unprocess_event_rowdb):
+    def _process_unprocessed_event(self, unprocess_event_rowdb, encoded_message: 'EncodedMessage' = None):
         headers = {}
         propagate.inject(headers)
+        if encoded_message is None:
+            encoded_message = self.message_codec.encode(unprocess_event_rowdb.payload)
 
         self.channel.basic_publish(
             exchange=settings.MESSAGE_BUS['ROOT_TOPIC_EXCHANGE_NAME'],
             routing_key='.'.join(
                 [settings.MESSAGE_BUS['ROOT_TOPIC_EXCHANGE_NAME'], unprocess_event_rowdb.event_name]
             ),
-            body=json.dumps(unprocess_event_rowdb.payload),
+            body=encoded_message.body,
             properties=pika.BasicProperties(
                 headers=headers,
                 message_id=str(unprocess_event_rowdb.transaction_id),
-                content_encoding='utf-8',
-                content_type='application/json',
+                content_encoding=encoded_message.content_encoding,
+                content_type=encoded_message.content_type,
                 delivery_mode=2,
             )
         )
-        unprocess_event_rowdb.sent = True
-        unprocess_event_rowdb.sent_date = datetime.datetime.now()
-        unprocess_event_rowdb.save()
 
     def get_logger_prefix_message(self) -> str:
         return f"[EventQueueProducer]"
 
 
+@dataclass
+class DecodedDelivery:
+    transaction_id: uuid.UUID
+    event_name: str
+    payload: Dict
+    otel_metadata: Dict = field(default_factory=dict)
+
+
+@dataclass
+class InboxIngestionResult:
+    new: List[DecodedDelivery]
+    duplicates: List[DecodedDelivery]
+
+
 class EventQueueConsumer:
     """
     Class which is in charge to read on the rabbitMQ queue and store event to inbox model for a specific
@@ -217,8 +677,12 @@ class EventQueueConsumer:
         super().__init__(*args, **kwargs)
         self.context_name = context_name
         self.event_handlers = HandlersPerContextFactory.get()[self.context_name]
+        self.event_handlers_registry = EventHandlersRegistry(self.event_handlers)
         self.routing_strategy = InboxConsumerRoutingStrategyFactory.get(context_name=self.context_name)
         self.inbox_model = _load_inbox_model()
+        self._stop_event = threading.Event()
+        self.metrics = get_metrics_backend()
+        self.message_codec = EventMessageCodec()
         self.establish_connection()
 
     def establish_connection(self):
@@ -231,11 +695,11 @@ class EventQueueConsumer:
             auto_delete=False,
             durable=True
         )
-        for interested_event in self.get_interested_events():
+        for routing_key in self.event_handlers_registry.get_interested_routing_keys():
             self.channel.queue_bind(
                 queue=self.get_consumer_queue_name(),
                 exchange=settings.MESSAGE_BUS['ROOT_TOPIC_EXCHANGE_NAME'],
-                routing_key=self.get_routing_key(interested_event)
+                routing_key=routing_key
             )
 
     def get_routing_key(self, event_name: str):
@@ -269,7 +733,7 @@ class EventQueueConsumer:
             return
 
         bindings_current = [binding["routing_key"] for binding in response.json()]
-        bindings_to_keep = [self.get_routing_key(interested_event) for interested_event in self.get_interested_events()]
+        bindings_to_keep = set(self.event_handlers_registry.get_interested_routing_keys())
         for routing_key in bindings_current:
             if routing_key not in bindings_to_keep:
                 logger.info(f"{self.get_logger_prefix_message()}: Suppression du binding: {routing_key}")
@@ -283,7 +747,7 @@ class EventQueueConsumer:
         return f"{self.context_name}_consumer"
 
     def get_interested_events(self) -> List[str]:
-        return [event.__name__ for event in self.event_handlers.keys()]
+        return list(self.event_handlers_registry.interested_event_names)
 
     def get_logger_prefix_message(self) -> str:
         return f"[EventQueueConsumer - {self.context_name}]"
@@ -308,78 +772,207 @@ class EventQueueConsumer:
                 break
             current_message_count += 1
 
-    def _process_message(self, ch, method, properties, body) -> bool:
-        headers = properties.headers if properties and properties.headers else {}
-        otel_context = propagate.extract(headers)
+    def consume_queue(self, prefetch_count: int = None, micro_batch_size: int = None, max_batch_wait: float = None):
+        """
+        Streaming mode: the broker pushes the messages (basic_consume) with at most prefetch_count unacked messages.
+        Deliveries are accumulated into micro-batches which are written in the inbox with one bulk insert
+        and acknowledged at once. The loop ends when stop() is called (ex: on SIGTERM).
+        """
+        prefetch_count = prefetch_count or settings.MESSAGE_BUS.get('CONSUMER_PREFETCH_COUNT', 500)
+        micro_batch_size = min(
+            micro_batch_size or settings.MESSAGE_BUS.get('CONSUMER_MICRO_BATCH_SIZE', 100),
+            prefetch_count,
+        )
+        if max_batch_wait is None:
+            max_batch_wait = settings.MESSAGE_BUS.get('CONSUMER_MAX_BATCH_WAIT', 0.5)
 
+        logger.info(
+            f"{self.get_logger_prefix_message()}: Start streaming consumption "
+            f"(prefetch_count={prefetch_count} - micro_batch_size={micro_batch_size})..."
+        )
+        self.channel.basic_qos(prefetch_count=prefetch_count)
+        deliveries = []
+        batch_deadline = None
+        for method, properties, body in self.channel.consume(
+            queue=self.get_consumer_queue_name(),
+            auto_ack=False,
+            inactivity_timeout=max_batch_wait,
+        ):
+            if method is not None:
+                deliveries.append((method, properties, body))
+                batch_deadline = batch_deadline or time.monotonic() + max_batch_wait
+            if deliveries and (
+                method is None or len(deliveries) >= micro_batch_size or time.monotonic() >= batch_deadline
+            ):
+                close_old_connections()
+                self._process_deliveries(deliveries)
+                deliveries, batch_deadline = [], None
+            if self._stop_event.is_set():
+                break
+        if deliveries:
+            self._process_deliveries(deliveries)
+        self.channel.cancel()
+        logger.info(f"{self.get_logger_prefix_message()}: Streaming consumption stopped")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _process_deliveries(self, deliveries: List[Tuple]):
+        self.metrics.observe(
+            METRIC_BATCH_SIZE, len(deliveries), {'stage': 'queue_micro_batch', 'context': self.context_name},
+            BATCH_SIZE_BUCKETS,
+        )
+        decoded_deliveries = []
+        last_delivery_tag_to_ack = None
+        for method, properties, body in deliveries:
+            event_name = method.routing_key.split('.')[-1]
+            with self._start_as_current_span_from_message(event_name, properties) as span:
+                if not properties.message_id:
+                    self._reject_message_without_id(self.channel, method, span)
+                    continue
+                if self._have_at_least_one_event_declared_async(event_name):
+                    decoded_deliveries.append(self._decode_message(span, event_name, properties, body))
+                else:
+                    self._log_discarded_event(event_name)
+                last_delivery_tag_to_ack = method.delivery_tag
+
+        if last_delivery_tag_to_ack is None:
+            return
+        try:
+            ingestion_result = self.ingest(decoded_deliveries)
+        except Exception:
+            logger.exception(f"{self.get_logger_prefix_message()}: Unable to store events, requeue the batch...")
+            self.channel.basic_nack(delivery_tag=last_delivery_tag_to_ack, multiple=True, requeue=True)
+            raise
+        self.channel.basic_ack(delivery_tag=last_delivery_tag_to_ack, multiple=True)
+        logger.info(
+            f"{self.get_logger_prefix_message()}: Batch of {len(deliveries)} messages processed "
+            f"({len(ingestion_result.new)} stored in inbox - {len(ingestion_result.duplicates)} duplicates)"
+        )
+
+    def ingest(self, deliveries: List['DecodedDelivery']) -> 'InboxIngestionResult':
+        """
+        Store decoded deliveries in the inbox with one bulk insert, keyed on the (consumer, transaction_id)
+        unique constraint. Deliveries already stored (= redelivered by the broker) are reported as duplicates.
+        """
+        unique_deliveries: Dict[uuid.UUID, DecodedDelivery] = {}
+        duplicates = []
+        for delivery in deliveries:
+            if delivery.transaction_id in unique_deliveries:
+                duplicates.append(delivery)
+            else:
+                unique_deliveries[delivery.transaction_id] = delivery
+
+        with transaction.atomic():
+            already_stored_transaction_ids = set(
+                self.inbox_model.objects.filter(
+                    consumer=self.context_name,
+                    transaction_id__in=list(unique_deliveries),
+                ).values_list('transaction_id', flat=True)
+            ) if unique_deliveries else set()
+            new_deliveries = []
+            for transaction_id, delivery in unique_deliveries.items():
+                if transaction_id in already_stored_transaction_ids:
+                    duplicates.append(delivery)
+                else:
+                    new_deliveries.append(delivery)
+                    transaction.on_commit(self._build_ingested_metric_callback(delivery.event_name))
+
+            # ignore_conflicts protects against a concurrent consumer storing the same event in the meantime
+            self.inbox_model.objects.bulk_create(
+                [self._build_inbox_event(delivery) for delivery in new_deliveries],
+                ignore_conflicts=True,
+            )
+            if new_deliveries:
+                notify_inbox_workers_on_commit({self.context_name})
+        return InboxIngestionResult(new=new_deliveries, duplicates=duplicates)
+
+    def _build_ingested_metric_callback(self, event_name: str) -> Callable[[], None]:
+        labels = {'context': self.context_name, 'event_name': event_name}
+        return lambda: self.metrics.increment(METRIC_EVENTS_INGESTED, labels=labels)
+
+    def _process_message(self, ch, method, properties, body) -> bool:
         event_name = method.routing_key.split('.')[-1]
-        with tracer.start_as_current_span(
-            f"{self.context_name}.consumers_worker.process.{event_name}",
-            context=otel_context
-        ) as span:
+        with self._start_as_current_span_from_message(event_name, properties) as span:
             logger.info(f"{self.get_logger_prefix_message()}: Process message started...")
             if not properties.message_id:
-                span.set_status(trace.StatusCode.ERROR, "Missing message_id in properties")
-                logger.error(f"{self.get_logger_prefix_message()}: Missing message_id in properties.")
-                ch.basic_reject(delivery_tag=method.delivery_tag, requeue=False)
+                self._reject_message_without_id(ch, method, span)
                 return False
 
             if self._have_at_least_one_event_declared_async(event_name):
-                transaction_id = uuid.UUID(properties.message_id)
-                event_payload = json.loads(body)
-                event_status = InboxAbstractModel.PENDING
-                exception = None
-
-                try:
-                    inbox_worker = self._determine_inbox_worker(
-                        transaction_id=transaction_id,
-                        event_name=event_name,
-                        event_payload=event_payload,
-                    )
-                except (StopIteration, EventClassNotFound):
-                    exception = '\n'.join(traceback.format_exception(EventClassNotFound(event_name)))
-                    event_status = InboxAbstractModel.DEAD_LETTER
-                except Exception as e:
-                    exception = '\n'.join(traceback.format_exception(e))
-                    event_status = InboxAbstractModel.ERROR
-
-                self.inbox_model.objects.get_or_create(
-                    consumer=self.context_name,
-                    transaction_id=uuid.UUID(properties.message_id),
-                    defaults={
-                        "event_name": event_name,
-                        "payload": event_payload,
-                        "status": event_status,
-                        "traceback": exception,
-                        "meta": {
-                            'OTEL': self._get_otel_metadata(span),
-                            'inbox_worker' : inbox_worker
-                        }
-                    }
-                )
+                self.ingest([self._decode_message(span, event_name, properties, body)])
             else:
-                logger.info(
-                    f"{self.get_logger_prefix_message()}: "
-                    f"Discard event {event_name} because no async action in context {self.context_name}..."
-                )
+                self._log_discarded_event(event_name)
 
             ch.basic_ack(delivery_tag=method.delivery_tag)
             logger.info(f"{self.get_logger_prefix_message()}: Process message finished...")
             return True
 
-    def _have_at_least_one_event_declared_async(self, event_name: str) -> bool:
-        event_class = next(
-            (cls for cls in self.event_handlers if cls.__name__ == event_name),
-            None
+    def _start_as_current_span_from_message(self, event_name: str, properties):
+        headers = properties.headers if properties and properties.headers else {}
+        return tracer.start_as_current_span(
+            f"{self.context_name}.consumers_worker.process.{event_name}",
+            context=propagate.extract(headers)
         )
-        if event_class is None:
-            return False
 
-        async_handlers = [
-            handler for handler in self.event_handlers[event_class]
-            if isinstance(handler, EventHandler) and handler.consumption_mode == EventConsumptionMode.ASYNCHRONOUS
-        ]
-        return bool(async_handlers)
+    def _reject_message_without_id(self, ch, method, span: 'Span'):
+        span.set_status(trace.StatusCode.ERROR, "Missing message_id in properties")
+        logger.error(f"{self.get_logger_prefix_message()}: Missing message_id in properties.")
+        ch.basic_reject(delivery_tag=method.delivery_tag, requeue=False)
+
+    def _log_discarded_event(self, event_name: str):
+        logger.info(
+            f"{self.get_logger_prefix_message()}: "
+            f"Discard event {event_name} because no async action in context {self.context_name}..."
+        )
+
+    def _decode_message(self, span: 'Span', event_name: str, properties, body) -> 'DecodedDelivery':
+        return DecodedDelivery(
+            transaction_id=uuid.UUID(properties.message_id),
+            event_name=event_name,
+            payload=self.message_codec.decode(body, properties.content_type, properties.content_encoding),
+            otel_metadata=self._get_otel_metadata(span),
+        )
+
+    def _build_inbox_event(self, delivery: 'DecodedDelivery') -> 'Inbox':
+        event_status = InboxAbstractModel.PENDING
+        exception = None
+        inbox_worker = {}
+        meta = {'OTEL': delivery.otel_metadata}
+
+        try:
+            inbox_worker = self._determine_inbox_worker(
+                transaction_id=delivery.transaction_id,
+                event_name=delivery.event_name,
+                event_payload=delivery.payload,
+            )
+        except (StopIteration, EventClassNotFound):
+            exception = '\n'.join(traceback.format_exception(EventClassNotFound(delivery.event_name)))
+            event_status = InboxAbstractModel.DEAD_LETTER
+        except Exception as e:
+            # Without routing the row matches no worker slot: it could never be retried, so it is dead-lettered
+            # (the slot is computed again when it is replayed, cf. InboxReplayer)
+            exception = '\n'.join(traceback.format_exception(e))
+            event_status = InboxAbstractModel.DEAD_LETTER
+            meta['dead_letter_reason'] = f"Routing failed: {e!r}"
+
+        return self.inbox_model(
+            consumer=self.context_name,
+            transaction_id=delivery.transaction_id,
+            event_name=delivery.event_name,
+            payload=delivery.payload,
+            status=event_status,
+            traceback=exception,
+            strategy_name=inbox_worker.get('strategy_name'),
+            consumer_id=inbox_worker.get('consumer_id'),
+            meta={
+                **meta,
+                'inbox_worker': inbox_worker
+            }
+        )
+
+    def _have_at_least_one_event_declared_async(self, event_name: str) -> bool:
+        return self.event_handlers_registry.has_async_handlers(event_name)
 
     @staticmethod
     def _get_otel_metadata(span: 'Span') -> Dict[str, int]:
@@ -395,14 +988,16 @@ class EventQueueConsumer:
         event_payload: Dict,
     ) -> Dict[str, int]:
         if event_name in self.routing_strategy.get_all_handled_event_names():
-            event_instance = self.__deserialize_event(transaction_id, event_name, event_payload)
-            strategy = self.routing_strategy.resolve_strategy_for_event(event_instance)
+            strategy = self.routing_strategy.resolve_strategy_for_event_name(event_name)
+            # The routing key is computed once, from the raw payload when the strategy declares routing fields
+            routing_key = self.routing_strategy.get_routing_key_from_payload(
+                event_name,
+                event_payload,
+                deserialize_event=lambda: self.__deserialize_event(transaction_id, event_name, event_payload),
+            )
 
             strategy_name = strategy.name
-            consumer_id_selected = next(
-                consumer_id for consumer_id in range(0, strategy.total_consumers)
-                if strategy.should_process(event_instance, consumer_id)
-            )
+            consumer_id_selected = strategy.get_consumer_id_by_routing_key(routing_key)
         else:
             strategy_name = DEFAULT_ROUTING_STRATEGY_NAME
             consumer_id_selected = 0
@@ -413,9 +1008,7 @@ class EventQueueConsumer:
         }
 
     def __deserialize_event(self, transaction_id: uuid.UUID, event_name: str, event_payload: Dict) -> Event:
-        event_cls = next(
-            event_cls for event_cls, fn_list in self.event_handlers.items() if event_cls.__name__ == event_name
-        )
+        event_cls = self.event_handlers_registry.get_event_cls(event_name)
         return event_cls.deserialize(
             {
                 'transaction_id': str(transaction_id),
@@ -424,19 +1017,57 @@ class EventQueueConsumer:
         )
 
 
+class RetryBackoffPolicy:
+    """
+    Exponential backoff with jitter applied between two attempts of an event in error:
+    delay = min(base_delay * 2 ^ (attempts_number - 1), max_delay) +/- jitter (ratio of the delay)
+    """
+    def __init__(self, base_delay: float = None, max_delay: float = None, jitter: float = None):
+        if base_delay is None:
+            base_delay = settings.MESSAGE_BUS.get('INBOX_RETRY_BASE_DELAY', 10)
+        if max_delay is None:
+            max_delay = settings.MESSAGE_BUS.get('INBOX_RETRY_MAX_DELAY', 3600)
+        if jitter is None:
+            jitter = settings.MESSAGE_BUS.get('INBOX_RETRY_JITTER', 0.1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def get_delay(self, attempts_number: int) -> datetime.timedelta:
+        delay = min(self.base_delay * 2 ** max(attempts_number - 1, 0), self.max_delay)
+        delay += delay * self.jitter * random.uniform(-1, 1)
+        return datetime.timedelta(seconds=max(delay, 0))
+
+
 class InboxConsumer:
     """
     Consume events from the Inbox model for a specific bounded context.
 
     This class dynamically loads a routing strategy, filters events according to the strategy and consumer ID,
     and dispatches them to the appropriate asynchronous event handlers.
+
+    Transaction modes:
+    - batch: the whole batch is processed in one transaction, a failing event rollbacks the entire batch ;
+    - savepoint: the batch is locked in one transaction but each event is processed in its own savepoint ;
+    - event: each event is locked and processed in its own transaction.
+
+    With max_workers > 1, events are processed concurrently by a thread pool, in their own transaction,
+    but sequentially for a same routing key (cf. _consume_in_parallel_by_routing_key).
     """
+    BATCH_TRANSACTION = 'batch'
+    SAVEPOINT_TRANSACTION = 'savepoint'
+    EVENT_TRANSACTION = 'event'
+    TRANSACTION_MODES = [BATCH_TRANSACTION, SAVEPOINT_TRANSACTION, EVENT_TRANSACTION]
+
     def __init__(
         self,
         message_bus_instance,
         context_name: str,
         consumer_id: int = 0,
         strategy_name: str = DEFAULT_ROUTING_STRATEGY_NAME,
+        transaction_mode: str = None,
+        max_batch_duration: float = None,
+        max_workers: int = None,
         *args,
         **kwargs,
     ):
@@ -445,12 +1076,30 @@ class InboxConsumer:
         self.context_name = context_name
         self.strategy_name = strategy_name
         self.consumer_id = consumer_id
+        self.transaction_mode = transaction_mode or settings.MESSAGE_BUS.get(
+            'INBOX_TRANSACTION_MODE',
+            self.BATCH_TRANSACTION,
+        )
+        # Max seconds spent in a batch: remaining events are left for the next batch in order to bound lock time
+        self.max_batch_duration = max_batch_duration or settings.MESSAGE_BUS.get('INBOX_MAX_BATCH_DURATION')
+        self.retry_backoff_policy = RetryBackoffPolicy()
+        # More than 1 worker: events are processed in parallel, preserving the order by routing key
+        self.max_workers = max_workers or settings.MESSAGE_BUS.get('INBOX_MAX_WORKERS_BY_CONSUMER', 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.metrics = get_metrics_backend()
+        self.span_payload_policy = SpanPayloadPolicy()
         self.routing_strategy = InboxConsumerRoutingStrategyFactory.get(context_name=self.context_name)
         self.event_handlers = HandlersPerContextFactory.get()[self.context_name]
+        self.event_handlers_registry = EventHandlersRegistry(self.event_handlers)
         self.inbox_model = _load_inbox_model()
         self._validate_configuration()
 
     def _validate_configuration(self):
+        if self.transaction_mode not in self.TRANSACTION_MODES:
+            raise ValueError(
+                f"Transaction mode '{self.transaction_mode}' is not supported (choices: {self.TRANSACTION_MODES})."
+            )
+
         if self.strategy_name not in self.routing_strategy.strategies:
             raise ValueError(
                 f"Strategy '{self.strategy_name}' is not registered for context '{self.context_name}'."
@@ -466,7 +1115,10 @@ class InboxConsumer:
                 f"(total consumers: {strategy.total_consumers} - start at 0)."
             )
 
-    def consume_all_unprocessed_events(self, batch_size: int = None):
+    def consume_all_unprocessed_events(self, batch_size: int = None) -> int:
+        """
+        Consume a batch of unprocessed events and return the number of events found for this consumer
+        """
         if batch_size is None:
             batch_size = settings.MESSAGE_BUS['INBOX_BATCH_EVENTS']
 
@@ -476,47 +1128,225 @@ class InboxConsumer:
             f"events matching strategy and consumer"
         )
         if len(unprocessed_events_ids):
-            failed_event = None
+            self.metrics.observe(
+                METRIC_BATCH_SIZE, len(unprocessed_events_ids), {'stage': 'inbox_batch', 'context': self.context_name},
+                BATCH_SIZE_BUCKETS,
+            )
+            batch_deadline = time.monotonic() + self.max_batch_duration if self.max_batch_duration else None
+            if self.max_workers > 1:
+                self._consume_in_parallel_by_routing_key(unprocessed_events_ids, batch_deadline)
+            elif self.transaction_mode == self.EVENT_TRANSACTION:
+                self._consume_with_transaction_by_event(unprocessed_events_ids, batch_deadline)
+            elif self.transaction_mode == self.SAVEPOINT_TRANSACTION:
+                self._consume_with_savepoint_by_event(unprocessed_events_ids, batch_deadline)
+            else:
+                self._consume_in_single_transaction(unprocessed_events_ids, batch_deadline)
+        return len(unprocessed_events_ids)
+
+    def _consume_in_single_transaction(self, unprocessed_events_ids: List[int], batch_deadline: Optional[float]):
+        failed_event = None
+        try:
+            with transaction.atomic():
+                unprocessed_events_in_batch = self._lock_unprocessed_events(unprocessed_events_ids)
+
+                logger.info(
+                    f"{self.get_logger_prefix_message()}: Process {len(unprocessed_events_in_batch)} events..."
+                )
+                for unprocessed_event in unprocessed_events_in_batch:
+                    if self._is_batch_deadline_reached(batch_deadline):
+                        break
+                    with self._start_as_current_span_from_unprocessed_event(unprocessed_event) as span:
+                        self._set_span_attributes(span, unprocessed_event)
+                        try:
+                            self.consume(unprocessed_event)
+                        except Exception as e:
+                            span.set_status(trace.StatusCode.ERROR, str(e))
+                            logger.exception(
+                                f"{self.get_logger_prefix_message()}: "
+                                f"Exception raised while consuming event (ID: {unprocessed_event.id})"
+                            )
+                            failed_event = unprocessed_event
+                            raise   # Trigger rollback
+        except Exception as e:
+            logger.warning(f"{self.get_logger_prefix_message()}: Transaction rollbacked due to an exception.")
+            if failed_event:
+                self._mark_as_failed(failed_event, e)
+
+    def _consume_with_savepoint_by_event(self, unprocessed_events_ids: List[int], batch_deadline: Optional[float]):
+        with transaction.atomic():
+            unprocessed_events_in_batch = self._lock_unprocessed_events(unprocessed_events_ids)
+            logger.info(f"{self.get_logger_prefix_message()}: Process {len(unprocessed_events_in_batch)} events...")
+            for unprocessed_event in unprocessed_events_in_batch:
+                if self._is_batch_deadline_reached(batch_deadline):
+                    break
+                self._consume_in_isolation(unprocessed_event)
+
+    def _consume_with_transaction_by_event(self, unprocessed_events_ids: List[int], batch_deadline: Optional[float]):
+        logger.info(f"{self.get_logger_prefix_message()}: Process {len(unprocessed_events_ids)} events...")
+        for unprocessed_event_id in unprocessed_events_ids:
+            if self._is_batch_deadline_reached(batch_deadline):
+                break
+            with transaction.atomic():
+                unprocessed_event = self._lock_unprocessed_events([unprocessed_event_id]).first()
+                if unprocessed_event is not None:  # Already locked by another consumer
+                    self._consume_in_isolation(unprocessed_event)
+
+    def _consume_in_parallel_by_routing_key(self, unprocessed_events_ids: List[int], batch_deadline: Optional[float]):
+        """
+        Events sharing the same routing key (cf. RoutingStrategy.get_routing_key) are processed sequentially,
+        in creation order, by the same thread. Events with different routing keys are processed concurrently.
+        Each event is processed in its own transaction; when an event stays in error, the following events
+        with the same routing key are left until it is processed (cf. _get_retry_dates_by_routing_key).
+        """
+        events_ids_by_routing_key: Dict[str, List[int]] = {}
+        unprocessed_events = list(
+            self.inbox_model.objects.filter(pk__in=unprocessed_events_ids).order_by('creation_date')
+        )
+        retry_dates_by_routing_key = self._get_retry_dates_by_routing_key(
+            until=unprocessed_events[-1].creation_date if unprocessed_events else None
+        )
+        for unprocessed_event in unprocessed_events:
+            routing_key = self._get_ordering_key(unprocessed_event)
+            retry_date = retry_dates_by_routing_key.get(routing_key)
+            if retry_date is not None and retry_date < unprocessed_event.creation_date:
+                continue  # An older event of this routing key waits for its retry delay: do not overtake it
+            events_ids_by_routing_key.setdefault(routing_key, []).append(unprocessed_event.pk)
+
+        logger.info(
+            f"{self.get_logger_prefix_message()}: Process {len(unprocessed_events_ids)} events "
+            f"({len(events_ids_by_routing_key)} routing keys - {self.max_workers} threads)..."
+        )
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self._consume_events_in_order, events_ids, batch_deadline)
+            for events_ids in events_ids_by_routing_key.values()
+        ]
+        for future in futures:
+            future.result()
+
+    def _consume_events_in_order(self, unprocessed_events_ids: List[int], batch_deadline: Optional[float]):
+        close_old_connections()
+        for unprocessed_event_id in unprocessed_events_ids:
+            if self._is_batch_deadline_reached(batch_deadline):
+                return
+            with transaction.atomic():
+                unprocessed_event = self._lock_unprocessed_events([unprocessed_event_id]).first()
+                if unprocessed_event is None:  # Locked by another consumer: do not overtake it
+                    return
+                if not self._consume_in_isolation(unprocessed_event):
+                    return
+
+    def _get_retry_dates_by_routing_key(self, until: Optional[datetime.datetime]) -> Dict[str, datetime.datetime]:
+        """
+        Creation date of the oldest event waiting for its retry delay (excluded from the batch, cf. next_attempt_at),
+        by routing key
+        """
+        if until is None:
+            return {}
+        delayed_events = self.inbox_model.objects.filter(
+            consumer=self.context_name,
+            strategy_name=self.strategy_name,
+            consumer_id=self.consumer_id,
+            status__in=[self.inbox_model.PENDING, self.inbox_model.ERROR],
+            next_attempt_at__gt=datetime.datetime.now(),
+            creation_date__lt=until,
+        ).order_by('creation_date').only('pk', 'transaction_id', 'event_name', 'payload', 'creation_date')
+        retry_dates_by_routing_key = {}
+        for delayed_event in delayed_events:
+            retry_dates_by_routing_key.setdefault(self._get_ordering_key(delayed_event), delayed_event.creation_date)
+        return retry_dates_by_routing_key
+
+    def _get_ordering_key(self, unprocessed_event: 'Inbox') -> str:
+        try:
+            return self.routing_strategy.get_routing_key_from_payload(
+                unprocessed_event.event_name,
+                unprocessed_event.payload,
+                deserialize_event=lambda: self._deserialize_event(unprocessed_event),
+            )
+        except Exception:
+            # Not deserializable: processed alone (it will be marked as error / dead letter)
+            return f"inbox:{unprocessed_event.pk}"
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"inbox_worker-{self.context_name}-{self.strategy_name}-{self.consumer_id}",
+            )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _consume_in_isolation(self, unprocessed_event: 'Inbox') -> bool:
+        """
+        Consume the event inside a savepoint: on failure, only the work of this event is rollbacked
+        and the event is marked as error (or dead letter) while the others of the batch stay committed.
+        Return False when the event stays in error (= it will be retried).
+        """
+        with self._start_as_current_span_from_unprocessed_event(unprocessed_event) as span:
+            self._set_span_attributes(span, unprocessed_event)
             try:
                 with transaction.atomic():
-                    unprocessed_events_in_batch = self.inbox_model.objects.select_for_update(
-                        skip_locked=True  # Prevent blocking inter-consumer
-                    ).filter(
-                        pk__in=unprocessed_events_ids
-                    ).order_by('creation_date')
-
-                    logger.info(
-                        f"{self.get_logger_prefix_message()}: Process {len(unprocessed_events_in_batch)} events..."
-                    )
-                    for unprocessed_event in unprocessed_events_in_batch:
-                        with self._start_as_current_span_from_unprocessed_event(unprocessed_event) as span:
-                            span.set_attribute("event.class", unprocessed_event.event_name)
-                            span.set_attribute("event.value", json.dumps(unprocessed_event.payload))
-                            span.set_attribute("inbox_consumer.strategy_name", self.strategy_name)
-                            span.set_attribute("inbox_consumer.consumer_id", self.consumer_id)
-
-                            try:
-                                self.consume(unprocessed_event)
-                            except Exception as e:
-                                span.set_status(trace.StatusCode.ERROR, str(e))
-                                logger.exception(
-                                    f"{self.get_logger_prefix_message()}: "
-                                    f"Exception raised while consuming event (ID: {unprocessed_event.id})"
-                                )
-                                failed_event = unprocessed_event
-                                raise   # Trigger rollback
+                    self.consume(unprocessed_event)
             except Exception as e:
-                logger.warning(f"{self.get_logger_prefix_message()}: Transaction rollbacked due to an exception.")
-                if failed_event:
-                    if failed_event.attempts_number >= settings.MESSAGE_BUS['INBOX_MAX_RETRIES']:
-                        logger.error(
-                            f"{self.get_logger_prefix_message()}: "
-                            f"Mark event as dead letter because max attempts reached "
-                            f"(ID: {failed_event.id} - Name {failed_event.event_name})"
-                        )
-                        failed_event.mark_as_dead_letter('\n'.join(traceback.format_exception(e)))
-                    else:
-                        failed_event.mark_as_error('\n'.join(traceback.format_exception(e)))
+                span.set_status(trace.StatusCode.ERROR, str(e))
+                logger.exception(
+                    f"{self.get_logger_prefix_message()}: "
+                    f"Exception raised while consuming event (ID: {unprocessed_event.id})"
+                )
+                unprocessed_event.refresh_from_db()  # In-memory changes are not rollbacked with the savepoint
+                self._mark_as_failed(unprocessed_event, e)
+        return unprocessed_event.status != self.inbox_model.ERROR
+
+    def _lock_unprocessed_events(self, unprocessed_events_ids: List[int]):
+        return self.inbox_model.objects.select_for_update(
+            skip_locked=True  # Prevent blocking inter-consumer
+        ).filter(
+            pk__in=unprocessed_events_ids,
+            # Rows reassigned to another consumer (cf. InboxRebalancer) since their ids were read are not ours anymore
+            strategy_name=self.strategy_name,
+            consumer_id=self.consumer_id,
+            status__in=[self.inbox_model.PENDING, self.inbox_model.ERROR],
+        ).order_by('creation_date')
+
+    def _is_batch_deadline_reached(self, batch_deadline: Optional[float]) -> bool:
+        if batch_deadline is not None and time.monotonic() >= batch_deadline:
+            logger.info(
+                f"{self.get_logger_prefix_message()}: Max batch duration reached, "
+                f"remaining events are left for the next batch"
+            )
+            return True
+        return False
+
+    def _set_span_attributes(self, span: 'Span', unprocessed_event: 'Inbox'):
+        span.set_attribute("event.class", unprocessed_event.event_name)
+        self.span_payload_policy.set_payload_attributes(span, unprocessed_event.payload)
+        span.set_attribute("inbox_consumer.strategy_name", self.strategy_name)
+        span.set_attribute("inbox_consumer.consumer_id", self.consumer_id)
+
+    def _mark_as_failed(self, failed_event: 'Inbox', exception: Exception):
+        if failed_event.attempts_number >= settings.MESSAGE_BUS['INBOX_MAX_RETRIES']:
+            logger.error(
+                f"{self.get_logger_prefix_message()}: "
+                f"Mark event as dead letter because max attempts reached "
+                f"(ID: {failed_event.id} - Name {failed_event.event_name})"
+            )
+            failed_event.mark_as_dead_letter('\n'.join(traceback.format_exception(exception)))
+            self._record_event_outcome(METRIC_EVENTS_DEAD_LETTERED, failed_event)
+        else:
+            failed_event.mark_as_error(
+                '\n'.join(traceback.format_exception(exception)),
+                retry_delay=self.retry_backoff_policy.get_delay(attempts_number=failed_event.attempts_number + 1),
+            )
+            self._record_event_outcome(METRIC_EVENTS_ERRORED, failed_event)
+
+    def _record_event_outcome(self, metric_name: str, unprocessed_event: 'Inbox'):
+        # Counted on commit: the outcome of an event consumed in a rollbacked batch/savepoint is not real
+        labels = {'context': self.context_name, 'event_name': unprocessed_event.event_name}
+        transaction.on_commit(lambda: self.metrics.increment(metric_name, labels=labels))
 
     def get_unprocessed_events_ids(self, batch_size: int) -> List[int]:
         """
@@ -527,13 +1357,16 @@ class InboxConsumer:
             self.inbox_model.objects.filter(
                 consumer=self.context_name,
                 # Attribution to a specific inbox are realised in EventQueueConsumer (_process_message)
-                meta__inbox_worker__strategy_name=self.strategy_name,
-                meta__inbox_worker__consumer_id=self.consumer_id,
-            ).exclude(
+                strategy_name=self.strategy_name,
+                consumer_id=self.consumer_id,
+                # Match the condition of the partial index (cf. Inbox.Meta.indexes)
                 status__in=[
-                    self.inbox_model.PROCESSED,
-                    self.inbox_model.DEAD_LETTER,
-                ]
+                    self.inbox_model.PENDING,
+                    self.inbox_model.ERROR,
+                ],
+            ).filter(
+                # Events in error are retried only when their backoff delay is elapsed
+                Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=datetime.datetime.now())
             ).order_by('creation_date').values_list('id', flat=True)[:batch_size]
         )
 
@@ -556,13 +1389,16 @@ class InboxConsumer:
     def consume(self, unprocessed_event):
         event_instance = self._build_event_instance(unprocessed_event)
         if event_instance:
-            event_handlers_declared_as_async = [
-                f for f in self.event_handlers[event_instance.__class__]
-                if isinstance(f, EventHandler) and f.consumption_mode == EventConsumptionMode.ASYNCHRONOUS
-            ]
-            for event_handler in event_handlers_declared_as_async:
-                event_handler.handle(self.message_bus_instance, event_instance)
+            for event_handler in self.event_handlers_registry.get_async_handlers(unprocessed_event.event_name):
+                handler_labels = {
+                    'context': self.context_name,
+                    'event_name': unprocessed_event.event_name,
+                    'handler': type(event_handler).__name__,
+                }
+                with self.metrics.timer(METRIC_HANDLER_DURATION, handler_labels):
+                    event_handler.handle(self.message_bus_instance, event_instance)
             unprocessed_event.mark_as_processed(strategy_name=self.strategy_name, consumer_id=self.consumer_id)
+            self._record_event_outcome(METRIC_EVENTS_PROCESSED, unprocessed_event)
         return unprocessed_event
 
     def _build_event_instance(self, unprocessed_event: 'Inbox') -> Optional['Event']:
@@ -573,14 +1409,16 @@ class InboxConsumer:
             # Si l'event n'est plus dans les handlers, pas nécessaire de réessayer
             exception = EventClassNotFound(unprocessed_event.event_name)
             unprocessed_event.mark_as_dead_letter('\n'.join(traceback.format_exception(exception)))
+            self._record_event_outcome(METRIC_EVENTS_DEAD_LETTERED, unprocessed_event)
         except Exception as e:
-            unprocessed_event.mark_as_error('\n'.join(traceback.format_exception(e)))
+            unprocessed_event.mark_as_error(
+                '\n'.join(traceback.format_exception(e)),
+                retry_delay=self.retry_backoff_policy.get_delay(attempts_number=unprocessed_event.attempts_number + 1),
+            )
+            self._record_event_outcome(METRIC_EVENTS_ERRORED, unprocessed_event)
 
     def _deserialize_event(self, unprocessed_event):
-        event_cls = next(
-            event_cls for event_cls, fn_list in self.event_handlers.items()
-            if event_cls.__name__ == unprocessed_event.event_name
-        )
+        event_cls = self.event_handlers_registry.get_event_cls(unprocessed_event.event_name)
         return event_cls.deserialize(
             {
                 'transaction_id': str(unprocessed_event.transaction_id),
@@ -593,16 +1431,260 @@ class InboxConsumer:
                f"Routing Strategy name: {self.strategy_name} - Consumer ID: {str(self.consumer_id)}]"
 
 
+class InboxConsumerSlotWorker(threading.Thread):
+    """
+    Long-lived worker consuming the inbox for one (context, strategy, consumer_id) slot.
+    The wait between two polls grows exponentially while the slot is idle and the consumer is rebuilt after a crash.
+    """
+    def __init__(
+        self,
+        message_bus_instance,
+        context_name: str,
+        strategy_name: str,
+        consumer_id: int,
+        stop_event: threading.Event,
+        batch_size: int = None,
+        min_idle_wait: float = None,
+        max_idle_wait: float = None,
+    ):
+        super().__init__(name=f"inbox_worker-{context_name}-{strategy_name}-{consumer_id}", daemon=True)
+        self.message_bus_instance = message_bus_instance
+        self.context_name = context_name
+        self.strategy_name = strategy_name
+        self.consumer_id = consumer_id
+        self.stop_event = stop_event
+        self.batch_size = batch_size
+        self.min_idle_wait = min_idle_wait or settings.MESSAGE_BUS.get('INBOX_IDLE_MIN_WAIT', 0.5)
+        self.max_idle_wait = max_idle_wait or settings.MESSAGE_BUS.get('INBOX_IDLE_MAX_WAIT', 10)
+        # Set when new events are notified for the context (cf. InboxWorkersSupervisor) or on stop
+        self.wake_up_event = threading.Event()
+
+    def run(self):
+        inbox_consumer = None
+        idle_wait = self.min_idle_wait
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                try:
+                    if inbox_consumer is None:
+                        inbox_consumer = InboxConsumer(
+                            message_bus_instance=self.message_bus_instance,
+                            context_name=self.context_name,
+                            strategy_name=self.strategy_name,
+                            consumer_id=self.consumer_id,
+                        )
+                    found_events_count = inbox_consumer.consume_all_unprocessed_events(batch_size=self.batch_size)
+                except Exception:
+                    logger.exception(f"[{self.name}]: Worker crashed, restarting after {self.max_idle_wait}s...")
+                    if inbox_consumer is not None:
+                        inbox_consumer.close()
+                    inbox_consumer = None
+                    self.stop_event.wait(self.max_idle_wait)
+                    continue
+
+                if found_events_count:
+                    idle_wait = self.min_idle_wait
+                elif self.wake_up_event.wait(idle_wait):
+                    self.wake_up_event.clear()
+                    idle_wait = self.min_idle_wait
+                else:
+                    idle_wait = min(idle_wait * 2, self.max_idle_wait)
+        finally:
+            if inbox_consumer is not None:
+                inbox_consumer.close()
+            connection.close()
+
+
+class InboxWorkersSupervisor:
+    """
+    Run every consumer slot of every registered bounded context (cf. InboxConsumerRoutingStrategy)
+    as long-lived worker threads in a single process.
+    """
+    def __init__(self, message_bus_instance, context_names: List[str] = None, batch_size: int = None):
+        self.message_bus_instance = message_bus_instance
+        self.context_names = context_names or list(HandlersPerContextFactory.get().keys())
+        self.batch_size = batch_size
+        self.stop_event = threading.Event()
+        self.workers: Dict[Tuple[str, str, int], InboxConsumerSlotWorker] = {}
+
+    def get_slots(self) -> List[Tuple[str, str, int]]:
+        slots = []
+        for context_name in self.context_names:
+            routing_strategy = InboxConsumerRoutingStrategyFactory.get(context_name=context_name)
+            for strategy_name, strategy in routing_strategy.strategies.items():
+                slots.extend(
+                    (context_name, strategy_name, consumer_id) for consumer_id in range(strategy.total_consumers)
+                )
+        return slots
+
+    def run(self, health_check_interval: float = 5):
+        for slot in self.get_slots():
+            self._start_worker(slot)
+        logger.info(f"{self.get_logger_prefix_message()}: {len(self.workers)} workers started")
+        if _is_listen_notify_enabled():
+            threading.Thread(name="inbox_worker-listener", target=self._dispatch_notifications, daemon=True).start()
+
+        while not self.stop_event.wait(health_check_interval):
+            for slot, worker in list(self.workers.items()):
+                if not worker.is_alive():
+                    logger.error(f"{self.get_logger_prefix_message()}: Worker {worker.name} died, restarting...")
+                    self._start_worker(slot)
+
+        logger.info(f"{self.get_logger_prefix_message()}: Stopping workers...")
+        for worker in self.workers.values():
+            worker.join()
+        logger.info(f"{self.get_logger_prefix_message()}: All workers stopped")
+
+    def stop(self):
+        self.stop_event.set()
+        for worker in list(self.workers.values()):
+            worker.wake_up_event.set()
+
+    def _dispatch_notifications(self):
+        listener = DatabaseNotificationListener(
+            channels=[get_inbox_notification_channel(context_name) for context_name in self.context_names]
+        )
+        try:
+            while not self.stop_event.is_set():
+                notified_channels = listener.wait(timeout=1)
+                if not notified_channels:
+                    continue
+                for worker in list(self.workers.values()):
+                    if get_inbox_notification_channel(worker.context_name) in notified_channels:
+                        worker.wake_up_event.set()
+        finally:
+            listener.close()
+
+    def _start_worker(self, slot: Tuple[str, str, int]):
+        context_name, strategy_name, consumer_id = slot
+        worker = InboxConsumerSlotWorker(
+            message_bus_instance=self.message_bus_instance,
+            context_name=context_name,
+            strategy_name=strategy_name,
+            consumer_id=consumer_id,
+            stop_event=self.stop_event,
+            batch_size=self.batch_size,
+        )
+        self.workers[slot] = worker
+        worker.start()
+
+    def get_logger_prefix_message(self) -> str:
+        return "[InboxWorkersSupervisor]"
+
+
+def collect_backlog_metrics(metrics_backend: MetricsBackend = None):
+    """
+    Refresh the backlog gauges from the database: pending rows by (context, strategy, consumer_id) for the inbox,
+    pending rows for the outbox, and the age of the oldest pending row. Meant to be called on scrape.
+    """
+    metrics_backend = metrics_backend or get_metrics_backend()
+    now = datetime.datetime.now()
+    inbox_model = _load_inbox_model()
+    inbox_backlogs = inbox_model.objects.filter(
+        status__in=[inbox_model.PENDING, inbox_model.ERROR],
+    ).values('consumer', 'strategy_name', 'consumer_id').annotate(
+        backlog=Count('id'),
+        oldest_creation_date=Min('creation_date'),
+    ).order_by()
+    backlog_samples, oldest_pending_age_samples = [], []
+    for inbox_backlog in inbox_backlogs:
+        labels = {
+            'context': inbox_backlog['consumer'],
+            'strategy': inbox_backlog['strategy_name'],
+            'consumer_id': inbox_backlog['consumer_id'],
+        }
+        backlog_samples.append((labels, inbox_backlog['backlog']))
+        oldest_pending_age_samples.append((labels, (now - inbox_backlog['oldest_creation_date']).total_seconds()))
+    metrics_backend.set_gauges(METRIC_INBOX_BACKLOG, backlog_samples)
+    metrics_backend.set_gauges(METRIC_INBOX_OLDEST_PENDING_AGE, oldest_pending_age_samples)
+
+    outbox_backlog = _load_outbox_model().objects.filter(sent=False).aggregate(
+        backlog=Count('id'),
+        oldest_creation_date=Min('creation_date'),
+    )
+    metrics_backend.set_gauges(METRIC_OUTBOX_BACKLOG, [({}, outbox_backlog['backlog'])])
+    oldest_pending_age = (
+        (now - outbox_backlog['oldest_creation_date']).total_seconds() if outbox_backlog['oldest_creation_date'] else 0
+    )
+    metrics_backend.set_gauges(METRIC_OUTBOX_OLDEST_PENDING_AGE, [({}, oldest_pending_age)])
+
+
+def _hash_routing_key(routing_key: str) -> int:
+    # Non-cryptographic use: a 64 bits blake2b digest is fast and well distributed
+    return int.from_bytes(hashlib.blake2b(routing_key.encode(), digest_size=8).digest(), 'big')
+
+
+def _build_routing_fn_from_fields(routing_fields: Tuple[str, ...]) -> Callable[[Event], str]:
+    # Built from the serialized values, so that the key is the same as the one read in the payload at ingestion
+    return lambda event_instance: _join_routing_values(event_instance.serialize(), routing_fields)
+
+
+def _join_routing_values(event_payload: Dict, routing_fields: Tuple[str, ...]) -> str:
+    # Serialized values are strings (dates, uuids...), numbers, or dicts (EntityIdentity)
+    return ':'.join(
+        json.dumps(event_payload[name], sort_keys=True) if isinstance(event_payload[name], (dict, list))
+        else str(event_payload[name])
+        for name in routing_fields
+    )
+
+
+class ConsistentHashRing:
+    """
+    Each consumer is placed `virtual_nodes` times on a hash ring and a routing key belongs to the first consumer
+    found clockwise from its hash. Changing the number of consumers only moves ~1/total_consumers of the keys
+    (a modulo moves almost all of them).
+    """
+    def __init__(self, total_consumers: int, virtual_nodes: int = DEFAULT_VIRTUAL_NODES):
+        positions = sorted(
+            (_hash_routing_key(f"consumer-{consumer_id}#{virtual_node}"), consumer_id)
+            for consumer_id in range(total_consumers)
+            for virtual_node in range(virtual_nodes)
+        )
+        self._hashes = [position_hash for position_hash, _ in positions]
+        self._consumer_ids = [consumer_id for _, consumer_id in positions]
+
+    def get_consumer_id(self, routing_key: str) -> int:
+        index = bisect.bisect(self._hashes, _hash_routing_key(routing_key)) % len(self._hashes)
+        return self._consumer_ids[index]
+
+
 class RoutingStrategy:
-    def __init__(self, name: str, total_consumers: int = 1):
+    HASHING_MODES = [MODULO_HASHING, CONSISTENT_HASHING]
+
+    def __init__(
+        self,
+        name: str,
+        total_consumers: int = 1,
+        hashing: str = MODULO_HASHING,
+        virtual_nodes: int = DEFAULT_VIRTUAL_NODES,
+    ):
+        if hashing not in self.HASHING_MODES:
+            raise ValueError(f"Hashing '{hashing}' is not supported (choices: {self.HASHING_MODES}).")
         self.name = name
         self.total_consumers = total_consumers
+        self.hashing = hashing
+        self.hash_ring = ConsistentHashRing(total_consumers, virtual_nodes) if hashing == CONSISTENT_HASHING else None
         self.event_routing_functions: Dict[Type[Event], Callable[[Event], str]] = {}
+        # Event name -> payload fields composing the routing key (routing without deserializing the event)
+        self.event_routing_fields: Dict[str, Tuple[str, ...]] = {}
 
-    def register(self, event_cls: Type[Event], routing_fn: Callable[[Event], str]):
+    def register(
+        self,
+        event_cls: Type[Event],
+        routing_fn: Callable[[Event], str] = None,
+        routing_fields: List[str] = None,
+    ):
+        """
+        The routing key is computed either by routing_fn from the event, or from routing_fields: top-level scalar
+        fields of the event which can be read directly in the JSON payload at ingestion time.
+        """
         if event_cls in self.event_routing_functions:
             raise ValueError(f"{event_cls.__name__} already registered in strategy '{self.name}'")
-        self.event_routing_functions[event_cls] = routing_fn
+        if routing_fn is None and not routing_fields:
+            raise ValueError(f"{event_cls.__name__}: routing_fn or routing_fields must be provided")
+        if routing_fields:
+            self.event_routing_fields[event_cls.__name__] = tuple(routing_fields)
+        self.event_routing_functions[event_cls] = routing_fn or _build_routing_fn_from_fields(tuple(routing_fields))
 
     def can_handle(self, event_instance: Event) -> bool:
         return type(event_instance) in self.event_routing_functions
@@ -617,16 +1699,35 @@ class RoutingStrategy:
     def get_handled_event_names(self) -> List[str]:
         return [event_cls.__name__ for event_cls in self.event_routing_functions]
 
+    def get_routing_key_from_payload(self, event_name: str, event_payload: Dict) -> Optional[str]:
+        """Return None when the routing key cannot be computed without deserializing the event"""
+        routing_fields = self.event_routing_fields.get(event_name)
+        if not routing_fields or any(name not in event_payload for name in routing_fields):
+            return None
+        return f"{self.name}:{_join_routing_values(event_payload, routing_fields)}"
+
+    def get_consumer_id(self, event_instance: Event) -> int:
+        return self.get_consumer_id_by_routing_key(self.get_routing_key(event_instance))
+
+    def get_consumer_id_by_routing_key(self, routing_key: str) -> int:
+        if self.hash_ring is not None:
+            return self.hash_ring.get_consumer_id(routing_key)
+        return _hash_routing_key(routing_key) % self.total_consumers
+
     def should_process(self, event_instance: Event, consumer_id: int) -> bool:
-        routing_key = self.get_routing_key(event_instance)
-        return int(hashlib.md5(routing_key.encode()).hexdigest(), 16) % self.total_consumers == consumer_id
+        return self.get_consumer_id(event_instance) == consumer_id
 
 
 class DefaultRoutingStrategy(RoutingStrategy):
     def __init__(self):
         super().__init__(name=DEFAULT_ROUTING_STRATEGY_NAME, total_consumers=1)
 
-    def register(self, event_cls: Type[Event], routing_fn: Callable[[Event], str]):
+    def register(
+        self,
+        event_cls: Type[Event],
+        routing_fn: Callable[[Event], str] = None,
+        routing_fields: List[str] = None,
+    ):
         raise ValueError('Event cannot be register in DefaultRoutingStrategy')
 
     def can_handle(self, event_instance: Event) -> bool:
@@ -635,6 +1736,12 @@ class DefaultRoutingStrategy(RoutingStrategy):
     def get_routing_key(self, event_instance: Event) -> str:
         return DEFAULT_ROUTING_STRATEGY_NAME
 
+    def get_routing_key_from_payload(self, event_name: str, event_payload: Dict) -> Optional[str]:
+        return DEFAULT_ROUTING_STRATEGY_NAME
+
+    def get_consumer_id_by_routing_key(self, routing_key: str) -> int:
+        return 0  # Un seul consommateur autorisé par défaut
+
     def should_process(self, event_instance: Event, consumer_id: int) -> bool:
         return consumer_id == 0  # Un seul consommateur autorisé par défaut
 
@@ -646,34 +1753,46 @@ class InboxConsumerRoutingStrategy:
     """
     Class which is in charge to read the inbox consumer strategy for a specific context.
     This allow to consume multiple event at the same time for a specific context according to the routing key
+
+    Event -> strategy resolution is precomputed at registration time (register_strategy) in immutable mappings,
+    so the lookups done for each ingested event are O(1).
     """
     def __init__(self, context_name: str, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.context_name = context_name
         self.strategies: Dict[str, RoutingStrategy] = {DEFAULT_ROUTING_STRATEGY_NAME: DefaultRoutingStrategy()}
+        self._strategy_by_event_name: Mapping[str, RoutingStrategy] = MappingProxyType({})
+        self._handled_event_names: FrozenSet[str] = frozenset()
 
     def register_strategy(
         self,
         strategy_name: str,
         events_cls: List[Type[Event]],
-        routing_fn: Callable[[Event], str],
-        total_consumers: int = 1
+        routing_fn: Callable[[Event], str] = None,
+        total_consumers: int = 1,
+        hashing: str = MODULO_HASHING,
+        virtual_nodes: int = DEFAULT_VIRTUAL_NODES,
+        routing_fields: List[str] = None,
     ):
         if strategy_name not in self.strategies:
             self.strategies[strategy_name] = RoutingStrategy(
                 name=strategy_name,
                 total_consumers=total_consumers,
+                hashing=hashing,
+                virtual_nodes=virtual_nodes,
             )
 
         strategy = self.strategies[strategy_name]
+        strategy_by_event_name = dict(self._strategy_by_event_name)
         for event_cls in events_cls:
             # Vérifie que l'événement n'est pas déjà enregistré dans une autre stratégie
-            for other_strategy_name, other_strategy in self.strategies.items():
-                if other_strategy_name != strategy_name and event_cls in other_strategy.event_routing_functions:
-                    raise ValueError(
-                        f"{event_cls.__name__} already registered in strategy '{other_strategy_name}'"
-                    )
-            strategy.register(event_cls, routing_fn)
+            other_strategy = strategy_by_event_name.get(event_cls.__name__)
+            if other_strategy is not None and other_strategy.name != strategy_name:
+                raise ValueError(f"{event_cls.__name__} already registered in strategy '{other_strategy.name}'")
+            strategy.register(event_cls, routing_fn=routing_fn, routing_fields=routing_fields)
+            strategy_by_event_name[event_cls.__name__] = strategy
+        self._strategy_by_event_name = MappingProxyType(strategy_by_event_name)
+        self._handled_event_names = frozenset(strategy_by_event_name)
 
     def get_routing_key(
         self,
@@ -686,21 +1805,435 @@ class InboxConsumerRoutingStrategy:
         strategy = self.resolve_strategy_for_event(event_instance)
         return strategy.should_process(event_instance, consumer_id)
 
+    def get_routing_key_from_payload(
+        self,
+        event_name: str,
+        event_payload: Dict,
+        deserialize_event: Callable[[], Event],
+    ) -> str:
+        """
+        Routing key of a stored / received event: read from the payload when the strategy declares routing fields,
+        otherwise computed from the event deserialized by deserialize_event(). Ingestion, rebalancing and ordering
+        of the inbox all use it, so that they always agree on the consumer of an event.
+        """
+        strategy = self.resolve_strategy_for_event_name(event_name)
+        routing_key = strategy.get_routing_key_from_payload(event_name, event_payload)
+        if routing_key is None:
+            routing_key = strategy.get_routing_key(deserialize_event())
+        return routing_key
+
+    def resolve_strategy_for_event_name(self, event_name: str) -> RoutingStrategy:
+        return self._strategy_by_event_name.get(event_name) or self.strategies[DEFAULT_ROUTING_STRATEGY_NAME]
+
     def resolve_strategy_for_event(self, event_instance: Event) -> RoutingStrategy:
-        return next(
-            (
-                s for name, s in self.strategies.items()
-                if name != DEFAULT_ROUTING_STRATEGY_NAME and s.can_handle(event_instance)
-            ),
-            self.strategies[DEFAULT_ROUTING_STRATEGY_NAME]
-        )
+        return self.resolve_strategy_for_event_name(type(event_instance).__name__)
 
     def handled_event_names(self, strategy_name: str) -> List[str]:
         return self.strategies[strategy_name].get_handled_event_names()
 
-    def get_all_handled_event_names(self) -> List[str]:
-        all_handled_event_names = []
-        for strategy_name, strategy in self.strategies.items():
-            if strategy_name != DEFAULT_ROUTING_STRATEGY_NAME:
-                all_handled_event_names.extend(strategy.get_handled_event_names())
-        return all_handled_event_names
+    def get_all_handled_event_names(self) -> FrozenSet[str]:
+        return self._handled_event_names
+
+
+@dataclass
+class RebalancingReport:
+    context_name: str
+    scanned_rows: int = 0
+    reassigned_rows: int = 0
+    batches: int = 0
+    duration: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.scanned_rows / self.duration if self.duration else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.context_name}: {self.reassigned_rows}/{self.scanned_rows} pending rows reassigned " \
+               f"in {self.batches} batches ({self.duration:.2f}s - {self.rows_per_second:.0f} rows/s)"
+
+
+class InboxRebalancer:
+    """
+    Reassign the pending inbox rows (PENDING / ERROR) of a context to the current routing topology,
+    e.g. after a change of total_consumers (the consumer is assigned once, at ingestion time).
+
+    Rows are scanned newest first, by batches, each batch in its own transaction. Rows being processed are waited for
+    (FOR UPDATE) so an event is never moved while it is consumed. As batches go backwards in time, for a given
+    routing key the rows still assigned to the old consumer are always older than the moved ones: the old consumer
+    keeps processing them in order. The consumers receiving rows must be started once the rebalancing is done
+    (with consistent hashing, scaling up only moves keys to the new consumers): this is NOT enforced, neither here
+    nor by the InboxWorkersSupervisor, which starts the workers of the new topology as soon as it is (re)started.
+    Deploy the new total_consumers with the supervisor stopped, run the rebalancing, then start the supervisor.
+    """
+    def __init__(self, context_name: str, batch_size: int = None):
+        self.context_name = context_name
+        self.batch_size = batch_size or settings.MESSAGE_BUS.get('INBOX_REBALANCE_BATCH_SIZE', 1000)
+        self.routing_strategy = InboxConsumerRoutingStrategyFactory.get(context_name=context_name)
+        self.event_handlers_registry = EventHandlersRegistry(HandlersPerContextFactory.get()[context_name])
+        self.inbox_model = _load_inbox_model()
+
+    def rebalance(self, dry_run: bool = False) -> RebalancingReport:
+        report = RebalancingReport(context_name=self.context_name)
+        logger.info(f"{self.get_logger_prefix_message()}: Start rebalancing (dry run: {dry_run})...")
+
+        start_time = time.monotonic()
+        last_row = None
+        while True:
+            with transaction.atomic():
+                rows = self._get_next_batch(last_row, lock=not dry_run)
+                reassigned_rows = [row for row in rows if self._reassign(row)]
+                if reassigned_rows and not dry_run:
+                    self.inbox_model.objects.bulk_update(reassigned_rows, ['strategy_name', 'consumer_id', 'meta'])
+            if not rows:
+                break
+            last_row = rows[-1]
+            report.batches += 1
+            report.scanned_rows += len(rows)
+            report.reassigned_rows += len(reassigned_rows)
+            report.duration = time.monotonic() - start_time
+            logger.debug(f"{self.get_logger_prefix_message()}: {report}")
+            if len(rows) < self.batch_size:
+                break
+        report.duration = time.monotonic() - start_time
+        logger.info(f"{self.get_logger_prefix_message()}: {report}")
+        return report
+
+    def _get_next_batch(self, last_row: Optional['Inbox'], lock: bool) -> List['Inbox']:
+        queryset = self.inbox_model.objects.filter(
+            consumer=self.context_name,
+            status__in=[self.inbox_model.PENDING, self.inbox_model.ERROR],
+        )
+        if last_row is not None:
+            queryset = queryset.filter(
+                Q(creation_date__lt=last_row.creation_date)
+                | Q(creation_date=last_row.creation_date, pk__lt=last_row.pk)
+            )
+        if lock:
+            queryset = queryset.select_for_update()
+        return list(queryset.order_by('-creation_date', '-pk')[:self.batch_size])
+
+    def _reassign(self, row: 'Inbox') -> bool:
+        strategy = self.routing_strategy.resolve_strategy_for_event_name(row.event_name)
+        try:
+            # Same key as at ingestion (cf. EventQueueConsumer._determine_inbox_worker)
+            routing_key = self.routing_strategy.get_routing_key_from_payload(
+                row.event_name,
+                row.payload,
+                deserialize_event=lambda: self._deserialize_event(row),
+            )
+        except Exception:
+            return False  # Left to its consumer, which will mark it as error
+        consumer_id = strategy.get_consumer_id_by_routing_key(routing_key)
+        if row.strategy_name == strategy.name and row.consumer_id == consumer_id:
+            return False
+        row.strategy_name = strategy.name
+        row.consumer_id = consumer_id
+        row.meta['inbox_worker'] = {'strategy_name': strategy.name, 'consumer_id': consumer_id}
+        return True
+
+    def _deserialize_event(self, row: 'Inbox') -> Event:
+        event_cls = self.event_handlers_registry.get_event_cls(row.event_name)
+        return event_cls.deserialize({'transaction_id': str(row.transaction_id), **row.payload})
+
+    def get_logger_prefix_message(self) -> str:
+        return f"[InboxRebalancer - {self.context_name}]"
+
+
+@dataclass
+class ReplayReport:
+    matched_rows: int = 0
+    replayed_rows: int = 0
+    unroutable_rows: int = 0
+    batches: int = 0
+    duration: float = 0.0
+    dry_run: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.replayed_rows / self.duration if self.duration else 0.0
+
+    def __str__(self) -> str:
+        if self.dry_run:
+            return f"[Dry run] {self.matched_rows} inbox rows would be replayed"
+        report = f"{self.replayed_rows} inbox rows replayed in {self.batches} batches " \
+                 f"({self.duration:.2f}s - {self.rows_per_second:.0f} rows/s)"
+        if self.unroutable_rows:
+            report += f" - {self.unroutable_rows} unroutable rows left dead-lettered"
+        return report
+
+
+class InboxReplayer:
+    """
+    Put dead-lettered (and optionally in error) inbox rows back to PENDING, e.g. after a handler fix.
+
+    Rows are selected by context, event name, creation date range and traceback pattern (regex), then reset in bulk
+    (attempts cleared, no backoff) by batches of primary keys, each batch in its own transaction.
+    Rows can be re-routed to another (strategy, consumer_id) slot of the context. Otherwise, the rows without routing
+    (dead-lettered at ingestion or before the routing columns) are routed as at ingestion; the ones which still cannot
+    be routed are left dead-lettered and reported, as no consumer would ever process them.
+    """
+    def __init__(self, batch_size: int = None):
+        self.batch_size = batch_size or settings.MESSAGE_BUS.get('INBOX_REPLAY_BATCH_SIZE', 5000)
+        self.inbox_model = _load_inbox_model()
+
+    def replay(
+        self,
+        context_name: str = None,
+        event_names: List[str] = None,
+        created_from: datetime.datetime = None,
+        created_to: datetime.datetime = None,
+        traceback_pattern: str = None,
+        include_errors: bool = False,
+        strategy_name: str = None,
+        consumer_id: int = None,
+        dry_run: bool = False,
+    ) -> ReplayReport:
+        self._validate_routing(context_name, strategy_name, consumer_id)
+        queryset = self.get_replayable_rows(
+            context_name=context_name,
+            event_names=event_names,
+            created_from=created_from,
+            created_to=created_to,
+            traceback_pattern=traceback_pattern,
+            include_errors=include_errors,
+        )
+        report = ReplayReport(dry_run=dry_run)
+        if dry_run:
+            report.matched_rows = queryset.count()
+            logger.info(f"{self.get_logger_prefix_message()}: {report}")
+            return report
+
+        values_to_update = {'status': self.inbox_model.PENDING, 'attempts_number': 0, 'next_attempt_at': None}
+        if strategy_name is not None:
+            values_to_update.update(
+                strategy_name=strategy_name,
+                consumer_id=consumer_id,
+                # Keep meta['inbox_worker'] (cf. Inbox.mark_as_processed) aligned with the routing columns
+                meta=Func(
+                    F('meta'),
+                    Value('{inbox_worker}'),
+                    Value({'strategy_name': strategy_name, 'consumer_id': consumer_id}, output_field=JSONField()),
+                    function='jsonb_set',
+                    output_field=JSONField(),
+                ),
+            )
+
+        start_time = time.monotonic()
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                # Keyset pagination on the primary key: each batch is an index range scan
+                batch = list(
+                    queryset.filter(pk__gt=last_pk).select_for_update(skip_locked=True).order_by('pk').values_list(
+                        'pk', 'consumer',
+                    )[:self.batch_size]
+                )
+                if not batch:
+                    break
+                unroutable_pks = set() if strategy_name is not None else self._route_rows_without_routing(
+                    [pk for pk, _ in batch]
+                )
+                replayed_rows_in_batch = self.inbox_model.objects.filter(
+                    pk__in=[pk for pk, _ in batch if pk not in unroutable_pks]
+                ).update(**values_to_update)
+                # Updated rows are not ingested: wake up the listening workers explicitly
+                notify_inbox_workers_on_commit({context for _, context in batch})
+            last_pk = batch[-1][0]
+            report.batches += 1
+            report.matched_rows += len(batch)
+            report.replayed_rows += replayed_rows_in_batch
+            report.unroutable_rows += len(unroutable_pks)
+            report.duration = time.monotonic() - start_time
+            logger.debug(f"{self.get_logger_prefix_message()}: {report}")
+            if len(batch) < self.batch_size:
+                break
+        report.duration = time.monotonic() - start_time
+        logger.info(f"{self.get_logger_prefix_message()}: {report}")
+        return report
+
+    def get_replayable_rows(
+        self,
+        context_name: str = None,
+        event_names: List[str] = None,
+        created_from: datetime.datetime = None,
+        created_to: datetime.datetime = None,
+        traceback_pattern: str = None,
+        include_errors: bool = False,
+    ):
+        statuses = [self.inbox_model.DEAD_LETTER] + ([self.inbox_model.ERROR] if include_errors else [])
+        queryset = self.inbox_model.objects.filter(status__in=statuses)
+        if context_name:
+            queryset = queryset.filter(consumer=context_name)
+        if event_names:
+            queryset = queryset.filter(event_name__in=event_names)
+        if created_from:
+            queryset = queryset.filter(creation_date__gte=created_from)
+        if created_to:
+            queryset = queryset.filter(creation_date__lt=created_to)
+        if traceback_pattern:
+            queryset = queryset.filter(traceback__regex=traceback_pattern)
+        return queryset
+
+    def _route_rows_without_routing(self, pks: List[int]) -> Set[int]:
+        """Route the rows without (strategy_name, consumer_id) slot. Return the primary keys of the unroutable ones."""
+        rows_to_route = list(
+            self.inbox_model.objects.filter(pk__in=pks, strategy_name__isnull=True).only(
+                'pk', 'consumer', 'transaction_id', 'event_name', 'payload', 'meta',
+            )
+        )
+        unroutable_pks = set()
+        for row in rows_to_route:
+            try:
+                row.strategy_name, row.consumer_id = self._compute_slot(row)
+            except Exception:
+                logger.exception(
+                    f"{self.get_logger_prefix_message()}: Inbox row {row.pk} cannot be routed, left dead-lettered"
+                )
+                unroutable_pks.add(row.pk)
+                continue
+            row.meta['inbox_worker'] = {'strategy_name': row.strategy_name, 'consumer_id': row.consumer_id}
+        self.inbox_model.objects.bulk_update(
+            [row for row in rows_to_route if row.pk not in unroutable_pks],
+            ['strategy_name', 'consumer_id', 'meta'],
+        )
+        return unroutable_pks
+
+    @staticmethod
+    def _compute_slot(row: 'Inbox') -> Tuple[str, int]:
+        # Same slot as at ingestion (cf. EventQueueConsumer._determine_inbox_worker and InboxRebalancer._reassign)
+        routing_strategy = InboxConsumerRoutingStrategyFactory.get(context_name=row.consumer)
+        strategy = routing_strategy.resolve_strategy_for_event_name(row.event_name)
+        event_handlers_registry = EventHandlersRegistry(HandlersPerContextFactory.get()[row.consumer])
+        routing_key = routing_strategy.get_routing_key_from_payload(
+            row.event_name,
+            row.payload,
+            deserialize_event=lambda: event_handlers_registry.get_event_cls(row.event_name).deserialize(
+                {'transaction_id': str(row.transaction_id), **row.payload}
+            ),
+        )
+        return strategy.name, strategy.get_consumer_id_by_routing_key(routing_key)
+
+    @staticmethod
+    def _validate_routing(context_name: Optional[str], strategy_name: Optional[str], consumer_id: Optional[int]):
+        if strategy_name is None and consumer_id is None:
+            return
+        if not context_name or strategy_name is None or consumer_id is None:
+            raise ValueError("Re-routing requires a context name, a strategy name and a consumer ID")
+        routing_strategy = InboxConsumerRoutingStrategyFactory.get(context_name=context_name)
+        if strategy_name not in routing_strategy.strategies:
+            raise ValueError(f"Strategy '{strategy_name}' is not registered for context '{context_name}'.")
+        if not 0 <= consumer_id < routing_strategy.strategies[strategy_name].total_consumers:
+            raise ValueError(f"Consumer ID {consumer_id} is out of bounds for strategy '{strategy_name}'.")
+
+    def get_logger_prefix_message(self) -> str:
+        return "[InboxReplayer]"
+
+
+@dataclass
+class ArchivingReport:
+    table_name: str
+    archived_rows: int = 0
+    batches: int = 0
+    duration: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.archived_rows / self.duration if self.duration else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.table_name}: {self.archived_rows} rows archived in {self.batches} batches " \
+               f"({self.duration:.2f}s - {self.rows_per_second:.0f} rows/s)"
+
+
+class InboxOutboxArchiver:
+    """
+    Move processed inbox rows and sent outbox rows older than the retention window to the archive tables.
+
+    Each batch is moved by a single INSERT ... SELECT FROM (DELETE ... RETURNING) statement in its own transaction,
+    so that locks are kept short and the archiving can run next to the inbox/outbox workers.
+    """
+    def __init__(self, retention_days: int = None, batch_size: int = None):
+        if retention_days is None:
+            retention_days = settings.MESSAGE_BUS.get('ARCHIVE_RETENTION_DAYS', 30)
+        self.retention_days = retention_days
+        self.batch_size = batch_size or settings.MESSAGE_BUS.get('ARCHIVE_BATCH_SIZE', 5000)
+
+    def get_retention_limit(self) -> datetime.datetime:
+        return datetime.datetime.now() - datetime.timedelta(days=self.retention_days)
+
+    def archive_inbox(self, max_batches: int = None) -> ArchivingReport:
+        inbox_model = _load_inbox_model()
+        return self._archive(
+            live_model=inbox_model,
+            archived_model=_load_inbox_archived_model(),
+            where_clause="status = %s AND creation_date < %s",
+            where_params=[inbox_model.PROCESSED, self.get_retention_limit()],
+            max_batches=max_batches,
+        )
+
+    def archive_outbox(self, max_batches: int = None) -> ArchivingReport:
+        return self._archive(
+            live_model=_load_outbox_model(),
+            archived_model=_load_outbox_archived_model(),
+            where_clause="sent AND creation_date < %s",
+            where_params=[self.get_retention_limit()],
+            max_batches=max_batches,
+        )
+
+    def _archive(
+        self,
+        live_model: Type[Model],
+        archived_model: Type[Model],
+        where_clause: str,
+        where_params: List,
+        max_batches: int = None,
+    ) -> ArchivingReport:
+        report = ArchivingReport(table_name=live_model._meta.db_table)
+        sql = self._build_archive_batch_sql(live_model, archived_model, where_clause)
+        logger.info(f"{self.get_logger_prefix_message()}: Start archiving {report.table_name}...")
+
+        start_time = time.monotonic()
+        while max_batches is None or report.batches < max_batches:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(sql, [*where_params, self.batch_size])
+                archived_rows_in_batch = cursor.rowcount
+            if not archived_rows_in_batch:
+                break
+            report.batches += 1
+            report.archived_rows += archived_rows_in_batch
+            report.duration = time.monotonic() - start_time
+            logger.debug(f"{self.get_logger_prefix_message()}: {report}")
+            if archived_rows_in_batch < self.batch_size:
+                break
+        report.duration = time.monotonic() - start_time
+        logger.info(f"{self.get_logger_prefix_message()}: {report}")
+        return report
+
+    @staticmethod
+    def _build_archive_batch_sql(live_model: Type[Model], archived_model: Type[Model], where_clause: str) -> str:
+        archived_columns = {model_field.column for model_field in archived_model._meta.concrete_fields}
+        columns = ', '.join(
+            connection.ops.quote_name(model_field.column) for model_field in live_model._meta.concrete_fields
+            if not model_field.primary_key and model_field.column in archived_columns
+        )
+        live_table = connection.ops.quote_name(live_model._meta.db_table)
+        live_pk = connection.ops.quote_name(live_model._meta.pk.column)
+        archived_table = connection.ops.quote_name(archived_model._meta.db_table)
+        return f"""
+            WITH archived_rows AS (
+                DELETE FROM {live_table}
+                WHERE {live_pk} IN (
+                    SELECT {live_pk} FROM {live_table}
+                    WHERE {where_clause}
+                    ORDER BY creation_date
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING {columns}
+            )
+            INSERT INTO {archived_table} ({columns})
+            SELECT {columns} FROM archived_rows
+        """
+
+    def get_logger_prefix_message(self) -> str:
+        return "[InboxOutboxArchiver]"
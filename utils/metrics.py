@@ -0,0 +1,217 @@
+##############################################################################
+#
+#    OSIS stands for Open Student Information System. It's an application
+#    designed to manage the core business of higher education institutions,
+#    such as universities, faculties, institutes and professional schools.
+#    The core business involves the administration of students, teachers,
+#    courses, programs and so on.
+#
+#    Copyright (C) 2015-2026 Université catholique de Louvain (http://www.uclouvain.be)
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    A copy of this license - GNU General Public License - is available
+#    at the root of the source code of this program.  If not,
+#    see http://www.gnu.org/licenses/.
+#
+##############################################################################
+import bisect
+import contextlib
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple, Optional
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Dict[str, str]
+LabelsKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsBackend:
+    """
+    Interface of the metrics backend used by the message bus (cf. MESSAGE_BUS['METRICS_BACKEND'],
+    dotted path of a subclass instantiated without arguments).
+    """
+    def increment(self, name: str, value: float = 1, labels: Labels = None):
+        raise NotImplementedError
+
+    def observe(self, name: str, value: float, labels: Labels = None, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        raise NotImplementedError
+
+    def set_gauges(self, name: str, samples: List[Tuple[Labels, float]]):
+        """Replace all the samples of the gauge (series which are not part of samples are removed)"""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Text exposition format (Prometheus)"""
+        return ''
+
+    @contextlib.contextmanager
+    def timer(self, name: str, labels: Labels = None):
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - start_time, labels)
+
+
+@dataclass
+class _Histogram:
+    buckets: Tuple[float, ...]
+    bucket_counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self):
+        self.bucket_counts = [0] * len(self.buckets)
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.bucket_counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class InMemoryMetricsBackend(MetricsBackend):
+    """
+    Default backend: metrics are kept in the memory of the process (thread-safe) and rendered on demand.
+    Each worker process has its own metrics (cf. start_metrics_http_server).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelsKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelsKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelsKey, _Histogram]] = {}
+
+    def increment(self, name: str, value: float = 1, labels: Labels = None):
+        labels_key = _to_labels_key(labels)
+        with self._lock:
+            samples = self._counters.setdefault(name, {})
+            samples[labels_key] = samples.get(labels_key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Labels = None, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        labels_key = _to_labels_key(labels)
+        with self._lock:
+            samples = self._histograms.setdefault(name, {})
+            if labels_key not in samples:
+                samples[labels_key] = _Histogram(buckets=tuple(sorted(buckets)))
+            samples[labels_key].observe(value)
+
+    def set_gauges(self, name: str, samples: List[Tuple[Labels, float]]):
+        gauge_samples = {_to_labels_key(labels): value for labels, value in samples}
+        with self._lock:
+            self._gauges[name] = gauge_samples
+
+    def get_value(self, name: str, labels: Labels = None) -> Optional[float]:
+        """Value of a counter or a gauge (count of observations for an histogram)"""
+        labels_key = _to_labels_key(labels)
+        with self._lock:
+            if labels_key in self._histograms.get(name, {}):
+                return self._histograms[name][labels_key].count
+            return self._counters.get(name, self._gauges.get(name, {})).get(labels_key)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, samples in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{_format_labels(key)} {value}" for key, value in samples.items())
+            for name, samples in sorted(self._gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{_format_labels(key)} {value}" for key, value in samples.items())
+            for name, samples in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in samples.items():
+                    cumulative_count = 0
+                    for upper_bound, bucket_count in zip(histogram.buckets, histogram.bucket_counts):
+                        cumulative_count += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(key, le=upper_bound)} {cumulative_count}")
+                    lines.append(f"{name}_bucket{_format_labels(key, le='+Inf')} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.total}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _to_labels_key(labels: Optional[Labels]) -> LabelsKey:
+    return tuple(sorted((name, str(value)) for name, value in (labels or {}).items()))
+
+
+def _format_labels(labels_key: LabelsKey, le=None) -> str:
+    labels = list(labels_key) + ([('le', str(le))] if le is not None else [])
+    if not labels:
+        return ''
+    escaped_labels = (
+        (name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped_labels) + '}'
+
+
+class MetricsBackendFactory:
+    _metrics_backend: Optional[MetricsBackend] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> MetricsBackend:
+        if cls._metrics_backend is None:
+            with cls._lock:
+                if cls._metrics_backend is None:
+                    backend_path = settings.MESSAGE_BUS.get('METRICS_BACKEND')
+                    cls._metrics_backend = import_string(backend_path)() if backend_path else InMemoryMetricsBackend()
+        return cls._metrics_backend
+
+    @classmethod
+    def invalidate_cache(cls):
+        with cls._lock:
+            cls._metrics_backend = None
+
+
+@receiver(setting_changed)
+def _invalidate_metrics_backend_cache(setting: str, **kwargs):
+    if setting == 'MESSAGE_BUS':
+        MetricsBackendFactory.invalidate_cache()
+
+
+def get_metrics_backend() -> MetricsBackend:
+    return MetricsBackendFactory.get()
+
+
+def start_metrics_http_server(port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """
+    Expose the metrics of the current process (e.g. a long-running worker) on http://<host>:<port>/metrics.
+    The exporter has no authentication: it only listens on the loopback interface unless another host is given.
+    """
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = get_metrics_backend().render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # Scrapes are not worth a log line
+
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    threading.Thread(name='metrics-http-server', target=server.serve_forever, daemon=True).start()
+    return server